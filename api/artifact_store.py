@@ -0,0 +1,234 @@
+"""
+On-disk store of rendered images served by URL.
+
+Artifacts are named after the render key (see `image_cache.render_key`) and
+the file extension of their format, so identical requests share one file and
+an artifact never changes once written. Files are written atomically, expire
+``ttl`` seconds after they were last stored, and the oldest are deleted once
+the store exceeds its size budget.
+"""
+
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from taiwanviz.data_loader import atomic_write_bytes
+from taiwanviz.utils.encoding import EXTENSIONS, MEDIA_TYPES
+
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_ID = re.compile(r"^[0-9a-f]{64}\.(?:png|webp|jpg|svg|pdf)$")
+
+# Media type of each artifact extension
+_EXTENSION_MEDIA_TYPES = {EXTENSIONS[fmt]: MEDIA_TYPES[fmt] for fmt in EXTENSIONS}
+
+
+def artifact_id(key: str, format: str) -> str:
+    """Id of the artifact holding the `format` render of `key`."""
+    return f"{key}.{EXTENSIONS[format]}"
+
+
+def artifact_media_type(artifact: str) -> str:
+    """Media type of an artifact, from its extension."""
+    return _EXTENSION_MEDIA_TYPES[artifact.rsplit(".", 1)[-1]]
+
+
+@dataclass
+class ArtifactStoreStats:
+    """Counters of an `ArtifactStore` since startup."""
+
+    writes: int = 0
+    reuses: int = 0
+    expired: int = 0
+    evictions: int = 0
+    bytes: int = 0
+    max_bytes: int = 0
+
+
+class ArtifactStore:
+    """
+    Directory of rendered images with a TTL and a total size budget.
+
+    Storing an existing artifact only refreshes its modification time, which
+    is what the TTL and the oldest-first eviction are measured from. Expired
+    files are swept at most once per `sweep_interval` seconds, and right
+    away when a write takes the store over budget. All methods are
+    thread-safe.
+
+    Parameters
+    ----------
+    directory : str
+        Where artifacts are kept; created on first write.
+    max_bytes : int
+        Size budget of the directory.
+    ttl : int
+        Seconds an artifact stays available after it was last stored.
+    sweep_interval : float, default 60
+        Minimum seconds between sweeps for expired artifacts.
+    """
+
+    def __init__(
+        self, directory: str, max_bytes: int, ttl: int, sweep_interval: float = 60
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self._stats = ArtifactStoreStats(max_bytes=max_bytes)
+        self._stats.bytes = sum(size for _, size, _ in self._files())
+
+    def path(self, artifact: str) -> Optional[Path]:
+        """
+        File of an unexpired artifact, or None if `artifact` is not a valid
+        id, was never stored, or has expired.
+        """
+        if not ARTIFACT_ID.match(artifact):
+            return None
+        path = self.directory / artifact[:2] / artifact
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return None
+        if time.time() - mtime > self.ttl:
+            return None
+        return path
+
+    def expires_in(self, path: Path) -> int:
+        """Seconds until the artifact at `path` expires."""
+        try:
+            age = time.time() - path.stat().st_mtime
+        except OSError:
+            return 0
+        return max(0, int(self.ttl - age))
+
+    def touch(self, artifact: str) -> Optional[Path]:
+        """
+        Restart the TTL of an unexpired artifact and return its file, or
+        None if there is no such artifact.
+        """
+        path = self.path(artifact)
+        if path is None:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        with self._lock:
+            self._stats.reuses += 1
+        return path
+
+    def put(self, artifact: str, data: bytes) -> Path:
+        """
+        Store `data` as `artifact` (or refresh it if already stored) and
+        return its file.
+
+        Raises
+        ------
+        ValueError
+            If `artifact` is not a valid id.
+        OSError
+            If the file cannot be written.
+        """
+        if not ARTIFACT_ID.match(artifact):
+            raise ValueError(f"Invalid artifact id: {artifact}")
+        path = self.touch(artifact)
+        if path is None:
+            path = self.directory / artifact[:2] / artifact
+            try:
+                replaced = path.stat().st_size  # an expired copy
+            except OSError:
+                replaced = 0
+            # Readers see either no file or all of it
+            atomic_write_bytes(path, data)
+            with self._lock:
+                self._stats.writes += 1
+                self._stats.bytes += len(data) - replaced
+
+        now = time.monotonic()
+        with self._lock:
+            due = self._stats.bytes > self.max_bytes or (
+                now - self._last_sweep > self.sweep_interval
+            )
+            if due:
+                self._last_sweep = now
+        if due:
+            self._sweep()
+        return path
+
+    def _files(self):
+        files = []
+        for path in self.directory.glob("*/*.*"):
+            if not ARTIFACT_ID.match(path.name):
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        return files
+
+    def _sweep(self) -> None:
+        """
+        Delete expired artifacts, then the oldest down to 90% of the budget.
+
+        The byte count is only lowered by what this sweep deleted, so writes
+        counted while the directory is scanned are kept.
+        """
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        target = int(self.max_bytes * 0.9)
+        cutoff = time.time() - self.ttl
+        expired = evicted = removed = 0
+        for mtime, size, path in files:
+            if mtime >= cutoff and total <= target:
+                break
+            total -= size
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue  # deleted by a concurrent sweep
+            removed += size
+            if mtime < cutoff:
+                expired += 1
+            else:
+                evicted += 1
+
+        with self._lock:
+            self._stats.bytes -= removed
+            self._stats.expired += expired
+            self._stats.evictions += evicted
+        if expired or evicted:
+            logger.debug(
+                f"Artifact sweep: {expired} expired, {evicted} evicted, "
+                f"{total} bytes kept"
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of the write/eviction counters and size."""
+        with self._lock:
+            return asdict(self._stats)
+
+
+@lru_cache(maxsize=1)
+def get_artifact_store() -> ArtifactStore:
+    """Process-wide artifact store configured from the settings."""
+    settings = get_settings()
+    directory = settings.artifact_dir or str(
+        Path(tempfile.gettempdir()) / "taiwanviz-artifacts"
+    )
+    return ArtifactStore(
+        directory,
+        max_bytes=settings.artifact_max_mb * 1024 * 1024,
+        ttl=settings.artifact_ttl,
+    )
@@ -0,0 +1,240 @@
+"""
+Content-addressed cache of rendered map images.
+
+Requests are reduced to a canonical JSON document (see `render_key`) and
+hashed; the hash names the rendered PNG in an in-memory LRU bounded by bytes,
+optionally backed by a directory on local disk. Because the key is derived
+from everything that affects the output, it also serves as a strong ETag.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+import matplotlib
+
+from taiwanviz.data_loader import atomic_write_bytes
+
+from .schemas import ChoroplethRequest, RenderConfigModel
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when a renderer change alters output for identical requests
+RENDER_CACHE_VERSION = 3
+
+
+def render_key(req: ChoroplethRequest) -> str:
+    """
+    SHA-256 of everything in `req` that affects the rendered image.
+
+    Omitted config fields are filled with their defaults and data keys are
+    sorted, so equivalent payloads share a key. `response_type` only changes
+    how the image is delivered and is left out. The geometry version of the
+    layer and the resolved palette colors are included, so a changed
+    shapefile or palette definition never serves a stale image from disk.
+    Loads the layer on first use.
+    """
+    from taiwanviz.models.base.registry import LAYER_REGISTRY
+    from taiwanviz.models.palette import ColorPaletteManager
+
+    palette = getattr(req.palette, "value", req.palette)
+    config = (req.config or RenderConfigModel()).model_dump(
+        mode="json", exclude={"response_type"}
+    )
+    doc = {
+        "version": [RENDER_CACHE_VERSION, matplotlib.__version__],
+        "level": req.level.value,
+        "geometry": LAYER_REGISTRY.get(req.level.value).version,
+        "palette": palette,
+        "palette_colors": ColorPaletteManager.get_palette(palette),
+        "data": sorted(req.data.items()),
+        "config": config,
+    }
+    blob = json.dumps(doc, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def etag_for(key: str, response_type: str) -> str:
+    """Strong ETag of one representation (png, base64...) of a render."""
+    return f'"{key[:32]}-{response_type}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an ``If-None-Match`` header against `etag` (weak comparison)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+@dataclass
+class ImageCacheStats:
+    """Counters of an `ImageCache` since startup."""
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    disk_evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+    max_bytes: int = 0
+    disk_bytes: int = 0
+    max_disk_bytes: int = 0
+
+
+class ImageCache:
+    """
+    Byte-bounded LRU of encoded images with an optional disk tier.
+
+    Entries evicted from memory stay on disk (when enabled) and are promoted
+    back on access. The disk tier is trimmed oldest-first once it exceeds its
+    own budget. All methods are thread-safe.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Memory budget; 0 disables the memory tier.
+    disk_dir : str, optional
+        Directory of the disk tier; None disables it.
+    max_disk_bytes : int, default 0
+        Disk budget.
+    """
+
+    def __init__(
+        self, max_bytes: int, disk_dir: Optional[str] = None, max_disk_bytes: int = 0
+    ):
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = ImageCacheStats(
+            max_bytes=max_bytes, max_disk_bytes=max_disk_bytes if disk_dir else 0
+        )
+        if self.disk_dir is not None:
+            self._stats.disk_bytes = sum(
+                p.stat().st_size for p in self.disk_dir.glob("*/*.png")
+            )
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.png"
+
+    def _remember(self, key: str, data: bytes) -> None:
+        # Caller holds the lock
+        if len(data) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._stats.bytes -= len(old)
+        self._entries[key] = data
+        self._stats.bytes += len(data)
+        while self._stats.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._stats.bytes -= len(evicted)
+            self._stats.evictions += 1
+        self._stats.entries = len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached image for `key`, or None."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return data
+
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            try:
+                data = path.read_bytes()
+                os.utime(path)
+            except OSError:
+                data = None
+            if data is not None:
+                with self._lock:
+                    self._stats.disk_hits += 1
+                    self._remember(key, data)
+                return data
+
+        with self._lock:
+            self._stats.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store `data` under `key` in both tiers."""
+        with self._lock:
+            self._remember(key, data)
+
+        if self.disk_dir is None or len(data) > self.max_disk_bytes:
+            return
+        path = self._disk_path(key)
+        try:
+            if not path.exists():
+                atomic_write_bytes(path, data)
+                with self._lock:
+                    self._stats.disk_bytes += len(data)
+                    over = self._stats.disk_bytes > self.max_disk_bytes
+                if over:
+                    self._trim_disk()
+        except OSError as e:
+            logger.warning(f"Could not write image cache entry {path}: {e}")
+
+    def _trim_disk(self) -> None:
+        """Delete the least recently used files down to 90% of the budget."""
+        files = []
+        for path in self.disk_dir.glob("*/*.png"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        files.sort()
+
+        total = sum(size for _, size, _ in files)
+        target = int(self.max_disk_bytes * 0.9)
+        removed = 0
+        for _, size, path in files:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        with self._lock:
+            self._stats.disk_bytes = total
+            self._stats.disk_evictions += removed
+
+    def clear(self) -> None:
+        """Drop the memory tier (the disk tier is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._stats.bytes = 0
+            self._stats.entries = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of the hit/miss/eviction counters and sizes."""
+        with self._lock:
+            return asdict(self._stats)
+
+
+@lru_cache(maxsize=1)
+def get_image_cache() -> ImageCache:
+    """Process-wide image cache configured from the settings."""
+    settings = get_settings()
+    return ImageCache(
+        max_bytes=settings.image_cache_mb * 1024 * 1024,
+        disk_dir=settings.image_cache_dir,
+        max_disk_bytes=settings.image_cache_disk_mb * 1024 * 1024,
+    )
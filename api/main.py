@@ -3,6 +3,8 @@ FastAPI application entrypoint for TaiwanViz.
 
 This app exposes endpoints to:
 - Render choropleth maps as images (PNG)
+- Serve map geometry and per-region colors for client-side rendering
+- Serve Web Mercator XYZ map tiles of registered datasets
 - Inspect available color palettes
 - List packaged fonts and health status
 """
@@ -12,7 +14,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .routers import maps, meta
+from .routers import geo, maps, meta, tiles
 from .startup import on_shutdown, on_startup
 
 
@@ -53,6 +55,8 @@ def create_app() -> FastAPI:
     # Routers
     app.include_router(meta.router, prefix="/meta", tags=["meta"])
     app.include_router(maps.router, prefix="/render", tags=["render"])
+    app.include_router(geo.router, prefix="/geo", tags=["geo"])
+    app.include_router(tiles.router, prefix="/tiles", tags=["tiles"])
 
     return app
 
@@ -0,0 +1,357 @@
+"""
+Render worker processes for the API.
+
+Matplotlib drawing is CPU-bound and holds the GIL, so a single server process
+cannot draw on more than one core. `RenderFarm` keeps a pool of worker
+processes that are each initialized once (Agg backend, fonts, geometry
+layers) and feeds them render jobs:
+
+- a bounded number of jobs may be running or queued; beyond that `render`
+  fails immediately with `RenderFarmBusy` (HTTP 503), unless the caller
+  asks to wait for a slot (batch renders do)
+- each request waits at most `render_timeout` seconds; jobs still queued at
+  that point are cancelled
+- a worker is replaced after `worker_max_jobs` jobs, and the whole pool is
+  replaced once a worker's peak RSS exceeds `worker_max_rss_mb`
+
+With ``TAIWANVIZ_RENDER_WORKERS=0`` (the default) jobs run in the server's
+thread pool instead.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import resource
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from starlette.concurrency import run_in_threadpool
+
+from taiwanviz.models.animation import AnimationFormat, render_animation
+from taiwanviz.models.choropleth import ChoroplethMap
+from taiwanviz.models.config import ChoroplethRenderConfig
+from taiwanviz.utils.encoding import EncodeOptions
+
+from .settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class RenderFarmBusy(RuntimeError):
+    """Raised when no render capacity is available; clients should retry."""
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    """
+    A picklable description of one choropleth render.
+
+    Attributes
+    ----------
+    level : str
+        Administrative level ("county", "town" or "village").
+    data : dict[str, float]
+        Region name to value.
+    palette : str
+        Palette name.
+    config : ChoroplethRenderConfig
+        Rendering options.
+    format : str, default "png"
+        Output format passed to ``Figure.savefig``.
+    savefig_kwargs : dict
+        Extra keyword arguments for ``Figure.savefig``.
+    encoding : EncodeOptions, optional
+        When set, the image is produced by `ChoroplethMap.encode` with these
+        options, and `format` and `savefig_kwargs` are ignored.
+    """
+
+    level: str
+    data: Dict[str, float]
+    palette: str
+    config: ChoroplethRenderConfig
+    format: str = "png"
+    savefig_kwargs: Dict[str, Any] = field(default_factory=dict)
+    encoding: Optional[EncodeOptions] = None
+
+    def run(self) -> bytes:
+        """Render in the current process and return the encoded image."""
+        m = ChoroplethMap(level=self.level, data=self.data, palette_name=self.palette)
+        if self.encoding is not None:
+            return m.encode(self.config, self.encoding)
+        return m.to_bytes(self.config, format=self.format, **self.savefig_kwargs)
+
+
+@dataclass(frozen=True)
+class AnimationJob:
+    """
+    A picklable description of one animated choropleth render.
+
+    Attributes
+    ----------
+    level : str
+        Administrative level ("county", "town" or "village").
+    frames : list[dict[str, float]]
+        Region name to value, per frame.
+    palette : str
+        Palette name.
+    config : ChoroplethRenderConfig
+        Rendering options.
+    titles : list[str], optional
+        Title per frame.
+    format : {"gif", "apng", "mp4"}
+        Output container.
+    fps : float
+        Frames per second.
+    """
+
+    level: str
+    frames: List[Dict[str, float]]
+    palette: str
+    config: ChoroplethRenderConfig
+    titles: Optional[List[str]] = None
+    format: AnimationFormat = "gif"
+    fps: float = 2.0
+
+    def run(self) -> bytes:
+        """Render in the current process and return the encoded animation."""
+        return render_animation(
+            self.level,
+            self.frames,
+            self.palette,
+            self.config,
+            titles=self.titles,
+            format=self.format,
+            fps=self.fps,
+        )
+
+
+Job = Union[RenderJob, AnimationJob]
+
+
+def run_job(job: Job) -> bytes:
+    """Run `job` in the current process and return the encoded output."""
+    return job.run()
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes (Linux reports KiB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _init_worker() -> None:
+    """Per-process setup, run once when a worker starts."""
+    # Imported here so the parent does not pay for them twice
+    from api.startup import prepare_renderer
+
+    prepare_renderer()
+
+
+def _ping() -> int:
+    return _peak_rss()
+
+
+def _worker_render(job: Job) -> Tuple[bytes, int]:
+    return run_job(job), _peak_rss()
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class RenderFarm:
+    """
+    Pool of pre-initialized render processes with bounded admission.
+
+    Parameters
+    ----------
+    settings : Settings
+        Worker count, queue size, timeout and recycling limits.
+    """
+
+    def __init__(self, settings: Settings):
+        self.workers = settings.render_workers
+        self.timeout = settings.render_timeout
+        self.max_jobs = settings.worker_max_jobs
+        self.max_rss = settings.worker_max_rss_mb * 1024 * 1024
+        self.capacity = settings.render_workers + settings.render_queue_size
+
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        # Futures of coroutines in `wait_for_slot`, each with its event loop
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: workers must not inherit the server's threads or event loop,
+        # and max_tasks_per_child requires a non-fork start method
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            max_tasks_per_child=self.max_jobs,
+        )
+
+    def _prewarm(self, executor: ProcessPoolExecutor, wait: bool) -> None:
+        # Submitting one task per worker while none is idle spawns all of them
+        futures = [executor.submit(_ping) for _ in range(self.workers)]
+        if wait:
+            for fut in futures:
+                fut.result()
+
+    def start(self) -> None:
+        """Spawn and initialize all workers; blocks until they are ready."""
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = self._new_executor()
+            executor = self._executor
+        self._prewarm(executor, wait=True)
+        logger.info(f"Render farm ready: {self.workers} workers")
+
+    def _recycle(self, executor: ProcessPoolExecutor, reason: str) -> None:
+        """Replace `executor` with a fresh pool; its running jobs still finish."""
+        with self._lock:
+            if self._executor is not executor:
+                return  # already replaced by another request
+            self._executor = self._new_executor()
+            fresh = self._executor
+        logger.warning(f"Recycling render workers: {reason}")
+        executor.shutdown(wait=False)
+        self._prewarm(fresh, wait=False)
+
+    def shutdown(self) -> None:
+        """Stop all workers, cancelling queued jobs."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def wait_for_slot(self) -> None:
+        """
+        Wait until fewer than `capacity` jobs are admitted and take a slot.
+
+        Waiters sleep until a job finishes (see `_release_slot`) and then
+        compete for the freed slot again.
+        """
+        loop = asyncio.get_running_loop()
+        while not self._slots.acquire(blocking=False):
+            waiter = (loop, loop.create_future())
+            with self._lock:
+                self._waiters.append(waiter)
+            try:
+                # A slot freed before we were registered would not wake us
+                if self._slots.acquire(blocking=False):
+                    return
+                await waiter[1]
+            finally:
+                with self._lock:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+
+    def _release_slot(self) -> None:
+        """Free a job's slot and wake every `wait_for_slot` coroutine."""
+        self._slots.release()
+        with self._lock:
+            waiters, self._waiters = self._waiters, []
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                pass  # the waiter's event loop is closed
+
+    def submit(
+        self, job: Job, reserved: bool = False
+    ) -> Tuple[Future, ProcessPoolExecutor]:
+        """
+        Queue `job` on a worker.
+
+        Parameters
+        ----------
+        job : RenderJob or AnimationJob
+            What to render.
+        reserved : bool, default False
+            Whether the caller already holds a slot from `wait_for_slot`.
+
+        Raises
+        ------
+        RenderFarmBusy
+            If `capacity` jobs are already running or queued.
+        """
+        if not reserved and not self._slots.acquire(blocking=False):
+            raise RenderFarmBusy("All render workers are busy")
+        try:
+            with self._lock:
+                executor = self._executor
+                if executor is None:
+                    raise RenderFarmBusy("Render farm is not running")
+                fut = executor.submit(_worker_render, job)
+        except BaseException:
+            self._release_slot()
+            raise
+        # The slot stays taken until the worker is done, even after a timeout
+        fut.add_done_callback(lambda _: self._release_slot())
+        return fut, executor
+
+    async def render(self, job: Job, wait: bool = False) -> bytes:
+        """
+        Run `job` on a worker process.
+
+        With `wait`, a saturated farm delays the job until a slot frees up
+        instead of rejecting it; the timeout starts once it is queued.
+
+        Raises
+        ------
+        RenderFarmBusy
+            If the farm is saturated (without `wait`) or a worker died.
+        asyncio.TimeoutError
+            If the job did not finish within `timeout` seconds.
+        """
+        if wait:
+            await self.wait_for_slot()
+        fut, executor = self.submit(job, reserved=wait)
+        try:
+            image, rss = await asyncio.wait_for(asyncio.wrap_future(fut), self.timeout)
+        except BrokenProcessPool as e:
+            self._recycle(executor, "a worker exited unexpectedly")
+            raise RenderFarmBusy("Render worker crashed") from e
+
+        if rss > self.max_rss:
+            self._recycle(executor, f"worker peak RSS {rss >> 20} MiB")
+        return image
+
+
+_FARM: Optional[RenderFarm] = None
+
+
+def start_render_farm(settings: Settings) -> Optional[RenderFarm]:
+    """Start the process-wide farm if `settings` asks for worker processes."""
+    global _FARM
+    if settings.render_workers <= 0:
+        return None
+    if _FARM is None:
+        _FARM = RenderFarm(settings)
+        _FARM.start()
+    return _FARM
+
+
+def stop_render_farm() -> None:
+    """Shut down the process-wide farm, if any."""
+    global _FARM
+    if _FARM is not None:
+        _FARM.shutdown()
+        _FARM = None
+
+
+async def render(job: Job, wait: bool = False) -> bytes:
+    """
+    Run `job` on the farm when it runs, else in the thread pool. With
+    `wait`, a saturated farm queues the job instead of raising
+    `RenderFarmBusy`.
+    """
+    if _FARM is not None:
+        return await _FARM.render(job, wait=wait)
+    return await run_in_threadpool(run_job, job)
@@ -0,0 +1,166 @@
+"""
+Geometry and data routes for client-side rendering, and point lookup.
+
+Geometry is served once per level as quantized TopoJSON/GeoJSON with long
+cache lifetimes and a version ETag; the data route returns only values and
+colors per region code, so clients recolor locally instead of fetching a
+new image for every dataset.
+"""
+
+import gzip
+import json
+from functools import lru_cache
+from typing import Literal, Optional, Tuple
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import Response
+
+from taiwanviz.models.base.registry import LAYER_REGISTRY
+from taiwanviz.models.choropleth import ChoroplethMap
+from taiwanviz.models.enums import AdminLevel
+from taiwanviz.models.lookup import lookup_regions
+from taiwanviz.utils.lod import LOD_TOLERANCES
+from taiwanviz.utils.topology import TOPOLOGY_VERSION
+
+from ..image_cache import etag_matches
+from ..schemas import (
+    LocateRequest,
+    LocateResponse,
+    RegionDataRequest,
+    RegionDataResponse,
+)
+from ..settings import get_settings
+from .maps import _to_render_config
+
+router = APIRouter()
+
+MEDIA_TYPES = {"topojson": "application/json", "geojson": "application/geo+json"}
+
+
+@lru_cache(maxsize=16)
+def _geometry_document(
+    level: str, version: str, format: str, tier: int, quantization: int
+) -> Tuple[bytes, bytes]:
+    """Serialized geometry and its gzip encoding, built once per version."""
+    doc = LAYER_REGISTRY.get(level).export_geometry(format, tier, quantization)
+    raw = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return raw, gzip.compress(raw, compresslevel=6, mtime=0)
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    Whether an ``Accept-Encoding`` header admits gzip: listed (or matched
+    by ``*``) with a nonzero quality, so ``gzip;q=0`` refuses it.
+    """
+    qualities = {}
+    for item in (accept_encoding or "").split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding.lower()] = q
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+@router.get("/{level}")
+def geometry(
+    level: AdminLevel,
+    format: Literal["topojson", "geojson"] = "topojson",
+    lod: int = Query(default=2, ge=0, le=len(LOD_TOLERANCES) - 1),
+    quantization: int = Query(default=100_000, ge=1_000, le=10_000_000),
+    if_none_match: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None),
+):
+    """
+    Geometry of one administrative level as quantized TopoJSON or GeoJSON.
+
+    Features are identified by region code (COUNTYCODE, TOWNCODE or
+    VILLCODE). The ETag changes only when the source shapefile does, and a
+    matching ``If-None-Match`` is answered with 304.
+    """
+    layer = LAYER_REGISTRY.get(level.value)
+    use_gzip = _accepts_gzip(accept_encoding)
+    etag = f'"{layer.version}-v{TOPOLOGY_VERSION}-{format}-t{lod}-q{quantization}'
+    etag += '-gz"' if use_gzip else '"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={get_settings().geometry_max_age}",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    raw, compressed = _geometry_document(
+        level.value, layer.version, format, lod, quantization
+    )
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return Response(
+        content=compressed if use_gzip else raw,
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
+
+
+@router.post("/{level}/data", response_model=RegionDataResponse)
+def region_data(level: AdminLevel, req: RegionDataRequest) -> RegionDataResponse:
+    """
+    Values and fill colors per region code, computed exactly as for images.
+
+    Only regions with data are listed; the rest use `default_fill`. Keys
+    that matched no region, or several, are reported back.
+    """
+    try:
+        m = ChoroplethMap(level=level.value, data=req.data, palette_name=req.palette)
+        mapped = m.get_layer().map_data(req.data)
+        table = m.color_table(_to_render_config(req.config), mapped=mapped)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Coloring failed: {e}")
+
+    matched = table[table["value"].notna()]
+    shown = matched.loc[matched["shown"], "value"]
+    clim = (float(shown.min()), float(shown.max())) if len(shown) else None
+    return RegionDataResponse(
+        level=level,
+        version=m.get_layer().version,
+        default_fill=m.default_fill,
+        default_edge=m.default_edge,
+        clim=clim,
+        values=dict(zip(matched.index.astype(str), matched["value"].astype(float))),
+        colors=dict(zip(matched.index.astype(str), matched["color"])),
+        unmatched=list(mapped.unmatched),
+        ambiguous=list(mapped.ambiguous),
+    )
+
+
+@router.post("/locate", response_model=LocateResponse)
+def locate(req: LocateRequest) -> LocateResponse:
+    """
+    County, town and village (codes and names) of each lon/lat point.
+
+    Build a choropleth ``data`` mapping from raw coordinates by counting or
+    summing over the returned codes.
+    """
+    df = lookup_regions(req.lon, req.lat)
+    columns = {
+        field: df[column].astype(object).where(df[column].notna(), None).tolist()
+        for field, column in (
+            ("county_code", "COUNTYCODE"),
+            ("county_name", "COUNTYNAME"),
+            ("town_code", "TOWNCODE"),
+            ("town_name", "TOWNNAME"),
+            ("village_code", "VILLCODE"),
+            ("village_name", "VILLNAME"),
+        )
+    }
+    return LocateResponse(matched=int(df["VILLCODE"].notna().sum()), **columns)
@@ -2,18 +2,39 @@
 Rendering routes for choropleth maps.
 """
 
+import asyncio
 import base64
-import os
-from io import BytesIO
+import json
+import zipfile
+from typing import AsyncIterator, Awaitable, Dict, List, Optional
 
-import matplotlib.pyplot as plt
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import (
+    FileResponse,
+    JSONResponse,
+    Response,
+    StreamingResponse,
+)
+from starlette.concurrency import run_in_threadpool
 
-from taiwanviz.models.choropleth import ChoroplethMap
+from taiwanviz.models.animation import MEDIA_TYPES
 from taiwanviz.models.config import ChoroplethRenderConfig
+from taiwanviz.models.template import TEMPLATE_POOL
+from taiwanviz.utils.encoding import EXTENSIONS
+from taiwanviz.utils.encoding import MEDIA_TYPES as IMAGE_MEDIA_TYPES
+from taiwanviz.utils.encoding import EncodeOptions
 
-from ..schemas import ChoroplethRequest, RenderConfigModel
+from ..artifact_store import artifact_id, artifact_media_type, get_artifact_store
+from ..image_cache import etag_for, etag_matches, get_image_cache, render_key
+from ..render_pool import AnimationJob, RenderFarmBusy, RenderJob, render
+from ..schemas import (
+    ChoroplethAnimationRequest,
+    ChoroplethBatchRequest,
+    ChoroplethRequest,
+    RenderConfigModel,
+)
+from ..settings import get_settings
+from ..single_flight import RENDER_FLIGHTS
 
 router = APIRouter()
 
@@ -36,56 +57,285 @@ def _to_render_config(cfg: RenderConfigModel | None) -> ChoroplethRenderConfig:
         title=cfg.title,
         show_legend=cfg.show_legend,
         legend_loc=cfg.legend_loc,
+        lod=cfg.lod,
+        backend=cfg.backend,
     )
 
 
+def _encode_options(cfg: RenderConfigModel | None) -> EncodeOptions:
+    """
+    Output encoding settings of a RenderConfigModel.
+    """
+    if cfg is None:
+        return EncodeOptions()
+
+    return EncodeOptions(
+        format=cfg.format,
+        quality=cfg.quality,
+        lossless=cfg.lossless,
+        compress_level=cfg.compress_level,
+        colors=cfg.colors,
+        max_pixels=cfg.max_pixels,
+    )
+
+
+async def _await_render(pending: Awaitable[bytes]) -> bytes:
+    """Await a render, turning its failures into HTTP errors."""
+    try:
+        return await pending
+    except RenderFarmBusy as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "1"}
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Rendering timed out")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Rendering failed: {e}")
+
+
+async def _render_and_cache(req: ChoroplethRequest, key: str) -> bytes:
+    """Render and encode `req` and store it in the image cache under `key`."""
+    job = RenderJob(
+        level=req.level.value,
+        data=req.data,
+        palette=req.palette,
+        config=_to_render_config(req.config),
+        encoding=_encode_options(req.config),
+    )
+    image = await render(job)
+    get_image_cache().put(key, image)
+    return image
+
+
 @router.post("/choropleth")
-def render_choropleth(req: ChoroplethRequest):
+async def render_choropleth(
+    req: ChoroplethRequest,
+    request: Request,
+    if_none_match: Optional[str] = Header(default=None),
+):
     """
     Render a choropleth map and return according to response_type.
 
     Supported response types:
-    - "png"     : Return a PNG image stream (default).
-    - "base64"  : Return a JSON object with base64-encoded PNG.
-    - "json_url": Save as file under /tmp and return a JSON with file path.
+    - "png"     : Return the image itself (default; PNG unless
+                  ``config.format`` asks for png8, webp, jpeg, svg or pdf).
+    - "base64"  : Return a JSON object with the base64-encoded image.
+    - "json_url": Store the image as an artifact and return a JSON with its
+                  URL (``/render/artifacts/{id}``), so large renders can be
+                  fetched separately instead of inlined as base64.
+
+    Rendered images are cached by request content. png and base64 responses
+    carry a strong ETag, and a matching ``If-None-Match`` is answered with
+    304. Identical requests arriving while one is being rendered wait for
+    that render instead of starting their own. Responds 503 when all render
+    workers are busy and 504 when the render does not finish in time.
     """
-    try:
-        # Build map object
-        m = ChoroplethMap(
-            level=req.level.value, data=req.data, palette_name=req.palette
+    response_type = req.config.response_type if req.config else "png"
+    image_format = _encode_options(req.config).format
+    media_type = IMAGE_MEDIA_TYPES[image_format]
+    key = await run_in_threadpool(render_key, req)
+
+    headers = {}
+    if response_type == "json_url":
+        # Hands out an artifact that expires, so it is not validated
+        artifact = artifact_id(key, image_format)
+        store = get_artifact_store()
+        if await run_in_threadpool(store.touch, artifact) is not None:
+            headers["X-Cache"] = "HIT"
+            return _artifact_response(request, artifact, media_type, headers)
+    else:
+        headers["ETag"] = etag_for(key, response_type)
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    cache = get_image_cache()
+    image = cache.get(key)
+    headers["X-Cache"] = "HIT" if image is not None else "MISS"
+    if image is None:
+        # Concurrent identical requests share one render
+        image = await _await_render(
+            RENDER_FLIGHTS.do(
+                key,
+                lambda: _render_and_cache(req, key),
+                timeout=get_settings().render_timeout,
+            )
         )
 
-        # Render using config
-        cfg = _to_render_config(req.config)
-        m.render(cfg)
+    # Select response type
+    if response_type == "png":
+        return Response(content=image, media_type=media_type, headers=headers)
 
-        # Grab current figure and serialize to PNG
-        fig = plt.gcf()
-        buf = BytesIO()
-        fig.savefig(buf, format="png", dpi=cfg.dpi, bbox_inches="tight")
-        plt.close(fig)
-        buf.seek(0)
+    elif response_type == "base64":
+        img_b64 = base64.b64encode(image).decode("utf-8")
+        return JSONResponse(
+            content={"image": img_b64, "media_type": media_type}, headers=headers
+        )
 
-        # Select response type
-        response_type = req.config.response_type if req.config else "png"
+    elif response_type == "json_url":
+        try:
+            await run_in_threadpool(store.put, artifact, image)
+        except OSError as e:
+            raise HTTPException(
+                status_code=500, detail=f"Could not store the image: {e}"
+            )
+        return _artifact_response(request, artifact, media_type, headers)
 
-        if response_type == "png":
-            return StreamingResponse(buf, media_type="image/png")
+    else:
+        raise HTTPException(
+            status_code=400, detail=f"Unsupported response_type: {response_type}"
+        )
 
-        elif response_type == "base64":
-            img_b64 = base64.b64encode(buf.getvalue()).decode("utf-8")
-            return JSONResponse(content={"image": img_b64})
 
-        elif response_type == "json_url":
-            output_path = f"/tmp/choropleth_{os.getpid()}.png"
-            with open(output_path, "wb") as f:
-                f.write(buf.getvalue())
-            return JSONResponse(content={"url": output_path})
+def _artifact_response(
+    request: Request, artifact: str, media_type: str, headers: Dict[str, str]
+) -> JSONResponse:
+    """JSON pointing at a stored artifact."""
+    content = {
+        "url": str(request.url_for("get_artifact", artifact=artifact)),
+        "id": artifact,
+        "media_type": media_type,
+        "expires_in": get_artifact_store().ttl,
+    }
+    return JSONResponse(content=content, headers=headers)
 
-        else:
-            raise HTTPException(
-                status_code=400, detail=f"Unsupported response_type: {response_type}"
-            )
 
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Rendering failed: {e}")
+@router.get("/artifacts/{artifact}")
+def get_artifact(artifact: str):
+    """
+    A rendered image stored by a ``json_url`` render.
+
+    The file is sent as is (with ``sendfile`` where available). Artifacts
+    never change, so clients may cache them until they expire. Responds 404
+    for unknown or expired artifacts.
+    """
+    store = get_artifact_store()
+    path = store.path(artifact)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired artifact")
+    headers = {
+        "Cache-Control": f"public, max-age={store.expires_in(path)}, immutable",
+    }
+    return FileResponse(path, media_type=artifact_media_type(artifact), headers=headers)
+
+
+class _ChunkSink:
+    """Write-only, unseekable file object collecting what zipfile writes."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+async def _zip_renders(
+    jobs: Dict[str, RenderJob], concurrency: int, extension: str = "png"
+) -> AsyncIterator[bytes]:
+    """
+    Render `jobs` with bounded concurrency and stream them as a ZIP archive,
+    adding each image as soon as it is done. Jobs wait for a free render
+    worker rather than failing when the farm is busy. Names that collide
+    once path separators are replaced get a numeric suffix. Failures are
+    listed in ``errors.json`` at the end of the archive.
+    """
+    limit = asyncio.Semaphore(concurrency)
+
+    async def run(name: str, job: RenderJob):
+        async with limit:
+            try:
+                return name, await render(job, wait=True), None
+            except Exception as e:
+                return name, None, str(e) or type(e).__name__
+
+    tasks = [asyncio.ensure_future(run(name, job)) for name, job in jobs.items()]
+    sink = _ChunkSink()
+    errors = {}
+    entries = set()
+    try:
+        # Images are already compressed, so entries are stored as-is
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as zf:
+            for done in asyncio.as_completed(tasks):
+                name, image, error = await done
+                if image is None:
+                    errors[name] = error
+                    continue
+                stem = name.replace("/", "_").replace("\\", "_")
+                entry, n = f"{stem}.{extension}", 1
+                while entry in entries:
+                    n += 1
+                    entry = f"{stem}_{n}.{extension}"
+                entries.add(entry)
+                zf.writestr(entry, image)
+                yield sink.drain()
+            if errors:
+                zf.writestr("errors.json", json.dumps(errors, ensure_ascii=False))
+        yield sink.drain()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@router.post("/choropleth/batch")
+async def render_choropleth_batch(req: ChoroplethBatchRequest):
+    """
+    Render one map per dataset and stream them back as a ZIP archive.
+
+    All datasets share the level, palette and config, so the layers and the
+    figure layout are reused across them. Images are added to the archive
+    as they finish, named ``<dataset>.<ext>`` after ``config.format`` (with
+    ``/`` and ``\\`` replaced by ``_``, and ``_2``, ``_3``... appended on
+    collisions); datasets that failed are listed with their error in
+    ``errors.json``. Datasets queue for render workers instead of failing
+    with 503 when the farm is busy.
+    """
+    config = _to_render_config(req.config)
+    encoding = _encode_options(req.config)
+    jobs = {
+        name: RenderJob(
+            level=req.level.value,
+            data=data,
+            palette=req.palette,
+            config=config,
+            encoding=encoding,
+        )
+        for name, data in req.datasets.items()
+    }
+    # One job per worker process, or a few threads sharing pooled templates
+    concurrency = get_settings().render_workers or TEMPLATE_POOL.max_idle
+    return StreamingResponse(
+        _zip_renders(jobs, concurrency, EXTENSIONS[encoding.format]),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="choropleth_batch.zip"'},
+    )
+
+
+@router.post("/choropleth/animation")
+async def render_choropleth_animation(req: ChoroplethAnimationRequest):
+    """
+    Render a sequence of datasets as an animated map (GIF, APNG or MP4).
+
+    All frames share one color range and one figure layout; only colors and
+    titles change between frames. MP4 needs ffmpeg on the server. Responds
+    503 when all render workers are busy and 504 when rendering does not
+    finish in time.
+    """
+    job = AnimationJob(
+        level=req.level.value,
+        frames=req.frames,
+        palette=req.palette,
+        config=_to_render_config(req.config),
+        titles=req.titles,
+        format=req.format,
+        fps=req.fps,
+    )
+    content = await _await_render(render(job))
+    return Response(content=content, media_type=MEDIA_TYPES[req.format])
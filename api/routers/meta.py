@@ -2,13 +2,20 @@
 Meta endpoints for palettes, fonts, and health checks.
 """
 
-import matplotlib.pyplot as plt
+import matplotlib
 from fastapi import APIRouter
 
 from taiwanviz.models.palette import ColorPaletteManager
 from taiwanviz.utils.fonts import list_available_fonts
 
-from ..schemas import FontsResponse, HealthResponse, PaletteInfo, PalettesResponse
+from ..image_cache import get_image_cache
+from ..schemas import (
+    FontsResponse,
+    HealthResponse,
+    ImageCacheStatsResponse,
+    PaletteInfo,
+    PalettesResponse,
+)
 
 router = APIRouter()
 
@@ -65,5 +72,19 @@ def fonts() -> FontsResponse:
         Available TTF files and current default family name.
     """
     return FontsResponse(
-        fonts=list_available_fonts(), default_family=plt.rcParams.get("font.family")
+        fonts=list_available_fonts(),
+        default_family=matplotlib.rcParams.get("font.family"),
     )
+
+
+@router.get("/cache", response_model=ImageCacheStatsResponse)
+def cache_stats() -> ImageCacheStatsResponse:
+    """
+    Hit/miss/eviction counters and sizes of the rendered image cache.
+
+    Returns
+    -------
+    ImageCacheStatsResponse
+        Counters since startup and current memory/disk usage.
+    """
+    return ImageCacheStatsResponse(**get_image_cache().stats())
@@ -0,0 +1,89 @@
+"""
+Web Mercator XYZ map tiles of registered datasets.
+"""
+
+from typing import Optional, Union
+
+from fastapi import APIRouter, Header, HTTPException, Path, Query
+from fastapi.responses import Response
+
+from taiwanviz.models.base.registry import LAYER_REGISTRY
+from taiwanviz.models.enums import AdminLevel, ColorPalette
+from taiwanviz.models.palette import ColorPaletteManager
+from taiwanviz.models.tiles import MAX_ZOOM, render_tile
+
+from ..image_cache import etag_matches
+from ..schemas import TileDatasetRequest, TileDatasetResponse
+from ..settings import get_settings
+from ..tile_store import get_tile_cache, get_tile_datasets, tile_colors
+
+router = APIRouter()
+
+
+@router.post("/datasets", response_model=TileDatasetResponse)
+def register_dataset(req: TileDatasetRequest) -> TileDatasetResponse:
+    """
+    Register a dataset for tiling and return its id and tile URL template.
+
+    The id is a content hash, so registering the same data again yields the
+    same id and the same (cached) tiles.
+    """
+    key = get_tile_datasets().add(req.level.value, req.data)
+    return TileDatasetResponse(
+        dataset=key,
+        level=req.level,
+        tiles=f"/tiles/{req.level.value}/{{z}}/{{x}}/{{y}}.png?dataset={key}",
+    )
+
+
+@router.get("/{level}/{z}/{x}/{y}.png")
+def tile(
+    level: AdminLevel,
+    z: int = Path(..., ge=0, le=MAX_ZOOM),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    dataset: str = Query(..., description="Id from POST /tiles/datasets."),
+    palette: Union[ColorPalette, str] = ColorPalette.NORD,
+    if_none_match: Optional[str] = Header(default=None),
+):
+    """
+    One 256x256 PNG tile of a registered dataset.
+
+    Only the regions intersecting the tile are drawn, at the level of detail
+    matching the zoom. Tiles are cached per dataset, palette and address.
+    The palette and dataset are checked before any cache or
+    ``If-None-Match`` lookup, so an evicted dataset answers 404 rather than
+    304, and an unknown palette 400.
+    """
+    if x >= 1 << z or y >= 1 << z:
+        raise HTTPException(status_code=400, detail=f"No tile {z}/{x}/{y}")
+    palette = getattr(palette, "value", palette)
+    if palette not in ColorPaletteManager.palettes:
+        raise HTTPException(status_code=400, detail=f"Unknown palette {palette!r}")
+
+    entry = get_tile_datasets().get(dataset)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Unknown tile dataset")
+    if entry[0] != level.value:
+        raise HTTPException(status_code=400, detail=f"Dataset is for level {entry[0]}")
+
+    layer = LAYER_REGISTRY.get(level.value)
+    cache_key = f"{dataset}-{palette}-{layer.version}-{z}-{x}-{y}"
+    etag = f'"{dataset[:16]}-{palette}-{layer.version}-{z}-{x}-{y}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={get_settings().tile_max_age}",
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    cache = get_tile_cache()
+    png = cache.get(cache_key)
+    if png is None:
+        try:
+            colors, edgecolor = tile_colors(dataset, palette, layer.version)
+            png = render_tile(layer, z, x, y, colors, edgecolor=edgecolor)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Rendering failed: {e}")
+        cache.put(cache_key, png)
+    return Response(content=png, media_type="image/png", headers=headers)
@@ -2,11 +2,12 @@
 Pydantic models (request/response schemas) for the API.
 """
 
-from typing import Dict, Literal, Optional, Tuple, Union
+from typing import Annotated, Dict, List, Literal, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, BeforeValidator, Field, model_validator
 
 from taiwanviz.models.enums import AdminLevel, ColorPalette
+from taiwanviz.utils.encoding import AnimationFormat, OutputFormat
 
 LegendLoc = Literal[
     "right", "left", "upper right", "upper left", "lower right", "lower left"
@@ -15,6 +16,18 @@ LegendLoc = Literal[
 ResponseType = Literal["png", "base64", "json_url"]
 
 
+def _palette_name(v):
+    """
+    Accept both enum and plain strings for palette.
+    """
+    if isinstance(v, ColorPalette):
+        return v.value
+    return v
+
+
+PaletteName = Annotated[Union[ColorPalette, str], BeforeValidator(_palette_name)]
+
+
 class RenderConfigModel(BaseModel):
     """
     Render configuration mirror for ChoroplethRenderConfig with extras for API.
@@ -32,8 +45,44 @@ class RenderConfigModel(BaseModel):
     title: Optional[str] = None
     show_legend: bool = False
     legend_loc: LegendLoc = "right"
+    lod: Optional[int] = Field(
+        default=None, ge=0, description="Geometry detail tier; None picks by DPI."
+    )
+    backend: Literal["geopandas", "paths"] = "geopandas"
     response_type: ResponseType = "png"
 
+    # Output encoding
+    format: OutputFormat = Field(
+        default="png",
+        description="Image format; png8 is a palette PNG, usually several "
+        "times smaller for choropleths.",
+    )
+    quality: int = Field(default=90, ge=1, le=100, description="WebP/JPEG quality.")
+    lossless: bool = Field(default=False, description="Lossless WebP.")
+    compress_level: int = Field(
+        default=6, ge=0, le=9, description="PNG zlib level; lower is faster."
+    )
+    colors: int = Field(default=256, ge=2, le=256, description="png8 palette size.")
+    max_pixels: Optional[int] = Field(
+        default=None,
+        ge=10_000,
+        description="Cap on width x height; the DPI is lowered to fit.",
+    )
+
+    @model_validator(mode="after")
+    def check_max_pixels(self):
+        """
+        Require `max_pixels` to fit the figure at 1 DPI at least.
+        """
+        if self.max_pixels is not None:
+            smallest = self.figsize[0] * self.figsize[1]
+            if smallest > self.max_pixels:
+                raise ValueError(
+                    f"max_pixels must be at least {smallest} for figsize "
+                    f"{tuple(self.figsize)}"
+                )
+        return self
+
 
 class ChoroplethRequest(BaseModel):
     """
@@ -44,23 +93,169 @@ class ChoroplethRequest(BaseModel):
     data: Dict[str, float] = Field(
         ..., description="Mapping from region name to numeric value."
     )
-    palette: Union[ColorPalette, str] = Field(
-        ColorPalette.NORD, description="Color palette name."
-    )
+    palette: PaletteName = Field(ColorPalette.NORD, description="Color palette name.")
     config: Optional[RenderConfigModel] = Field(
         default=None, description="Optional rendering configuration overrides."
     )
 
-    @field_validator("palette", mode="before")
-    def cast_palette(cls, v):
+
+class ChoroplethBatchRequest(BaseModel):
+    """
+    Request payload for rendering many datasets with one layout.
+    """
+
+    level: AdminLevel = Field(..., description="Administrative level to render.")
+    datasets: Dict[str, Dict[str, float]] = Field(
+        ...,
+        min_length=1,
+        description="Dataset name to mapping from region name to numeric value.",
+    )
+    palette: PaletteName = Field(ColorPalette.NORD, description="Color palette name.")
+    config: Optional[RenderConfigModel] = Field(
+        default=None,
+        description="Rendering configuration shared by all datasets "
+        "(response_type is ignored).",
+    )
+
+
+class ChoroplethAnimationRequest(BaseModel):
+    """
+    Request payload for an animated choropleth over a time series.
+    """
+
+    level: AdminLevel = Field(..., description="Administrative level to render.")
+    frames: List[Dict[str, float]] = Field(
+        ...,
+        min_length=1,
+        description="Mapping from region name to numeric value, per frame.",
+    )
+    titles: Optional[List[str]] = Field(
+        default=None, description="Optional title per frame."
+    )
+    palette: PaletteName = Field(ColorPalette.NORD, description="Color palette name.")
+    config: Optional[RenderConfigModel] = Field(
+        default=None,
+        description="Rendering configuration shared by all frames "
+        "(response_type is ignored).",
+    )
+    format: AnimationFormat = "gif"
+    fps: float = Field(default=2.0, gt=0, le=60, description="Frames per second.")
+
+    @model_validator(mode="after")
+    def check_titles(self):
         """
-        Accept both enum and plain strings for palette.
+        Require one title per frame when titles are given.
         """
-        if isinstance(v, str):
-            return v
-        if isinstance(v, ColorPalette):
-            return v.value
-        return v
+        if self.titles is not None and len(self.titles) != len(self.frames):
+            raise ValueError("titles must have one entry per frame")
+        return self
+
+
+class RegionDataRequest(BaseModel):
+    """
+    Request payload for values and colors only (no image).
+    """
+
+    data: Dict[str, float] = Field(
+        ..., description="Mapping from region name to numeric value."
+    )
+    palette: PaletteName = Field(ColorPalette.NORD, description="Color palette name.")
+    config: Optional[RenderConfigModel] = Field(
+        default=None,
+        description="Rendering configuration; only exclude_offshore affects "
+        "the color range.",
+    )
+
+
+class RegionDataResponse(BaseModel):
+    """
+    Joined values and fill colors keyed by region code.
+    """
+
+    level: AdminLevel
+    version: str = Field(..., description="Geometry version the codes belong to.")
+    default_fill: str
+    default_edge: str
+    clim: Optional[Tuple[float, float]] = Field(
+        default=None, description="Value range mapped onto the palette."
+    )
+    values: Dict[str, float] = Field(
+        ..., description="Region code to value, for regions with data."
+    )
+    colors: Dict[str, str] = Field(
+        ...,
+        description="Region code to hex fill, for regions with data; "
+        "all others use default_fill.",
+    )
+    unmatched: List[str] = Field(
+        default_factory=list, description="Data keys that name no region."
+    )
+    ambiguous: List[str] = Field(
+        default_factory=list,
+        description="Data keys that name several regions (e.g. a bare town "
+        "name); use a code or a county/town path instead.",
+    )
+
+
+class LocateRequest(BaseModel):
+    """
+    Request payload assigning lon/lat points to regions.
+    """
+
+    lon: List[float] = Field(
+        ..., max_length=1_000_000, description="Longitudes (EPSG:4326)."
+    )
+    lat: List[float] = Field(
+        ..., max_length=1_000_000, description="Latitudes (EPSG:4326)."
+    )
+
+    @model_validator(mode="after")
+    def check_lengths(self):
+        """
+        Require one latitude per longitude.
+        """
+        if len(self.lon) != len(self.lat):
+            raise ValueError("lon and lat must have the same length")
+        return self
+
+
+class LocateResponse(BaseModel):
+    """
+    Region of every point, in request order; null outside Taiwan.
+    """
+
+    matched: int = Field(..., description="Number of points inside a village.")
+    county_code: List[Optional[str]]
+    county_name: List[Optional[str]]
+    town_code: List[Optional[str]]
+    town_name: List[Optional[str]]
+    village_code: List[Optional[str]]
+    village_name: List[Optional[str]]
+
+
+class TileDatasetRequest(BaseModel):
+    """
+    Request payload registering a dataset for map tiles.
+    """
+
+    level: AdminLevel = Field(..., description="Administrative level to render.")
+    data: Dict[str, float] = Field(
+        ..., description="Mapping from region name to numeric value."
+    )
+
+
+class TileDatasetResponse(BaseModel):
+    """
+    Identifier of a registered tile dataset.
+    """
+
+    dataset: str = Field(..., description="Content hash identifying the dataset.")
+    level: AdminLevel
+    tiles: str = Field(
+        ...,
+        description="XYZ URL template of the dataset's tiles; append "
+        "'&palette=<name>' to pick a palette.",
+    )
 
 
 class PaletteInfo(BaseModel):
@@ -97,3 +292,20 @@ class HealthResponse(BaseModel):
     """
 
     status: str = "ok"
+
+
+class ImageCacheStatsResponse(BaseModel):
+    """
+    Rendered image cache counters since startup.
+    """
+
+    hits: int
+    disk_hits: int
+    misses: int
+    evictions: int
+    disk_evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+    disk_bytes: int
+    max_disk_bytes: int
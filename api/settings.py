@@ -0,0 +1,128 @@
+"""
+API settings read from environment variables.
+
+All variables are prefixed with ``TAIWANVIZ_``; see `Settings` for the list.
+"""
+
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_str(name: str) -> Optional[str]:
+    return os.environ.get(name) or None
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Runtime configuration for the API.
+
+    Attributes
+    ----------
+    render_workers : int
+        Render worker processes (``TAIWANVIZ_RENDER_WORKERS``). 0 renders in
+        the server's thread pool instead.
+    render_queue_size : int
+        Jobs allowed to wait for a worker before requests get 503
+        (``TAIWANVIZ_RENDER_QUEUE_SIZE``).
+    render_timeout : float
+        Seconds a request waits for its render (``TAIWANVIZ_RENDER_TIMEOUT``).
+    worker_max_jobs : int
+        Jobs a worker process serves before it is replaced
+        (``TAIWANVIZ_WORKER_MAX_JOBS``).
+    worker_max_rss_mb : int
+        Peak resident memory (MiB) after which the workers are replaced
+        (``TAIWANVIZ_WORKER_MAX_RSS_MB``).
+    image_cache_mb : int
+        Memory budget (MiB) of the rendered image cache
+        (``TAIWANVIZ_IMAGE_CACHE_MB``). 0 disables it.
+    image_cache_dir : str, optional
+        Directory of the on-disk image cache tier
+        (``TAIWANVIZ_IMAGE_CACHE_DIR``). Unset keeps images in memory only.
+    image_cache_disk_mb : int
+        Disk budget (MiB) of that tier (``TAIWANVIZ_IMAGE_CACHE_DISK_MB``).
+    geometry_max_age : int
+        Seconds clients may cache geometry documents
+        (``TAIWANVIZ_GEOMETRY_MAX_AGE``).
+    tile_cache_mb : int
+        Memory budget (MiB) of the rendered map tile cache
+        (``TAIWANVIZ_TILE_CACHE_MB``). 0 disables it.
+    tile_datasets : int
+        Registered tile datasets kept before the least recently used is
+        dropped (``TAIWANVIZ_TILE_DATASETS``).
+    tile_max_age : int
+        Seconds clients may cache map tiles (``TAIWANVIZ_TILE_MAX_AGE``).
+    artifact_dir : str, optional
+        Directory of rendered images served under ``/render/artifacts``
+        (``TAIWANVIZ_ARTIFACT_DIR``). Defaults to ``taiwanviz-artifacts`` in
+        the system temporary directory.
+    artifact_max_mb : int
+        Disk budget (MiB) of that directory (``TAIWANVIZ_ARTIFACT_MAX_MB``).
+    artifact_ttl : int
+        Seconds an artifact stays available after it was last rendered or
+        requested (``TAIWANVIZ_ARTIFACT_TTL``).
+    """
+
+    render_workers: int = field(
+        default_factory=lambda: _env_int("TAIWANVIZ_RENDER_WORKERS", 0)
+    )
+    render_queue_size: int = field(
+        default_factory=lambda: _env_int("TAIWANVIZ_RENDER_QUEUE_SIZE", 8)
+    )
+    render_timeout: float = field(
+        default_factory=lambda: _env_float("TAIWANVIZ_RENDER_TIMEOUT", 30.0)
+    )
+    worker_max_jobs: int = field(
+        default_factory=lambda: _env_int("TAIWANVIZ_WORKER_MAX_JOBS", 500)
+    )
+    worker_max_rss_mb: int = field(
+        default_factory=lambda: _env_int("TAIWANVIZ_WORKER_MAX_RSS_MB", 1536)
+    )
+    image_cache_mb: int = field(
+        default_factory=lambda: _env_int("TAIWANVIZ_IMAGE_CACHE_MB", 256)
+    )
+    image_cache_dir: Optional[str] = field(
+        default_factory=lambda: _env_str("TAIWANVIZ_IMAGE_CACHE_DIR")
+    )
+    image_cache_disk_mb: int = field(
+        default_factory=lambda: _env_int("TAIWANVIZ_IMAGE_CACHE_DISK_MB", 2048)
+    )
+    geometry_max_age: int = field(
+        default_factory=lambda: _env_int("TAIWANVIZ_GEOMETRY_MAX_AGE", 7 * 86400)
+    )
+    tile_cache_mb: int = field(
+        default_factory=lambda: _env_int("TAIWANVIZ_TILE_CACHE_MB", 64)
+    )
+    tile_datasets: int = field(
+        default_factory=lambda: _env_int("TAIWANVIZ_TILE_DATASETS", 256)
+    )
+    tile_max_age: int = field(
+        default_factory=lambda: _env_int("TAIWANVIZ_TILE_MAX_AGE", 86400)
+    )
+    artifact_dir: Optional[str] = field(
+        default_factory=lambda: _env_str("TAIWANVIZ_ARTIFACT_DIR")
+    )
+    artifact_max_mb: int = field(
+        default_factory=lambda: _env_int("TAIWANVIZ_ARTIFACT_MAX_MB", 1024)
+    )
+    artifact_ttl: int = field(
+        default_factory=lambda: _env_int("TAIWANVIZ_ARTIFACT_TTL", 3600)
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Settings for this process, read from the environment once."""
+    return Settings()
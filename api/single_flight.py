@@ -0,0 +1,73 @@
+"""
+Coalescing of identical in-flight work.
+
+When many clients ask for the same render at once, only the first request
+(the leader) starts it; the others (followers) wait for the same result.
+The shared work runs as its own task and every caller waits on it through
+``asyncio.shield`` with its own timeout, so a caller that times out or
+disconnects never cancels the render for the rest.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Run at most one coroutine per key at a time and share its result.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the outcome as retrieved even if every caller already left
+        if not task.cancelled():
+            task.exception()
+
+    async def do(
+        self,
+        key: str,
+        work: Callable[[], Awaitable[T]],
+        timeout: Optional[float] = None,
+    ) -> T:
+        """
+        Await the result of `work()` for `key`, starting it only if no call
+        for `key` is already in flight.
+
+        Parameters
+        ----------
+        key : str
+            Identity of the work; equal keys must produce equal results.
+        work : callable
+            Coroutine function started by the leader.
+        timeout : float, optional
+            Seconds this caller waits. Expiry raises ``asyncio.TimeoutError``
+            for this caller only; the shared work keeps running.
+
+        Returns
+        -------
+        Any
+            The result of the shared call. Its exception, if any, is raised
+            in every waiting caller.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(work())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            logger.debug(f"Joining in-flight render {key[:12]}")
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+
+RENDER_FLIGHTS = SingleFlight()
@@ -2,34 +2,53 @@
 App startup/shutdown hooks.
 
 - Switch Matplotlib backend to Agg (headless)
-- Register packaged fonts and set default Chinese font
+- Register the default Chinese font family and make it the default
+- Warm the shared geometry layers so the first request does not load them
+- Start the render worker processes, if configured
 """
 
 import logging
 
 import matplotlib
 
-from taiwanviz.utils.fonts import register_all_fonts, set_default_zh_font
+from taiwanviz.models.base.registry import evict_layers, warm_layers
+from taiwanviz.utils.fonts import set_default_zh_font
+
+from .render_pool import start_render_farm, stop_render_farm
+from .settings import get_settings
 
 logger = logging.getLogger(__name__)
 
 
-def on_startup():
+def prepare_renderer():
     """
-    Startup hook to prepare rendering environment.
+    Make the current process ready to render. Also run by each render worker.
     """
     # Use non-interactive backend suitable for servers/containers
     matplotlib.use("Agg")
 
-    # Register packaged fonts and set default Chinese font
-    register_all_fonts()
+    # Register the default Chinese font; other families register on demand
     set_default_zh_font()
 
-    logger.info("Startup complete: Matplotlib Agg + fonts registered.")
+    # Load county/town/village layers once for all requests
+    warm_layers()
+
+
+def on_startup():
+    """
+    Startup hook to prepare rendering environment.
+    """
+    # With worker processes the server itself does not draw
+    if start_render_farm(get_settings()) is None:
+        prepare_renderer()
+
+    logger.info("Startup complete: Matplotlib Agg + fonts + layers ready.")
 
 
 def on_shutdown():
     """
-    Shutdown hook. Reserved for future cleanup if needed.
+    Shutdown hook. Stops the render workers and releases the shared layers.
     """
+    stop_render_farm()
+    evict_layers()
     logger.info("Shutdown complete.")
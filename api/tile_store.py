@@ -0,0 +1,99 @@
+"""
+Registered tile datasets and the rendered tile cache.
+
+A tile dataset is one level plus its region/value mapping, registered once
+and then referenced by its content hash from every tile URL, so tile
+requests stay small, cacheable GETs.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from taiwanviz.models.choropleth import ChoroplethMap
+from taiwanviz.models.config import ChoroplethRenderConfig
+
+from .image_cache import ImageCache
+from .settings import get_settings
+
+# Tiles draw every region where it lies; no offshore exclusion or insets
+TILE_CONFIG = ChoroplethRenderConfig(exclude_offshore=False, show_inset=False)
+
+
+def dataset_key(level: str, data: Dict[str, float]) -> str:
+    """SHA-256 of a level and its data, independent of key order."""
+    doc = {"level": level, "data": sorted(data.items())}
+    blob = json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class TileDatasets:
+    """
+    Thread-safe LRU of registered datasets, keyed by `dataset_key`.
+
+    Parameters
+    ----------
+    max_entries : int
+        Datasets kept before the least recently used is dropped.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Dict[str, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, level: str, data: Dict[str, float]) -> str:
+        """Register a dataset and return its key."""
+        key = dataset_key(level, data)
+        with self._lock:
+            self._entries[key] = (level, dict(data))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return key
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, float]]]:
+        """Level and data of a registered dataset, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+
+@lru_cache(maxsize=1)
+def get_tile_datasets() -> TileDatasets:
+    """Process-wide dataset registry, sized from the settings."""
+    return TileDatasets(get_settings().tile_datasets)
+
+
+@lru_cache(maxsize=1)
+def get_tile_cache() -> ImageCache:
+    """Process-wide cache of rendered tiles, sized from the settings."""
+    return ImageCache(get_settings().tile_cache_mb * 1024 * 1024)
+
+
+@lru_cache(maxsize=64)
+def tile_colors(key: str, palette: str, version: str) -> Tuple[np.ndarray, str]:
+    """
+    Fill colors and edge color of a registered dataset, computed once per
+    dataset, palette and layer `version` rather than per tile. The colors
+    are aligned to the layer rows, so `version` keeps a replaced layer from
+    being drawn with colors of the old one.
+
+    Raises
+    ------
+    KeyError
+        If the dataset is not registered.
+    """
+    entry = get_tile_datasets().get(key)
+    if entry is None:
+        raise KeyError(key)
+    level, data = entry
+    m = ChoroplethMap(level=level, data=data, palette_name=palette)
+    return m.tile_colors(TILE_CONFIG), m.default_edge
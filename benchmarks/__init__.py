@@ -0,0 +1,14 @@
+"""
+TaiwanViz benchmarks.
+
+- fixtures: synthetic county/town/village shapefiles with the real region
+  counts and comparable vertex densities, for checkouts without the
+  packaged (Git LFS) shapefiles.
+- suite: timed operations per administrative level (load, join, color,
+  filter, draw, encode).
+- run: command line runner writing JSON results and comparing them with an
+  earlier run.
+
+Run ``python -m benchmarks.run --help`` (or ``make bench``) from the
+repository root.
+"""
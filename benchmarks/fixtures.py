@@ -0,0 +1,223 @@
+"""
+Synthetic Taiwan-like administrative layers.
+
+Regions are nested blocks of a lattice: 22 counties of 4 x 4 towns, each
+town a block of 5 x 4 villages (22 / 352 / 7040 regions, close to the real
+22 / 368 / ~7700). Every unit lattice edge is a wiggly line generated from
+the edge's lattice position alone, so neighbouring polygons share their
+boundary vertices exactly, as in the real coverage, and a coarser region's
+boundary carries the vertices of the villages along it.
+
+County names and codes are the real ones. Kinmen, Matsu and Penghu are moved
+to their real positions and carry the town names the region masks look for,
+and one Kaohsiung town is moved to Dongsha, so filters and insets select
+what they would on the packaged shapefiles.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from taiwanviz.models.base.layers import LAYER_SOURCES
+from taiwanviz.models.base.registry import LAYER_REGISTRY
+from taiwanviz.utils.filters import KINMEN_TOWNS, MATSU_TOWNS
+
+# Bump when generated geometry or attributes change
+FIXTURE_VERSION = 1
+
+COUNTIES = (
+    ("63000", "臺北市"),
+    ("65000", "新北市"),
+    ("10017", "基隆市"),
+    ("68000", "桃園市"),
+    ("10004", "新竹縣"),
+    ("10018", "新竹市"),
+    ("10005", "苗栗縣"),
+    ("66000", "臺中市"),
+    ("10007", "彰化縣"),
+    ("10008", "南投縣"),
+    ("10009", "雲林縣"),
+    ("10010", "嘉義縣"),
+    ("10020", "嘉義市"),
+    ("67000", "臺南市"),
+    ("64000", "高雄市"),
+    ("10013", "屏東縣"),
+    ("10002", "宜蘭縣"),
+    ("10015", "花蓮縣"),
+    ("10014", "臺東縣"),
+    ("10016", "澎湖縣"),
+    ("09020", "金門縣"),
+    ("09007", "連江縣"),
+)
+
+# Counties in lattice blocks: 2 columns x 11 rows
+COUNTY_GRID = (2, 11)
+TOWN_GRID = (4, 4)
+VILLAGE_GRID = (5, 4)
+
+# Lon/lat extent of the lattice (main island)
+LON0, LAT0 = 120.0, 21.9
+LON_SPAN, LAT_SPAN = 2.0, 3.4
+
+# Where the outlying counties are moved: name -> (lon, lat) of the lower left
+OUTLYING = {
+    "金門縣": (118.2, 24.35),
+    "連江縣": (119.9, 25.9),
+    "澎湖縣": (119.3, 23.2),
+}
+DONGSHA = (116.65, 20.65)
+
+DEFAULT_DENSITY = 64
+
+
+def _edge_phase(i: np.ndarray, j: np.ndarray, horizontal: bool) -> np.ndarray:
+    """Deterministic pseudo-random phase of each unit lattice edge."""
+    h = (i * 73856093) ^ (j * 19349663) ^ (83492791 if horizontal else 0)
+    return (h % 1009) / 1009 * 2 * np.pi
+
+
+def _side(i0: int, j0: int, n: int, horizontal: bool, density: int) -> np.ndarray:
+    """
+    Points of `n` unit edges from lattice point (i0, j0) along x
+    (`horizontal`) or y, endpoints included, in lattice units.
+    """
+    e = np.arange(n)
+    t = np.arange(density) / density
+    along = (e[:, None] + t[None, :]).ravel()
+    i = i0 + e if horizontal else np.full(n, i0)
+    j = np.full(n, j0) if horizontal else j0 + e
+    phase = _edge_phase(i, j, horizontal)[:, None]
+    # Zero at lattice points, so corners are exact and shared
+    offset = (0.12 * np.sin(np.pi * t) * np.sin(3 * np.pi * t + phase)).ravel()
+    along = np.append(along, n)
+    offset = np.append(offset, 0.0)
+    xy = (i0 + along, j0 + offset) if horizontal else (i0 + offset, j0 + along)
+    return np.column_stack(xy)
+
+
+def _block(i0: int, j0: int, w: int, h: int, density: int) -> np.ndarray:
+    """Closed ring around a `w` x `h` block of unit cells, counter-clockwise."""
+    bottom = _side(i0, j0, w, True, density)
+    right = _side(i0 + w, j0, h, False, density)
+    top = _side(i0, j0 + h, w, True, density)[::-1]
+    left = _side(i0, j0, h, False, density)[::-1]
+    return np.concatenate([bottom[:-1], right[:-1], top[:-1], left])
+
+
+def _town_names(county: str, n: int) -> List[str]:
+    special = {"金門縣": KINMEN_TOWNS, "連江縣": MATSU_TOWNS}.get(county, [])
+    names = list(special[:n])
+    names += [f"第{k + 1}區" for k in range(len(names), n)]
+    return names
+
+
+def build_frames(density: int = DEFAULT_DENSITY) -> Dict[str, gpd.GeoDataFrame]:
+    """
+    Build the county, town and village layers.
+
+    Parameters
+    ----------
+    density : int, default 64
+        Vertices per unit lattice edge. A village has ``4 * density``
+        vertices, a town ``18 * density`` and a county ``72 * density``
+        (about 1.8M village vertices by default).
+
+    Returns
+    -------
+    dict
+        Level to GeoDataFrame in EPSG:3824 (TWD97 lon/lat, as shipped).
+    """
+    tw, th = TOWN_GRID
+    vw, vh = VILLAGE_GRID
+    cw, ch = tw * vw, th * vh  # county size in lattice units
+    lattice_w = COUNTY_GRID[0] * cw
+    lattice_h = COUNTY_GRID[1] * ch
+    scale = np.array([LON_SPAN / lattice_w, LAT_SPAN / lattice_h])
+    origin = np.array([LON0, LAT0])
+
+    rows = {"county": [], "town": [], "village": []}
+    rings = {"county": [], "town": [], "village": []}
+    shifts = {"county": [], "town": [], "village": []}
+
+    for c, (ccode, cname) in enumerate(COUNTIES):
+        ci, cj = c % COUNTY_GRID[0] * cw, c // COUNTY_GRID[0] * ch
+        shift = np.zeros(2)
+        if cname in OUTLYING:
+            shift = np.array(OUTLYING[cname]) - (origin + scale * (ci, cj))
+        county = {"COUNTYNAME": cname, "COUNTYCODE": ccode}
+        rows["county"].append(county)
+        rings["county"].append(_block(ci, cj, cw, ch, density))
+        shifts["county"].append(shift)
+
+        for t, tname in enumerate(_town_names(cname, tw * th)):
+            ti, tj = ci + t % tw * vw, cj + t // tw * vh
+            tshift = shift
+            if cname == "高雄市" and t == tw * th - 1:
+                tname = "東沙群島"
+                tshift = np.array(DONGSHA) - (origin + scale * (ti, tj))
+            tcode = f"{ccode}{t + 1:03d}"
+            town = {**county, "TOWNNAME": tname, "TOWNCODE": tcode}
+            rows["town"].append(town)
+            rings["town"].append(_block(ti, tj, vw, vh, density))
+            shifts["town"].append(tshift)
+
+            for v in range(vw * vh):
+                vi, vj = ti + v % vw, tj + v // vw
+                rows["village"].append(
+                    {
+                        **town,
+                        # Names repeat across towns, like the many 中正里
+                        "VILLNAME": f"第{v + 1}里",
+                        "VILLCODE": f"{tcode}{v + 1:03d}",
+                    }
+                )
+                rings["village"].append(_block(vi, vj, 1, 1, density))
+                shifts["village"].append(tshift)
+
+    frames = {}
+    for level, level_rings in rings.items():
+        polygons = [
+            shapely.Polygon(origin + scale * ring + shift)
+            for ring, shift in zip(level_rings, shifts[level])
+        ]
+        frames[level] = gpd.GeoDataFrame(
+            rows[level], geometry=polygons, crs="EPSG:3824"
+        )
+    return frames
+
+
+def fixture_paths(
+    directory: Path, density: int = DEFAULT_DENSITY
+) -> Tuple[Dict[str, Path], bool]:
+    """
+    Shapefiles of the fixture under `directory`, written if missing.
+
+    Returns
+    -------
+    (dict, bool)
+        Level to ``.shp`` path, and whether the files were just written.
+    """
+    params = {"version": FIXTURE_VERSION, "density": density}
+    tag = hashlib.sha256(json.dumps(params).encode()).hexdigest()[:12]
+    root = Path(directory) / f"fixture-{tag}"
+    paths = {level: root / level / f"{level}.shp" for level in LAYER_SOURCES}
+    if all(p.exists() for p in paths.values()):
+        return paths, False
+
+    for level, gdf in build_frames(density).items():
+        paths[level].parent.mkdir(parents=True, exist_ok=True)
+        gdf.to_file(paths[level], encoding="utf-8")
+    (root / "params.json").write_text(json.dumps(params))
+    return paths, True
+
+
+def install(paths: Dict[str, Path]) -> None:
+    """Load the fixture layers into the process-wide layer registry."""
+    for level, path in paths.items():
+        cls = LAYER_SOURCES[level][0]
+        LAYER_REGISTRY.register(level, cls(str(path)))
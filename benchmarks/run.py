@@ -0,0 +1,302 @@
+"""
+Run the TaiwanViz benchmarks and compare runs.
+
+Every benchmark of `benchmarks.suite` runs per level: it is timed over
+``--repeat`` rounds of enough calls to last ``--min-time`` seconds, then
+called once more under tracemalloc for its peak traced memory (Python and
+NumPy allocations; GEOS and Agg buffers are not traced). Results are written
+as JSON, and ``--compare`` reports the ratios to an earlier file and exits
+with status 1 when a median time or peak memory grew past ``--threshold``.
+
+Examples
+--------
+Run everything on the synthetic fixture and save the results::
+
+    python -m benchmarks.run
+
+Only village joins, compared with a baseline::
+
+    python -m benchmarks.run -l village -k map_data --compare base.json
+"""
+
+import argparse
+import gc
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import matplotlib
+
+from benchmarks import fixtures
+from benchmarks.suite import BENCHMARKS, Context, Skip
+from taiwanviz.models.base.layers import LAYER_SOURCES
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Bump when the result layout changes
+RESULTS_FORMAT = 1
+
+LFS_POINTER = b"version https://git-lfs"
+
+
+def _is_lfs_pointer(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(LFS_POINTER)) == LFS_POINTER
+    except OSError:
+        return True
+
+
+def _git_revision() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _environment() -> Dict[str, str]:
+    import geopandas
+    import numpy
+    import shapely
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": numpy.__version__,
+        "shapely": shapely.__version__,
+        "geopandas": geopandas.__version__,
+        "matplotlib": matplotlib.__version__,
+    }
+
+
+def time_call(fn: Callable[[], object], repeat: int, min_time: float) -> Dict:
+    """
+    Seconds per call of `fn`: `repeat` rounds of `number` calls, with
+    `number` chosen so a round lasts at least `min_time`.
+    """
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    number = max(1, math.ceil(min_time / once)) if once > 0 else 1000
+
+    rounds = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) / number)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_s": min(rounds),
+        "median_s": statistics.median(rounds),
+        "mean_s": statistics.fmean(rounds),
+        "stdev_s": statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+    }
+
+
+def peak_memory(fn: Callable[[], object]) -> int:
+    """Peak traced bytes allocated during one call of `fn`."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(
+    ctx: Context,
+    levels: List[str],
+    pattern: Optional[str],
+    repeat: int,
+    min_time: float,
+) -> List[Dict]:
+    """Run the selected benchmarks, printing one line per result."""
+    results = []
+    for level in levels:
+        for name, factory in BENCHMARKS.items():
+            if pattern and pattern not in name:
+                continue
+            try:
+                fn = factory(level, ctx)
+            except Skip:
+                continue
+            timing = time_call(fn, repeat, min_time)
+            peak = peak_memory(fn)
+            result = {
+                "name": f"{level}.{name}",
+                "level": level,
+                "benchmark": name,
+                **timing,
+                "peak_kib": peak // 1024,
+            }
+            results.append(result)
+            print(
+                f"{result['name']:<34} {timing['median_s'] * 1e3:10.3f} ms "
+                f"± {timing['stdev_s'] * 1e3:7.3f}  peak {peak / 2**20:8.1f} MiB",
+                flush=True,
+            )
+    return results
+
+
+def compare(
+    results: List[Dict], baseline: Dict, threshold: float
+) -> List[Tuple[str, str, float]]:
+    """
+    Print time and memory ratios to `baseline` and return the regressions
+    as (name, metric, ratio).
+    """
+    base = {r["name"]: r for r in baseline["results"]}
+    regressions = []
+    print(f"\nCompared with {baseline['meta']['revision']}:")
+    for r in results:
+        old = base.get(r["name"])
+        if old is None:
+            continue
+        t_ratio = r["median_s"] / old["median_s"] if old["median_s"] else 1.0
+        m_ratio = r["peak_kib"] / old["peak_kib"] if old["peak_kib"] else 1.0
+        flags = []
+        if t_ratio > 1 + threshold:
+            flags.append("SLOWER")
+            regressions.append((r["name"], "time", t_ratio))
+        # Ignore growth below 1 MiB; small peaks are noisy
+        if m_ratio > 1 + threshold and r["peak_kib"] - old["peak_kib"] > 1024:
+            flags.append("MORE MEMORY")
+            regressions.append((r["name"], "memory", m_ratio))
+        if t_ratio < 1 / (1 + threshold):
+            flags.append("faster")
+        print(
+            f"{r['name']:<34} time x{t_ratio:5.2f}  memory x{m_ratio:5.2f}  "
+            + " ".join(flags)
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Time TaiwanViz load, join, color, filter, draw and encode.",
+    )
+    parser.add_argument(
+        "-l",
+        "--level",
+        action="append",
+        choices=list(LAYER_SOURCES),
+        help="level to run (repeatable; default: all)",
+    )
+    parser.add_argument("-k", "--filter", help="only benchmarks containing this")
+    parser.add_argument("--repeat", type=int, default=5, help="timing rounds")
+    parser.add_argument(
+        "--min-time", type=float, default=0.2, help="minimum seconds per round"
+    )
+    parser.add_argument(
+        "--data",
+        choices=("synthetic", "packaged"),
+        default="synthetic",
+        help="synthetic fixture (default) or the packaged shapefiles",
+    )
+    parser.add_argument(
+        "--density",
+        type=int,
+        default=fixtures.DEFAULT_DENSITY,
+        help="fixture vertices per lattice edge",
+    )
+    parser.add_argument(
+        "--workdir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "taiwanviz-bench",
+        help="where fixtures and the geometry cache are kept",
+    )
+    parser.add_argument("-o", "--output", type=Path, help="results file to write")
+    parser.add_argument("--compare", type=Path, help="earlier results file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative growth reported as a regression (default 0.2)",
+    )
+    args = parser.parse_args(argv)
+    matplotlib.use("Agg")
+
+    if args.data == "packaged":
+        paths = None
+        probe = Context(None, args.workdir).shapefile("county")
+        if _is_lfs_pointer(probe):
+            parser.error("packaged shapefiles are Git LFS pointers; use synthetic")
+    else:
+        paths, built = fixtures.fixture_paths(args.workdir, args.density)
+        if built:
+            print(f"Wrote fixture shapefiles to {paths['county'].parent.parent}")
+    ctx = Context(paths, args.workdir / "cache")
+
+    if paths is not None:
+        fixtures.install(paths)
+    else:
+        from taiwanviz.models.base.registry import warm_layers
+
+        warm_layers()
+
+    from taiwanviz.utils.fonts import DEFAULT_ZH_FONT, font_index
+
+    if _is_lfs_pointer(font_index().get(DEFAULT_ZH_FONT, "")):
+        # Checkouts without LFS fonts draw text with Matplotlib's default
+        import taiwanviz.models.choropleth as choropleth
+
+        choropleth.set_default_zh_font = lambda: None
+        print("Packaged fonts are Git LFS pointers; using Matplotlib's font")
+
+    levels = args.level or list(LAYER_SOURCES)
+    results = run_suite(ctx, levels, args.filter, args.repeat, args.min_time)
+
+    revision = _git_revision()
+    doc = {
+        "meta": {
+            "format": RESULTS_FORMAT,
+            "revision": revision,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "data": args.data,
+            "density": args.density if paths is not None else None,
+            "repeat": args.repeat,
+            "min_time": args.min_time,
+            "environment": _environment(),
+        },
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(doc, indent=2, ensure_ascii=False))
+    print(f"Results written to {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline["meta"].get("data") != args.data:
+            print("Warning: baseline was run on different data", file=sys.stderr)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
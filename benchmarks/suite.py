@@ -0,0 +1,238 @@
+"""
+Benchmarked operations.
+
+Each benchmark is a factory taking the level and a `Context` and returning
+the zero-argument callable to time; everything done before returning is
+setup and is not timed. Factories raise `Skip` when a benchmark does not
+apply.
+"""
+
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+import numpy as np
+
+from taiwanviz.models.base.layers import LAYER_SOURCES, initialize_all_layers
+from taiwanviz.models.base.registry import LAYER_REGISTRY
+from taiwanviz.models.choropleth import ChoroplethMap
+from taiwanviz.models.config import ChoroplethRenderConfig
+from taiwanviz.models.palette import ColorPaletteManager
+from taiwanviz.utils.colors import compute_colors
+from taiwanviz.utils.encoding import EncodeOptions
+from taiwanviz.utils.filters import compute_region_masks, exclude_islands
+
+PALETTE = "nord"
+
+Factory = Callable[[str, "Context"], Callable[[], object]]
+
+BENCHMARKS: Dict[str, Factory] = {}
+
+
+class Skip(Exception):
+    """Raised by a factory whose benchmark does not apply."""
+
+
+@dataclass(frozen=True)
+class Context:
+    """
+    What the benchmarks run against.
+
+    Attributes
+    ----------
+    paths : dict, optional
+        Level to fixture shapefile; None for the packaged shapefiles.
+    cache_dir : Path
+        Geometry cache directory of the cached-load benchmarks.
+    """
+
+    paths: Optional[Dict[str, Path]]
+    cache_dir: Path
+
+    def shapefile(self, level: str) -> str:
+        if self.paths is not None:
+            return str(self.paths[level])
+        from importlib.resources import files
+
+        _, folder, filename = LAYER_SOURCES[level]
+        return str(files("taiwanviz.data.shp") / folder / filename)
+
+
+def benchmark(name: str) -> Callable[[Factory], Factory]:
+    """Register a benchmark factory under `name`."""
+
+    def register(factory: Factory) -> Factory:
+        BENCHMARKS[name] = factory
+        return factory
+
+    return register
+
+
+@contextmanager
+def _env(**values: Optional[str]) -> Iterator[None]:
+    saved = {key: os.environ.get(key) for key in values}
+    try:
+        for key, value in values.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _data(level: str, keys: str = "codes") -> Dict[str, float]:
+    """One value per region, keyed by code or by full name path."""
+    gdf = LAYER_REGISTRY.get(level).gdf
+    cls = LAYER_SOURCES[level][0]
+    if keys == "codes":
+        names = gdf[cls.code_column].astype(str)
+    else:
+        names = gdf[list(cls.path_columns)].astype(str).agg("/".join, axis=1)
+    values = np.random.default_rng(0).random(len(gdf)) * 100
+    return dict(zip(names, values))
+
+
+def _config(level: str, **overrides) -> ChoroplethRenderConfig:
+    return replace(ChoroplethRenderConfig(aspect=level), **overrides)
+
+
+@benchmark("load_cold")
+def load_cold(level: str, ctx: Context):
+    """Layer from the shapefile: parse, reproject, key index and masks."""
+    cls, path = LAYER_SOURCES[level][0], ctx.shapefile(level)
+
+    def run():
+        with _env(TAIWANVIZ_NO_CACHE="1"):
+            return cls(path)
+
+    return run
+
+
+@benchmark("load_cached")
+def load_cached(level: str, ctx: Context):
+    """Layer from the GeoParquet geometry cache."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise Skip("pyarrow not installed")
+    cls, path = LAYER_SOURCES[level][0], ctx.shapefile(level)
+    cache = str(ctx.cache_dir)
+
+    def run():
+        with _env(TAIWANVIZ_NO_CACHE=None, TAIWANVIZ_CACHE_DIR=cache):
+            return cls(path)
+
+    run()  # fill the cache
+    return run
+
+
+@benchmark("initialize_all_layers")
+def initialize_all(level: str, ctx: Context):
+    """All three layers, through the geometry cache."""
+    if level != "county":
+        raise Skip("covers every level; reported under county")
+    cache = str(ctx.cache_dir)
+    if ctx.paths is None:
+        load = initialize_all_layers
+    else:
+
+        def load():
+            # Same as initialize_all_layers, on the fixture shapefiles
+            return tuple(
+                LAYER_SOURCES[lv][0](ctx.shapefile(lv)) for lv in LAYER_SOURCES
+            )
+
+    def run():
+        with _env(TAIWANVIZ_CACHE_DIR=cache):
+            return load()
+
+    run()
+    return run
+
+
+@benchmark("map_data_codes")
+def map_data_codes(level: str, ctx: Context):
+    """Join one value per region, keyed by code."""
+    layer, data = LAYER_REGISTRY.get(level), _data(level, "codes")
+    return lambda: layer.map_data(data)
+
+
+@benchmark("map_data_paths")
+def map_data_paths(level: str, ctx: Context):
+    """Join one value per region, keyed by 縣市/鄉鎮市區/村里 path."""
+    layer, data = LAYER_REGISTRY.get(level), _data(level, "paths")
+    return lambda: layer.map_data(data)
+
+
+@benchmark("compute_colors")
+def colors(level: str, ctx: Context):
+    """Values of every region to RGBA."""
+    values = LAYER_REGISTRY.get(level).map_data(_data(level)).values
+    palette = ColorPaletteManager.get_palette(PALETTE)["colors"]
+    return lambda: compute_colors(values, palette)
+
+
+@benchmark("region_masks")
+def region_masks(level: str, ctx: Context):
+    """Offshore, mainland, Kinmen, Matsu and Penghu masks of a layer."""
+    gdf = LAYER_REGISTRY.get(level).gdf
+    return lambda: compute_region_masks(gdf)
+
+
+@benchmark("exclude_islands")
+def islands(level: str, ctx: Context):
+    """Drop Dongsha and Taiping from a layer."""
+    gdf = LAYER_REGISTRY.get(level).gdf
+    return lambda: exclude_islands(gdf)
+
+
+def _render_and_draw(m: ChoroplethMap, config: ChoroplethRenderConfig):
+    """Build a new figure and rasterize it, as saving it would."""
+    fig = m.render(config)
+    fig.canvas.draw()
+    return fig
+
+
+@benchmark("render_paths")
+def render_paths(level: str, ctx: Context):
+    """ChoroplethMap.render with the "paths" backend, drawn (new figure per call)."""
+    m = ChoroplethMap(level=level, data=_data(level), palette_name=PALETTE)
+    config = _config(level, backend="paths")
+    _render_and_draw(m, config)  # build LOD tiers and paths
+    return lambda: _render_and_draw(m, config)
+
+
+@benchmark("render_geopandas")
+def render_geopandas(level: str, ctx: Context):
+    """ChoroplethMap.render with the "geopandas" backend, drawn."""
+    m = ChoroplethMap(level=level, data=_data(level), palette_name=PALETTE)
+    config = _config(level, backend="geopandas")
+    _render_and_draw(m, config)
+    return lambda: _render_and_draw(m, config)
+
+
+@benchmark("to_bytes_png")
+def to_bytes_png(level: str, ctx: Context):
+    """Recolor a pooled figure, draw and savefig to PNG at 300 dpi."""
+    m = ChoroplethMap(level=level, data=_data(level), palette_name=PALETTE)
+    config = _config(level, backend="paths")
+    m.to_bytes(config)
+    return lambda: m.to_bytes(config)
+
+
+@benchmark("encode_png8")
+def encode_png8(level: str, ctx: Context):
+    """Recolor, draw once and encode a palette PNG at 300 dpi."""
+    m = ChoroplethMap(level=level, data=_data(level), palette_name=PALETTE)
+    config = _config(level, backend="paths")
+    options = EncodeOptions(format="png8")
+    m.encode(config, options)
+    return lambda: m.encode(config, options)
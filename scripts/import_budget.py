@@ -0,0 +1,96 @@
+"""
+Check that lightweight entry points import quickly.
+
+Each module is imported in a fresh interpreter. The check fails when the
+best of ``--repeat`` import times exceeds its budget, or when the import
+loads a heavy dependency it should not need. Run from the repository root::
+
+    python scripts/import_budget.py [--repeat 5] [--scale 1.0]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Loaded by the rendering stack only
+HEAVY = ("geopandas", "shapely", "pandas", "matplotlib.pyplot", "mpl_toolkits")
+PLOTTING = HEAVY + ("matplotlib", "PIL")
+
+
+class Budget(NamedTuple):
+    module: str
+    max_ms: float
+    forbidden: Tuple[str, ...]
+
+
+BUDGETS = (
+    Budget("taiwanviz", 20, PLOTTING),
+    Budget("taiwanviz.models", 20, PLOTTING),
+    Budget("taiwanviz.models.enums", 20, PLOTTING),
+    Budget("taiwanviz.models.palette", 20, PLOTTING),
+    Budget("taiwanviz.utils", 20, PLOTTING),
+    Budget("taiwanviz.utils.fonts", 30, PLOTTING),
+    Budget("taiwanviz.utils.encoding", 30, PLOTTING),
+    Budget("api.schemas", 250, PLOTTING),
+    Budget("api.routers.meta", 600, HEAVY),
+)
+
+_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+ms = (time.perf_counter() - t) * 1000
+loaded = [m for m in {forbidden!r} if m in sys.modules]
+print(json.dumps({{"ms": ms, "loaded": loaded}}))
+"""
+
+
+def measure(budget: Budget, repeat: int) -> Dict:
+    """Best import time (ms) of `budget.module` and the forbidden modules it loads."""
+    best, loaded = float("inf"), []
+    code = _PROBE.format(module=budget.module, forbidden=budget.forbidden)
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        best = min(best, result["ms"])
+        loaded = result["loaded"]
+    return {"ms": best, "loaded": loaded}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--repeat", type=int, default=5, help="runs per module")
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="multiply every budget (slow hosts)"
+    )
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for budget in BUDGETS:
+        result = measure(budget, args.repeat)
+        limit = budget.max_ms * args.scale
+        problems = []
+        if result["ms"] > limit:
+            problems.append(f"over {limit:.0f} ms")
+        if result["loaded"]:
+            problems.append(f"loads {', '.join(result['loaded'])}")
+        status = "FAIL " + "; ".join(problems) if problems else "ok"
+        print(f"{budget.module:<28} {result['ms']:8.1f} ms  {status}")
+        failures += bool(problems)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
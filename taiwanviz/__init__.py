@@ -0,0 +1,26 @@
+"""
+TaiwanViz: choropleth maps of Taiwan's counties, towns and villages.
+
+- models: map, layer, aggregation and rendering classes.
+- utils: colors, filters, plotting, fonts and output encodings.
+- data_loader: shapefile loading through the GeoParquet geometry cache.
+
+Subpackages are imported on first access (PEP 562), so ``import taiwanviz``
+costs nothing until one of them is used.
+"""
+
+import importlib
+
+_SUBMODULES = ("data_loader", "models", "utils")
+
+__all__ = list(_SUBMODULES)
+
+
+def __getattr__(name):
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f".{name}", __name__)
+
+
+def __dir__():
+    return sorted({*globals(), *_SUBMODULES})
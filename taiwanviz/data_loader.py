@@ -1,9 +1,193 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
 from importlib.resources import files
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
-import geopandas as gpd
+if TYPE_CHECKING:
+    import geopandas as gpd
 
+logger = logging.getLogger(__name__)
 
-def load_shapefile(level: str, filename: str) -> gpd.GeoDataFrame:
+# Bump when the cached file layout changes so old entries are rebuilt.
+CACHE_FORMAT_VERSION = 1
+CACHE_DIR_ENV = "TAIWANVIZ_CACHE_DIR"
+NO_CACHE_ENV = "TAIWANVIZ_NO_CACHE"
+
+_SIDECAR_SUFFIXES = (".shp", ".shx", ".dbf", ".prj", ".cpg")
+
+
+def cache_dir() -> Path:
+    """
+    Directory holding precompiled geometry caches.
+
+    Defaults to ``~/.cache/taiwanviz`` and can be overridden with the
+    ``TAIWANVIZ_CACHE_DIR`` environment variable.
+    """
+    root = os.environ.get(CACHE_DIR_ENV)
+    if root:
+        return Path(root)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    return Path(xdg or Path.home() / ".cache") / "taiwanviz"
+
+
+def _source_files(shp_path: Path) -> list:
+    """Shapefile plus the sidecar files that affect how it is read."""
+    out = []
+    for path in sorted(shp_path.parent.glob(shp_path.stem + ".*")):
+        if path.suffix.lower() in _SIDECAR_SUFFIXES:
+            out.append(path)
+    return out
+
+
+def source_hash(shp_path: str) -> str:
+    """
+    SHA-256 over a shapefile and its sidecar files (.shx, .dbf, .prj, .cpg).
+
+    The digest is remembered next to the cache, keyed on file size and mtime,
+    so unchanged sources are not re-hashed on every cold start.
+    """
+    shp_path = Path(shp_path)
+    sources = _source_files(shp_path)
+    stamp = [[p.name, p.stat().st_size, p.stat().st_mtime_ns] for p in sources]
+
+    stamp_file = cache_dir() / f"{shp_path.stem}.stamp.json"
+    try:
+        stored = json.loads(stamp_file.read_text())
+        if stored["stamp"] == stamp:
+            return stored["sha256"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    digest = hashlib.sha256()
+    for path in sources:
+        digest.update(path.name.lower().encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    sha = digest.hexdigest()
+
+    try:
+        atomic_write_bytes(
+            stamp_file, json.dumps({"stamp": stamp, "sha256": sha}).encode()
+        )
+    except OSError as e:
+        logger.debug(f"Could not store hash stamp for {shp_path.name}: {e}")
+    return sha
+
+
+def atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """Write `payload` to `path` via a temporary file and rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _cache_path(shp_path: Path, sha: str, tag: str) -> Path:
+    return cache_dir() / (
+        f"{shp_path.stem}-v{CACHE_FORMAT_VERSION}-{tag}-{sha[:16]}.parquet"
+    )
+
+
+def _write_cache(gdf: "gpd.GeoDataFrame", path: Path, tag: str) -> None:
+    """Write the GeoParquet cache atomically and drop stale versions."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    os.close(fd)
+    try:
+        gdf.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+    stem = path.name.split("-v", 1)[0]
+    for stale in path.parent.glob(f"{stem}-v*-{tag}-*.parquet"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+def read_cached_frame(
+    shp_path: str, tag: str, build: Callable[[], "gpd.GeoDataFrame"]
+) -> "gpd.GeoDataFrame":
+    """
+    Return a frame derived from a shapefile, through the geometry cache.
+
+    The cache entry is keyed on the shapefile hash and `tag` (which must not
+    contain "-"). On a miss `build()` is called and its result written as
+    GeoParquet; on a hit the file is memory-mapped instead. The cache is
+    skipped when pyarrow is not installed or ``TAIWANVIZ_NO_CACHE`` is set.
+    """
+    if os.environ.get(NO_CACHE_ENV):
+        return build()
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        logger.debug("pyarrow not installed; geometry cache disabled")
+        return build()
+
+    shp_path = Path(shp_path)
+    try:
+        path = _cache_path(shp_path, source_hash(shp_path), tag)
+    except OSError as e:
+        logger.warning(f"Cannot hash {shp_path}; reading without cache: {e}")
+        return build()
+
+    if path.exists():
+        import geopandas as gpd
+
+        try:
+            return gpd.read_parquet(path, memory_map=True)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable geometry cache {path}: {e}")
+
+    gdf = build()
+    try:
+        _write_cache(gdf, path, tag)
+        logger.info(f"Wrote geometry cache {path}")
+    except OSError as e:
+        logger.warning(f"Could not write geometry cache {path}: {e}")
+    return gdf
+
+
+def read_geodata(shp_path: str, epsg: int = 4326) -> "gpd.GeoDataFrame":
+    """
+    Read a shapefile reprojected to `epsg`, going through the geometry cache.
+
+    On first use the shapefile is parsed, reprojected and written as a
+    GeoParquet file keyed on the source hash. Later reads memory-map that file
+    instead of parsing the shapefile.
+
+    Parameters
+    ----------
+    shp_path : str
+        Path to the ``.shp`` file.
+    epsg : int, default 4326
+        Target CRS.
+
+    Returns
+    -------
+    GeoDataFrame
+        Layer in the requested CRS.
+    """
+    import geopandas as gpd
+
+    return read_cached_frame(
+        shp_path, str(epsg), lambda: gpd.read_file(shp_path).to_crs(epsg=epsg)
+    )
+
+
+def load_shapefile(level: str, filename: str) -> "gpd.GeoDataFrame":
     """
     Load a shapefile from the packaged data and convert it to WGS84 (EPSG:4326).
 
@@ -21,4 +205,4 @@ def load_shapefile(level: str, filename: str) -> gpd.GeoDataFrame:
     """
     shp_folder = files("taiwanviz.data.shp") / level
     path = shp_folder / filename
-    return gpd.read_file(str(path)).to_crs(epsg=4326)
+    return read_geodata(str(path))
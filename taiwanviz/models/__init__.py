@@ -5,13 +5,65 @@ This package provides core classes for building choropleth maps:
 
 - BaseGeoLayer: abstract base class for loading shapefiles.
 - ChoroplethMap: main class to render county/town/village maps.
+- render_batch, BatchItem: render many datasets with one shared layout.
+- render_animation: render a time series as a GIF/APNG/MP4 animation.
+- lookup_regions, locate_points: assign lon/lat points to villages, towns
+  and counties.
+- aggregate_points, PointAggregate: stream points from CSV/Parquet/arrays
+  into per-region counts, sums and means.
+- rollup (submodule): aggregate village/town data to coarser levels along
+  the code hierarchy; see `ChoroplethMap.from_rollup`.
 - MapDataInput: helper for preparing user data for mapping.
 - AdminLevel, ColorPalette: enums for level and color palettes.
 - ColorPaletteManager: manages available color palettes.
+
+Names are imported on first access (PEP 562), so importing the package or
+a light submodule such as `enums` does not load geopandas or Matplotlib.
 """
 
-from .base.base import BaseGeoLayer
-from .choropleth import ChoroplethMap
-from .data_input import MapDataInput
-from .enums import AdminLevel, ColorPalette
-from .palette.palette import ColorPaletteManager
+import importlib
+from typing import TYPE_CHECKING
+
+# Public name -> submodule defining it
+_LAZY = {
+    "PointAggregate": ".aggregate",
+    "aggregate_points": ".aggregate",
+    "render_animation": ".animation",
+    "BaseGeoLayer": ".base.base",
+    "BatchItem": ".batch",
+    "render_batch": ".batch",
+    "ChoroplethMap": ".choropleth",
+    "MapDataInput": ".data_input",
+    "AdminLevel": ".enums",
+    "ColorPalette": ".enums",
+    "locate_points": ".lookup",
+    "lookup_regions": ".lookup",
+    "ColorPaletteManager": ".palette.palette",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY})
+
+
+if TYPE_CHECKING:
+    from .aggregate import PointAggregate, aggregate_points
+    from .animation import render_animation
+    from .base.base import BaseGeoLayer
+    from .batch import BatchItem, render_batch
+    from .choropleth import ChoroplethMap
+    from .data_input import MapDataInput
+    from .enums import AdminLevel, ColorPalette
+    from .lookup import locate_points, lookup_regions
+    from .palette.palette import ColorPaletteManager
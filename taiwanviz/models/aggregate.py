@@ -0,0 +1,272 @@
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Literal, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from taiwanviz.models.lookup import DEFAULT_CHUNK_SIZE, get_region_index, iter_locate
+
+Statistic = Literal["count", "sum", "mean"]
+
+# (lon, lat, values or None) arrays of one chunk of points
+PointChunk = Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]
+
+PointSource = Union[str, Path, Iterable]
+
+
+@dataclass
+class PointAggregate:
+    """
+    Point counts and value sums per village, mergeable across chunks.
+
+    Chunks with and without values may be mixed: every point is counted, but
+    sums and means only cover the points that carried a value.
+
+    Attributes
+    ----------
+    count : np.ndarray
+        int64 points per village layer row.
+    total : np.ndarray
+        float64 sum of point values per village layer row.
+    valued : np.ndarray
+        int64 points with a value per village layer row.
+    unmatched : int
+        Points outside every village (or with a NaN value).
+    has_values : bool
+        Whether any chunk carried point values; "sum" and "mean" need them.
+    """
+
+    count: np.ndarray
+    total: np.ndarray
+    valued: np.ndarray
+    unmatched: int = 0
+    has_values: bool = False
+
+    @classmethod
+    def empty(cls) -> "PointAggregate":
+        """An aggregate with no points, sized to the village layer."""
+        n = len(get_region_index().codes["village"])
+        return cls(
+            np.zeros(n, dtype=np.int64),
+            np.zeros(n, dtype=float),
+            np.zeros(n, dtype=np.int64),
+        )
+
+    def add(self, rows: np.ndarray, values: Optional[np.ndarray] = None) -> None:
+        """Accumulate points located at village `rows` (-1 for none)."""
+        keep = rows >= 0
+        if values is not None:
+            keep &= ~np.isnan(values)
+        self.unmatched += int(len(rows) - keep.sum())
+        n = len(self.count)
+        located = np.bincount(rows[keep], minlength=n)
+        self.count += located
+        if values is not None:
+            self.total += np.bincount(rows[keep], weights=values[keep], minlength=n)
+            self.valued += located
+            self.has_values = True
+
+    def merge(self, other: "PointAggregate") -> "PointAggregate":
+        """Fold another partial aggregate into this one and return self."""
+        self.count += other.count
+        self.total += other.total
+        self.valued += other.valued
+        self.unmatched += other.unmatched
+        self.has_values |= other.has_values
+        return self
+
+    def at_level(
+        self, level: str
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Region codes of `level` with their point counts, value sums and
+        counts of valued points, reduced from villages along the code
+        hierarchy.
+        """
+        index = get_region_index()
+        if level == "village":
+            return index.codes[level], self.count, self.total, self.valued
+        parents = index.parents[level]
+        n = len(index.codes[level])
+        count = np.bincount(parents, weights=self.count, minlength=n)
+        total = np.bincount(parents, weights=self.total, minlength=n)
+        valued = np.bincount(parents, weights=self.valued, minlength=n)
+        return (
+            index.codes[level],
+            count.astype(np.int64),
+            total,
+            valued.astype(np.int64),
+        )
+
+    def to_series(self, level: str, stat: Statistic = "count") -> pd.Series:
+        """
+        Statistic per region code of `level`, for regions with points
+        ("count") or with valued points ("sum", "mean").
+
+        "mean" is the point-weighted mean of the values, over the points that
+        carried one.
+
+        Raises
+        ------
+        ValueError
+            If `stat` is "sum" or "mean" and the points carried no values.
+        """
+        if stat in ("sum", "mean") and not self.has_values:
+            raise ValueError(f'"{stat}" needs point values; pass a value column')
+        codes, count, total, valued = self.at_level(level)
+        if stat == "count":
+            has = count > 0
+            result = count[has].astype(float)
+        elif stat == "sum":
+            has = valued > 0
+            result = total[has]
+        elif stat == "mean":
+            has = valued > 0
+            result = total[has] / valued[has]
+        else:
+            raise ValueError(f"Unsupported statistic: {stat}")
+        return pd.Series(result, index=pd.Index(codes[has], name="code"), name=stat)
+
+    def to_data(self, level: str, stat: Statistic = "count") -> Dict[str, float]:
+        """`to_series` as a region-code mapping for `ChoroplethMap.data`."""
+        return self.to_series(level, stat).to_dict()
+
+
+def _read_csv(path, lon, lat, value, chunk_size) -> Iterator[PointChunk]:
+    columns = [lon, lat] + ([value] if value else [])
+    for df in pd.read_csv(path, usecols=columns, chunksize=chunk_size):
+        yield (
+            df[lon].to_numpy(dtype=float),
+            df[lat].to_numpy(dtype=float),
+            df[value].to_numpy(dtype=float) if value else None,
+        )
+
+
+def _read_parquet(path, lon, lat, value, chunk_size) -> Iterator[PointChunk]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet point data requires pyarrow")
+
+    columns = [lon, lat] + ([value] if value else [])
+    with pq.ParquetFile(path) as f:
+        for batch in f.iter_batches(batch_size=chunk_size, columns=columns):
+            arrays = [
+                batch.column(c).to_numpy(zero_copy_only=False).astype(float)
+                for c in columns
+            ]
+            yield arrays[0], arrays[1], arrays[2] if value else None
+
+
+def iter_point_chunks(
+    source: PointSource,
+    lon: str = "lon",
+    lat: str = "lat",
+    value: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[PointChunk]:
+    """
+    Read points chunk by chunk.
+
+    Parameters
+    ----------
+    source : str, Path or iterable
+        A ``.csv`` or ``.parquet`` file, or an iterable of ``(lon, lat)`` or
+        ``(lon, lat, values)`` array tuples that are passed through as is.
+    lon, lat : str
+        Coordinate columns of a file source.
+    value : str, optional
+        Value column of a file source, for "sum" and "mean".
+    chunk_size : int
+        Rows per chunk read from a file.
+
+    Yields
+    ------
+    (np.ndarray, np.ndarray, np.ndarray or None)
+        Longitudes, latitudes and values (None without a value column).
+    """
+    if isinstance(source, (str, Path)):
+        suffix = Path(source).suffix.lower()
+        if suffix == ".csv":
+            yield from _read_csv(source, lon, lat, value, chunk_size)
+        elif suffix in (".parquet", ".pq"):
+            yield from _read_parquet(source, lon, lat, value, chunk_size)
+        else:
+            raise ValueError(f"Unsupported point file type: {suffix}")
+        return
+
+    for chunk in source:
+        if len(chunk) == 2:
+            yield np.asarray(chunk[0]), np.asarray(chunk[1]), None
+        else:
+            yield np.asarray(chunk[0]), np.asarray(chunk[1]), np.asarray(chunk[2])
+
+
+def aggregate_chunk(
+    lon: np.ndarray, lat: np.ndarray, values: Optional[np.ndarray] = None
+) -> PointAggregate:
+    """Locate one chunk of points and aggregate it per village."""
+    agg = PointAggregate.empty()
+    values = None if values is None else np.asarray(values, dtype=float)
+    agg.has_values = values is not None
+    for start, rows in iter_locate(lon, lat):
+        chunk_values = None if values is None else values[start : start + len(rows)]
+        agg.add(rows, chunk_values)
+    return agg
+
+
+def aggregate_points(
+    source: PointSource,
+    lon: str = "lon",
+    lat: str = "lat",
+    value: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    processes: int = 0,
+) -> PointAggregate:
+    """
+    Stream points from `source` and aggregate them per village.
+
+    Each chunk is located with `iter_locate` and reduced with
+    ``np.bincount`` into a per-village partial, so memory depends on the
+    chunk size, not on the input size. With `processes`, chunks are
+    aggregated in worker processes (at most two in flight per worker) and
+    the partials are merged as they return.
+
+    Parameters
+    ----------
+    source : str, Path or iterable
+        Points; see `iter_point_chunks`.
+    lon, lat, value : str
+        Columns of a file source; see `iter_point_chunks`.
+    chunk_size : int, default 500000
+        Rows per chunk read from a file.
+    processes : int, default 0
+        Worker processes; 0 aggregates in this process.
+
+    Returns
+    -------
+    PointAggregate
+        Counts and sums per village; reduce with `to_data` or `to_series`.
+    """
+    chunks = iter_point_chunks(source, lon, lat, value, chunk_size)
+    result = PointAggregate.empty()
+    if processes <= 0:
+        for chunk in chunks:
+            result.merge(aggregate_chunk(*chunk))
+        return result
+
+    with ProcessPoolExecutor(
+        processes, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(aggregate_chunk, *chunk))
+            if len(pending) >= 2 * processes:
+                result.merge(pending.popleft().result())
+        while pending:
+            result.merge(pending.popleft().result())
+    return result
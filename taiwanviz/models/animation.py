@@ -0,0 +1,298 @@
+import copy
+import itertools
+import shutil
+import struct
+import subprocess
+import tempfile
+import zlib
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Iterator, Literal, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import GifImagePlugin, Image
+
+from taiwanviz.models.base.registry import LAYER_REGISTRY
+from taiwanviz.models.choropleth import ChoroplethMap
+from taiwanviz.models.config import ChoroplethRenderConfig
+from taiwanviz.models.enums import ColorPalette
+from taiwanviz.models.template import TEMPLATE_POOL, visible_rows
+from taiwanviz.utils.colors import palette_cmap
+from taiwanviz.utils.encoding import ANIMATION_MEDIA_TYPES, AnimationFormat
+
+MEDIA_TYPES = ANIMATION_MEDIA_TYPES
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def global_clim(
+    level: str, frames: Sequence[Dict], config: ChoroplethRenderConfig
+) -> Optional[Tuple[float, float]]:
+    """
+    Value range over all frames, taken from the rows the main map shows.
+
+    Returns None when no frame has any matched value.
+    """
+    layer = LAYER_REGISTRY.get(level)
+    keep = visible_rows(layer, config.exclude_offshore)
+    lo, hi = np.inf, -np.inf
+    for data in frames:
+        shown = layer.map_data(data).values[keep]
+        if not np.isnan(shown).all():
+            lo = min(lo, np.nanmin(shown))
+            hi = max(hi, np.nanmax(shown))
+    return None if lo > hi else (float(lo), float(hi))
+
+
+def iter_frames(
+    level: Literal["county", "town", "village"],
+    frames: Sequence[Dict],
+    palette_name: Union[str, ColorPalette],
+    config: ChoroplethRenderConfig = ChoroplethRenderConfig(),
+    titles: Optional[Sequence[str]] = None,
+) -> Iterator[Image.Image]:
+    """
+    Render the frames of an animated choropleth one at a time.
+
+    All frames share one color range (see `global_clim`) and one pooled
+    FigureTemplate: the geometry and layout are drawn once, and each frame
+    only swaps face colors and the title before the canvas is redrawn.
+
+    Parameters
+    ----------
+    level : {"county", "town", "village"}
+        Administrative level of the map.
+    frames : Sequence[dict]
+        Region-name/value mapping per frame, in display order.
+    palette_name : str or ColorPalette
+        Palette of all frames.
+    config : ChoroplethRenderConfig
+        Rendering options; `title` is used for frames without their own.
+    titles : Sequence[str], optional
+        Title per frame.
+
+    Yields
+    ------
+    PIL.Image.Image
+        RGB image of each frame at the full figure size.
+    """
+    if titles is not None and len(titles) != len(frames):
+        raise ValueError("titles must have one entry per frame")
+
+    base = ChoroplethMap(level=level, data={}, palette_name=palette_name)
+    clim = global_clim(level, frames, config)
+    cmap = palette_cmap(base.palette_colors)
+    show_legend = config.show_legend and clim is not None
+
+    with TEMPLATE_POOL.rent(level, config, show_legend) as template:
+        canvas = template.figure.canvas
+        for i, data in enumerate(frames):
+            m = copy.copy(base)
+            m.data = data
+            colors, _ = m._colorize(config, clim=clim)
+            template.update(
+                colors,
+                edgecolor=base.default_edge,
+                title=titles[i] if titles is not None else config.title,
+                cmap=cmap,
+                clim=clim,
+            )
+            canvas.draw()
+            yield Image.frombuffer(
+                "RGBA", canvas.get_width_height(), canvas.buffer_rgba()
+            ).convert("RGB")
+
+
+def _encode_gif(frames: Iterator[Image.Image], fps: float) -> bytes:
+    """
+    Write a looping GIF one frame at a time. Each frame is quantized to its
+    own 256-color table as it arrives and then dropped.
+
+    ``Image.save(save_all=True)`` keeps every frame until the file is
+    written, so the blocks come from Pillow's module-level GIF writers
+    ``getheader`` and ``getdata`` instead; they are not part of Pillow's
+    documented API, hence the pinned Pillow range in pyproject.toml.
+    """
+    duration = round(1000 / fps)
+    buf = BytesIO()
+    for i, frame in enumerate(frames):
+        indexed = frame.convert("P", palette=Image.Palette.ADAPTIVE)
+        if i == 0:
+            header, _ = GifImagePlugin.getheader(
+                indexed, info={"loop": 0, "duration": duration}
+            )
+            buf.write(b"".join(header))
+        data = GifImagePlugin.getdata(
+            indexed, duration=duration, include_color_table=i > 0
+        )
+        buf.write(b"".join(data))
+    buf.write(b";")  # trailer
+    return buf.getvalue()
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
+
+
+def _png_image_data(image: Image.Image) -> bytes:
+    """Compressed image data (the joined IDAT payloads) of `image` as PNG."""
+    buf = BytesIO()
+    image.save(buf, format="PNG")
+    png = buf.getbuffer()
+    parts, pos = [], len(PNG_SIGNATURE)
+    while pos < len(png):
+        (length,) = struct.unpack_from(">I", png, pos)
+        if png[pos + 4 : pos + 8] == b"IDAT":
+            parts.append(bytes(png[pos + 8 : pos + 8 + length]))
+        pos += 12 + length
+    return b"".join(parts)
+
+
+def _encode_apng(frames: Iterator[Image.Image], count: int, fps: float) -> bytes:
+    """
+    Write a looping APNG of `count` frames one frame at a time.
+
+    After the first frame only the bounding box of the pixels that changed is
+    stored, blended over the previous frame.
+    """
+    delay = round(1000 / fps)
+    buf = BytesIO()
+    buf.write(PNG_SIGNATURE)
+    sequence = 0
+    previous = None
+    for frame in frames:
+        pixels = np.asarray(frame)
+        height, width = pixels.shape[:2]
+        if previous is None:
+            ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+            buf.write(_png_chunk(b"IHDR", ihdr))
+            buf.write(_png_chunk(b"acTL", struct.pack(">II", count, 0)))
+            box = (0, 0, width, height)
+        else:
+            changed = (pixels != previous).any(axis=2)
+            rows, cols = np.flatnonzero(changed.any(1)), np.flatnonzero(changed.any(0))
+            if len(rows):
+                box = (cols[0], rows[0], cols[-1] + 1, rows[-1] + 1)
+            else:
+                box = (0, 0, 1, 1)
+        x0, y0, x1, y1 = (int(v) for v in box)
+        fctl = struct.pack(
+            ">IIIIIHHBB", sequence, x1 - x0, y1 - y0, x0, y0, delay, 1000, 0, 0
+        )
+        buf.write(_png_chunk(b"fcTL", fctl))
+        sequence += 1
+
+        data = _png_image_data(frame.crop(box) if previous is not None else frame)
+        if previous is None:
+            buf.write(_png_chunk(b"IDAT", data))
+        else:
+            buf.write(_png_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+            sequence += 1
+        previous = pixels
+    buf.write(_png_chunk(b"IEND", b""))
+    return buf.getvalue()
+
+
+def _encode_mp4(frames: Iterator[Image.Image], fps: float) -> bytes:
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("MP4 output requires ffmpeg on PATH")
+
+    first = next(frames)
+    width, height = first.size
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "animation.mp4"
+        log = Path(tmp) / "ffmpeg.log"
+        # fmt: off
+        cmd = [
+            ffmpeg,
+            "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", "rgb24",
+            "-s", f"{width}x{height}", "-r", f"{fps:g}",
+            "-i", "-",
+            # yuv420p needs even dimensions
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-c:v", "libx264", "-pix_fmt", "yuv420p",
+            "-movflags", "+faststart",
+            str(out),
+        ]
+        # fmt: on
+        with open(log, "wb") as err:
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=err)
+        try:
+            for frame in itertools.chain([first], frames):
+                proc.stdin.write(frame.tobytes())
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; its log says why
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        if proc.wait() != 0:
+            message = log.read_text(errors="replace").strip()
+            raise RuntimeError(f"ffmpeg failed: {message}")
+        return out.read_bytes()
+
+
+def render_animation(
+    level: Literal["county", "town", "village"],
+    frames: Sequence[Dict],
+    palette_name: Union[str, ColorPalette],
+    config: ChoroplethRenderConfig = ChoroplethRenderConfig(),
+    titles: Optional[Sequence[str]] = None,
+    format: AnimationFormat = "gif",
+    fps: float = 2.0,
+) -> bytes:
+    """
+    Render a time series of datasets as an animated map.
+
+    Frames are produced by `iter_frames` and handed to the encoder as they
+    are drawn, so memory holds at most two decoded frames (the current one,
+    and the previous one for APNG differences) plus the encoded output. MP4
+    frames are piped to ``ffmpeg`` (which must be on PATH); GIF and APNG
+    frames are compressed and appended to the output as they arrive.
+
+    Parameters
+    ----------
+    level : {"county", "town", "village"}
+        Administrative level of the map.
+    frames : Sequence[dict]
+        Region-name/value mapping per frame, in display order.
+    palette_name : str or ColorPalette
+        Palette of all frames.
+    config : ChoroplethRenderConfig
+        Rendering options.
+    titles : Sequence[str], optional
+        Title per frame.
+    format : {"gif", "apng", "mp4"}, default "gif"
+        Output container.
+    fps : float, default 2.0
+        Frames per second.
+
+    Returns
+    -------
+    bytes
+        The encoded animation.
+    """
+    if not len(frames):
+        raise ValueError("an animation needs at least one frame")
+    if fps <= 0:
+        raise ValueError("fps must be positive")
+
+    images = iter_frames(level, frames, palette_name, config, titles)
+    try:
+        if format == "mp4":
+            return _encode_mp4(images, fps)
+        if format == "gif":
+            return _encode_gif(images, fps)
+        if format == "apng":
+            return _encode_apng(images, len(frames), fps)
+        raise ValueError(f"Unsupported animation format: {format}")
+    finally:
+        images.close()
@@ -2,8 +2,18 @@
 Base classes and layer initialization utilities for TaiwanViz.
 
 - BaseGeoLayer: abstract class for loading and handling shapefiles.
+- MappedData: user values aligned to a layer's rows (geometry shared).
 - initialize_all_layers: helper to load county, town, and village layers at once.
+- LayerRegistry / get_layer: process-wide, lazily loaded layer cache with
+  warm_layers and evict_layers controls.
 """
 
-from .base import BaseGeoLayer
-from .layers import CountyGeoLayer, TownGeoLayer, VillageGeoLayer, initialize_all_layers
+from .base import BaseGeoLayer, MappedData
+from .layers import (
+    CountyGeoLayer,
+    TownGeoLayer,
+    VillageGeoLayer,
+    initialize_all_layers,
+    load_layer,
+)
+from .registry import LayerRegistry, evict_layers, get_layer, warm_layers
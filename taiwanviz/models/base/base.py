@@ -1,8 +1,64 @@
-from abc import ABC, abstractmethod
+import threading
+from abc import ABC
 from dataclasses import dataclass
-from typing import Dict
+from functools import cached_property
+from pathlib import Path
+from typing import ClassVar, Dict, Iterable, Literal, Tuple
 
 import geopandas as gpd
+import numpy as np
+import shapely
+
+from taiwanviz.data_loader import read_cached_frame, read_geodata, source_hash
+from taiwanviz.utils.filters import compute_region_masks
+from taiwanviz.utils.keys import KeyIndex, KeyMatch
+from taiwanviz.utils.lod import LOD_TOLERANCES, simplify_coverage
+from taiwanviz.utils.paths import PathGeometry
+from taiwanviz.utils.topology import to_geojson, to_topojson
+
+# Attributes exported as feature properties, when the layer has them
+EXPORT_COLUMNS = (
+    "COUNTYCODE",
+    "COUNTYNAME",
+    "TOWNCODE",
+    "TOWNNAME",
+    "VILLCODE",
+    "VILLNAME",
+)
+
+
+@dataclass(frozen=True)
+class MappedData:
+    """
+    User data joined onto a GeoLayer without copying its geometry.
+
+    Attributes
+    ----------
+    layer : BaseGeoLayer
+        Layer the values belong to. Its GeoDataFrame is shared, not copied.
+    values : np.ndarray
+        Float array aligned to the layer's rows; NaN where no data was given.
+    unmatched : tuple of str
+        Data keys that name no region of the layer.
+    ambiguous : tuple of str
+        Data keys that name several regions and were left out.
+    """
+
+    layer: "BaseGeoLayer"
+    values: np.ndarray
+    unmatched: Tuple[str, ...] = ()
+    ambiguous: Tuple[str, ...] = ()
+
+    @property
+    def gdf(self) -> gpd.GeoDataFrame:
+        """The layer's GeoDataFrame (shared by reference)."""
+        return self.layer.gdf
+
+    def to_geodataframe(self) -> gpd.GeoDataFrame:
+        """Return a copy of the layer with a `value` column attached."""
+        df = self.layer.gdf.copy()
+        df["value"] = self.values
+        return df
 
 
 @dataclass
@@ -10,20 +66,191 @@ class BaseGeoLayer(ABC):
     """
     Abstract base class for geographic layers in TaiwanViz.
 
-    - Loads a shapefile into a GeoDataFrame (EPSG:4326).
-    - Provides an abstract `map_data` method for mapping user data
-      (e.g., county names → values) onto the geometry.
+    - Loads a shapefile into a GeoDataFrame (EPSG:4326), through the
+      on-disk geometry cache when available.
+    - Builds a key → row position index (codes, names and name paths) once,
+      so `map_data` only does work proportional to the size of the user's
+      data.
+    - Precomputes region masks (offshore, mainland, Kinmen, Matsu, Penghu)
+      so rendering only selects rows with them.
+    - Serves simplified level-of-detail geometry tiers, and matplotlib paths
+      for them, each built once.
+    - Exports geometry as quantized TopoJSON/GeoJSON for client-side maps,
+      and keeps Web Mercator paths with a spatial index for map tiles.
+    - Indexes its full-resolution geometry in an STRtree for point lookup.
 
-    Subclasses must implement `map_data` to attach user-provided values.
+    Subclasses set `key_column` to the region name, `code_column` to the
+    official region code and `path_columns` to the names from county down
+    to this level.
     """
 
+    key_column: ClassVar[str]
+    code_column: ClassVar[str]
+    path_columns: ClassVar[Tuple[str, ...]]
+
     shp_path: str
 
     def __post_init__(self):
         # Load shapefile as GeoDataFrame in WGS84 CRS
-        self.gdf = gpd.read_file(self.shp_path).to_crs(epsg=4326)
+        self.gdf = read_geodata(self.shp_path)
+        self._key_index = self._build_key_index()
+        self.region_masks = compute_region_masks(self.gdf)
+        self._lod = {0: self.gdf.geometry}
+        self._paths = {}
+        self._mercator = {}
+        self._lod_lock = threading.Lock()
+
+    def _build_key_index(self) -> KeyIndex:
+        """Index codes and name paths (see `path_columns`) once per layer."""
+        columns = [c for c in self.path_columns if c in self.gdf.columns]
+        return KeyIndex(
+            self.gdf[self.code_column].astype(str).to_numpy(),
+            self.gdf[columns].to_numpy(dtype=object),
+        )
+
+    def resolve_keys(self, keys: Iterable) -> KeyMatch:
+        """Resolve data keys to layer rows; see `map_data` for accepted keys."""
+        return self._key_index.resolve(keys)
+
+    @cached_property
+    def version(self) -> str:
+        """Geometry version: the shapefile name and a hash of its contents."""
+        stem = Path(self.shp_path).stem
+        return f"{stem}-{source_hash(self.shp_path)[:16]}"
+
+    @staticmethod
+    def _clamp_tier(tier: int) -> int:
+        return min(max(int(tier), 0), len(LOD_TOLERANCES) - 1)
+
+    def geometry_at(self, tier: int) -> gpd.GeoSeries:
+        """
+        Geometry simplified to level-of-detail `tier`, aligned to `self.gdf`.
+
+        Tier 0 is the original geometry; higher tiers use the tolerances in
+        `taiwanviz.utils.lod.LOD_TOLERANCES`. Each tier is simplified once per
+        process and persisted in the geometry cache.
+        """
+        tier = self._clamp_tier(tier)
+        geoms = self._lod.get(tier)
+        if geoms is not None:
+            return geoms
+        with self._lod_lock:
+            geoms = self._lod.get(tier)
+            if geoms is None:
+                tolerance = LOD_TOLERANCES[tier]
+                frame = read_cached_frame(
+                    self.shp_path,
+                    f"4326.lod{tolerance:g}",
+                    lambda: gpd.GeoDataFrame(
+                        geometry=simplify_coverage(self.gdf.geometry, tolerance)
+                    ),
+                )
+                geoms = frame.geometry.set_axis(self.gdf.index)
+                self._lod[tier] = geoms
+        return geoms
+
+    def paths_at(self, tier: int) -> PathGeometry:
+        """
+        Matplotlib paths for LOD `tier`, aligned to `self.gdf`.
+
+        Converting shapely geometry to paths happens once per tier and process;
+        drawing then only needs face colors.
+        """
+        tier = self._clamp_tier(tier)
+        paths = self._paths.get(tier)
+        if paths is None:
+            paths = PathGeometry.from_geoseries(self.geometry_at(tier))
+            paths = self._paths.setdefault(tier, paths)
+        return paths
+
+    @cached_property
+    def spatial_index(self) -> shapely.STRtree:
+        """STRtree over the full-resolution geometry, aligned to `self.gdf`."""
+        return shapely.STRtree(self.gdf.geometry.values)
+
+    def mercator_at(self, tier: int) -> Tuple[PathGeometry, shapely.STRtree]:
+        """
+        Web Mercator (EPSG:3857) paths for LOD `tier` and an STRtree over
+        their geometry, aligned to `self.gdf`. Used to render map tiles that
+        only touch the regions they intersect.
+        """
+        tier = self._clamp_tier(tier)
+        entry = self._mercator.get(tier)
+        if entry is None:
+            tolerance = LOD_TOLERANCES[tier]
+            frame = read_cached_frame(
+                self.shp_path,
+                f"3857.lod{tolerance:g}",
+                lambda: gpd.GeoDataFrame(geometry=self.geometry_at(tier)).to_crs(
+                    epsg=3857
+                ),
+            )
+            geoms = frame.geometry
+            entry = (PathGeometry.from_geoseries(geoms), shapely.STRtree(geoms.values))
+            entry = self._mercator.setdefault(tier, entry)
+        return entry
+
+    def export_geometry(
+        self,
+        format: Literal["topojson", "geojson"] = "topojson",
+        tier: int = 2,
+        quantization: int = 100_000,
+    ) -> Dict:
+        """
+        Geometry of LOD `tier` as a quantized TopoJSON or GeoJSON document.
+
+        Features are identified by `code_column` and carry the code and name
+        attributes in `EXPORT_COLUMNS`, so data colored with `map_data` can
+        be joined on the client.
+
+        Parameters
+        ----------
+        format : {"topojson", "geojson"}, default "topojson"
+            Output document type.
+        tier : int, default 2
+            Level-of-detail tier (see `geometry_at`).
+        quantization : int, default 100000
+            Grid points across each side of the layer's bounding box.
+
+        Returns
+        -------
+        dict
+            JSON-serializable document.
+        """
+        columns = [c for c in EXPORT_COLUMNS if c in self.gdf.columns]
+        properties = self.gdf[columns].to_dict(orient="records")
+        ids = self.gdf[self.code_column].tolist()
+        geoms = self.geometry_at(tier).values
+        if format == "topojson":
+            return to_topojson(geoms, ids, properties, quantization)
+        if format == "geojson":
+            return to_geojson(geoms, ids, properties, quantization)
+        raise ValueError(f"Unsupported geometry format: {format}")
+
+    def map_data(self, data: Dict) -> MappedData:
+        """
+        Attach user data to the layer rows.
+
+        Parameters
+        ----------
+        data : dict
+            Mapping from region to numeric value. A region is keyed by its
+            code (see `code_column`), its name (see `key_column`), or its
+            name path such as ``臺北市/中正區`` or ``臺北市中正區``. Names are
+            matched ignoring whitespace, full-width forms and 台/臺. Keys
+            naming several regions, like a bare 東區, are not applied.
+
+        Returns
+        -------
+        MappedData
+            Values aligned to `self.gdf` rows, with the unmatched and
+            ambiguous keys; geometry is not copied.
+        """
+        values = np.full(len(self.gdf), np.nan)
+        if not data:
+            return MappedData(self, values)
 
-    @abstractmethod
-    def map_data(self, data: Dict) -> gpd.GeoDataFrame:
-        """Attach user data to the GeoDataFrame."""
-        ...
+        match = self.resolve_keys(data.keys())
+        given = np.asarray(list(data.values()), dtype=float)
+        values[match.rows] = given[match.key_positions]
+        return MappedData(self, values, match.unmatched, match.ambiguous)
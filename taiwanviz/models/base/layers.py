@@ -1,7 +1,5 @@
 from importlib.resources import files
-from typing import Dict, Tuple
-
-import geopandas as gpd
+from typing import Dict, Tuple, Type
 
 from .base import BaseGeoLayer
 
@@ -10,39 +8,68 @@ class CountyGeoLayer(BaseGeoLayer):
     """
     GeoLayer for Taiwan counties.
 
-    Maps user data keyed by COUNTYNAME to the county-level geometry.
+    Maps user data keyed by COUNTYNAME or COUNTYCODE to the county-level
+    geometry; regions are identified by COUNTYCODE.
     """
 
-    def map_data(self, data: Dict) -> gpd.GeoDataFrame:
-        df = self.gdf.copy()
-        df["value"] = df["COUNTYNAME"].map(data)
-        return df
+    key_column = "COUNTYNAME"
+    code_column = "COUNTYCODE"
+    path_columns = ("COUNTYNAME",)
 
 
 class TownGeoLayer(BaseGeoLayer):
     """
     GeoLayer for Taiwan towns (鄉鎮市區).
 
-    Maps user data keyed by TOWNNAME to the town-level geometry.
+    Maps user data keyed by TOWNCODE, TOWNNAME or 縣市/鄉鎮市區 path to the
+    town-level geometry; regions are identified by TOWNCODE.
     """
 
-    def map_data(self, data: Dict) -> gpd.GeoDataFrame:
-        df = self.gdf.copy()
-        df["value"] = df["TOWNNAME"].map(data)
-        return df
+    key_column = "TOWNNAME"
+    code_column = "TOWNCODE"
+    path_columns = ("COUNTYNAME", "TOWNNAME")
 
 
 class VillageGeoLayer(BaseGeoLayer):
     """
     GeoLayer for Taiwan villages (村里).
 
-    Maps user data keyed by VILLNAME to the village-level geometry.
+    Maps user data keyed by VILLCODE, VILLNAME or 縣市/鄉鎮市區/村里 path to
+    the village-level geometry; regions are identified by VILLCODE.
     """
 
-    def map_data(self, data: Dict) -> gpd.GeoDataFrame:
-        df = self.gdf.copy()
-        df["value"] = df["VILLNAME"].map(data)
-        return df
+    key_column = "VILLNAME"
+    code_column = "VILLCODE"
+    path_columns = ("COUNTYNAME", "TOWNNAME", "VILLNAME")
+
+
+# level -> (layer class, folder under taiwanviz/data/shp, shapefile name)
+LAYER_SOURCES: Dict[str, Tuple[Type[BaseGeoLayer], str, str]] = {
+    "county": (CountyGeoLayer, "county", "COUNTY_MOI_1140318.shp"),
+    "town": (TownGeoLayer, "town", "TOWN_MOI_1140318.shp"),
+    "village": (VillageGeoLayer, "village", "VILLAGE_NLSC_1140825.shp"),
+}
+
+
+def load_layer(level: str) -> BaseGeoLayer:
+    """
+    Load a single administrative layer from the packaged shapefiles.
+
+    Parameters
+    ----------
+    level : {"county", "town", "village"}
+        Administrative level to load.
+
+    Returns
+    -------
+    BaseGeoLayer
+        A freshly loaded GeoLayer for the given level.
+    """
+    if level not in LAYER_SOURCES:
+        raise ValueError(f"Unsupported level: {level}")
+    cls, folder, filename = LAYER_SOURCES[level]
+    path = files("taiwanviz.data.shp") / folder / filename
+    return cls(str(path))
 
 
 def initialize_all_layers() -> Tuple[BaseGeoLayer]:
@@ -50,18 +77,16 @@ def initialize_all_layers() -> Tuple[BaseGeoLayer]:
     Load all three administrative layers (county, town, village)
     from the packaged shapefiles and return them as GeoLayer objects.
 
+    Every call re-reads the shapefiles; use `get_layer` from
+    `taiwanviz.models.base.registry` to share loaded layers instead.
+
     Returns
     -------
     Tuple[BaseGeoLayer]
         (CountyGeoLayer, TownGeoLayer, VillageGeoLayer)
     """
-    base = files("taiwanviz.data.shp")
-    county_path = str(base / "county" / "COUNTY_MOI_1140318.shp")
-    town_path = str(base / "town" / "TOWN_MOI_1140318.shp")
-    village_path = str(base / "village" / "VILLAGE_NLSC_1140825.shp")
-
     return (
-        CountyGeoLayer(county_path),
-        TownGeoLayer(town_path),
-        VillageGeoLayer(village_path),
+        load_layer("county"),
+        load_layer("town"),
+        load_layer("village"),
     )
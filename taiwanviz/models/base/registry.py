@@ -0,0 +1,86 @@
+import threading
+from typing import Dict, Iterable, Optional, Union
+
+from taiwanviz.models.enums import AdminLevel
+
+from .base import BaseGeoLayer
+from .layers import LAYER_SOURCES, load_layer
+
+LevelLike = Union[str, AdminLevel]
+
+
+def _normalize_level(level: LevelLike) -> str:
+    value = level.value if isinstance(level, AdminLevel) else level
+    if value not in LAYER_SOURCES:
+        raise ValueError(f"Unsupported level: {level}")
+    return value
+
+
+class LayerRegistry:
+    """
+    Process-wide cache of loaded GeoLayers, keyed by administrative level.
+
+    Each level is loaded on first access only, and the loaded layer is shared
+    by every caller (and every thread) until it is evicted. Loading is guarded
+    by a per-level lock, so concurrent first accesses read the shapefile once
+    and different levels can load in parallel.
+    """
+
+    def __init__(self):
+        self._layers: Dict[str, BaseGeoLayer] = {}
+        self._locks: Dict[str, threading.Lock] = {
+            level: threading.Lock() for level in LAYER_SOURCES
+        }
+
+    def get(self, level: LevelLike) -> BaseGeoLayer:
+        """Return the layer for `level`, loading it if needed."""
+        level = _normalize_level(level)
+        layer = self._layers.get(level)
+        if layer is not None:
+            return layer
+        with self._locks[level]:
+            layer = self._layers.get(level)
+            if layer is None:
+                layer = load_layer(level)
+                self._layers[level] = layer
+        return layer
+
+    def register(self, level: LevelLike, layer: BaseGeoLayer) -> None:
+        """Install an already loaded layer for `level`, replacing any cached one."""
+        level = _normalize_level(level)
+        with self._locks[level]:
+            self._layers[level] = layer
+
+    def is_loaded(self, level: LevelLike) -> bool:
+        """Whether the layer for `level` is currently cached."""
+        return _normalize_level(level) in self._layers
+
+    def warm(self, levels: Optional[Iterable[LevelLike]] = None) -> None:
+        """Load the given levels (all levels by default) ahead of first use."""
+        for level in levels if levels is not None else LAYER_SOURCES:
+            self.get(level)
+
+    def evict(self, levels: Optional[Iterable[LevelLike]] = None) -> None:
+        """Drop the given levels (all levels by default) from the cache."""
+        for level in levels if levels is not None else LAYER_SOURCES:
+            level = _normalize_level(level)
+            with self._locks[level]:
+                self._layers.pop(level, None)
+
+
+LAYER_REGISTRY = LayerRegistry()
+
+
+def get_layer(level: LevelLike) -> BaseGeoLayer:
+    """Return the shared layer for `level` from the process-wide registry."""
+    return LAYER_REGISTRY.get(level)
+
+
+def warm_layers(levels: Optional[Iterable[LevelLike]] = None) -> None:
+    """Preload layers into the process-wide registry."""
+    LAYER_REGISTRY.warm(levels)
+
+
+def evict_layers(levels: Optional[Iterable[LevelLike]] = None) -> None:
+    """Release layers held by the process-wide registry."""
+    LAYER_REGISTRY.evict(levels)
@@ -0,0 +1,92 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, Iterator, Literal, Mapping, Optional, Union
+
+from taiwanviz.models.choropleth import ChoroplethMap
+from taiwanviz.models.config import ChoroplethRenderConfig
+from taiwanviz.models.enums import ColorPalette
+from taiwanviz.models.template import TEMPLATE_POOL
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """
+    Outcome of one dataset in `render_batch`.
+
+    Attributes
+    ----------
+    name : str
+        Dataset name as given to `render_batch`.
+    image : bytes or None
+        Encoded image, or None if rendering failed.
+    error : str or None
+        Error message when rendering failed.
+    """
+
+    name: str
+    image: Optional[bytes] = None
+    error: Optional[str] = None
+
+
+def render_batch(
+    level: Literal["county", "town", "village"],
+    datasets: Mapping[str, Dict],
+    palette_name: Union[str, ColorPalette],
+    config: ChoroplethRenderConfig = ChoroplethRenderConfig(),
+    format: str = "png",
+    max_workers: Optional[int] = None,
+    **savefig_kwargs,
+) -> Iterator[BatchItem]:
+    """
+    Render many datasets with the same level, palette and layout.
+
+    The palette and fonts are set up once, the layers come from the shared
+    registry, and every render recolors a pooled FigureTemplate, so each
+    dataset only costs its join, color mapping and encoding. Renders run on
+    a thread pool and are yielded as they finish, not in input order.
+
+    Parameters
+    ----------
+    level : {"county", "town", "village"}
+        Administrative level of all maps.
+    datasets : Mapping[str, dict]
+        Dataset name to region-name/value mapping.
+    palette_name : str or ColorPalette
+        Palette shared by all maps.
+    config : ChoroplethRenderConfig
+        Rendering options shared by all maps.
+    format : str, default "png"
+        Any format accepted by ``Figure.savefig``.
+    max_workers : int, optional
+        Render threads. Defaults to the number of idle templates the pool
+        keeps per layout.
+    **savefig_kwargs
+        Extra keyword arguments for ``Figure.savefig``.
+
+    Yields
+    ------
+    BatchItem
+        One item per dataset; failures carry the error instead of an image.
+    """
+    base = ChoroplethMap(level=level, data={}, palette_name=palette_name)
+
+    def render_one(data: Dict) -> bytes:
+        # Shallow copy skips the palette and font setup of __post_init__
+        m = copy.copy(base)
+        m.data = data
+        return m.to_bytes(config, format=format, **savefig_kwargs)
+
+    executor = ThreadPoolExecutor(max_workers or TEMPLATE_POOL.max_idle)
+    try:
+        futures = {
+            executor.submit(render_one, data): name for name, data in datasets.items()
+        }
+        for fut in as_completed(futures):
+            name = futures[fut]
+            try:
+                yield BatchItem(name, image=fut.result())
+            except Exception as e:
+                yield BatchItem(name, error=str(e))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
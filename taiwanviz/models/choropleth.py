@@ -1,26 +1,46 @@
-from dataclasses import dataclass, field
-from typing import Dict, Literal, Union
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from io import BytesIO
+from typing import Dict, Iterator, Literal, Optional, Tuple, Union
 
-import geopandas as gpd
 import matplotlib.cm as cm
 import matplotlib.colors as mcolors
-import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
-from taiwanviz.models.base.layers import initialize_all_layers
+from taiwanviz.models.aggregate import PointSource, Statistic, aggregate_points
+from taiwanviz.models.base.base import BaseGeoLayer, MappedData
+from taiwanviz.models.base.registry import LAYER_REGISTRY
 from taiwanviz.models.config import ChoroplethRenderConfig
 from taiwanviz.models.enums import ColorPalette
 from taiwanviz.models.palette import ColorPaletteManager
+from taiwanviz.models.rollup import RollupMethod, rollup
+from taiwanviz.models.template import (
+    DEFAULT_TITLE,
+    INSET_FRACTION,
+    INSETS,
+    TEMPLATE_POOL,
+    FigureTemplate,
+    inset_level,
+    visible_rows,
+)
+from taiwanviz.models.tiles import TILE_SIZE, render_tile
 from taiwanviz.utils import (
     compute_colors,
-    exclude_islands,
-    get_kinmen,
-    get_mainland,
-    get_matsu,
     plot_inset,
     plot_mainland,
-    register_all_fonts,
     set_default_zh_font,
 )
+from taiwanviz.utils.colors import palette_cmap
+from taiwanviz.utils.encoding import (
+    VECTOR_FORMATS,
+    EncodeOptions,
+    capped_dpi,
+    encode_figure,
+)
+from taiwanviz.utils.lod import axes_pixels, choose_lod
 
 
 @dataclass
@@ -38,13 +58,10 @@ class ChoroplethMap:
     default_edge: str = field(init=False)
     default_fill: str = field(init=False)
 
-    countys: gpd.GeoDataFrame = field(init=False)
-    towns: gpd.GeoDataFrame = field(init=False)
-    villages: gpd.GeoDataFrame = field(init=False)
-
     def __post_init__(self):
         """
-        Initialize layers, palette, and fonts.
+        Initialize palette and fonts. Layers are fetched lazily from the
+        process-wide registry when first needed.
         """
         # initialize palette
         if isinstance(self.palette_name, ColorPalette):
@@ -59,109 +76,320 @@ class ChoroplethMap:
         self.default_edge = palette_conf["default_edge"]
         self.default_fill = palette_conf["default_fill"]
 
-        self.countys, self.towns, self.villages = initialize_all_layers()
-
-        # initialize fonts
-        register_all_fonts()
+        # initialize fonts (registered once per process)
         set_default_zh_font()
 
-    def get_layer(self):
+    @classmethod
+    def from_points(
+        cls,
+        source: PointSource,
+        level: Literal["county", "town", "village"],
+        palette_name: Union[str, ColorPalette],
+        stat: Statistic = "count",
+        **aggregate_kwargs,
+    ) -> "ChoroplethMap":
+        """
+        Build a map from raw points, aggregated per region of `level`.
+
+        Parameters
+        ----------
+        source : str, Path or iterable
+            CSV/Parquet file or iterable of coordinate arrays; see
+            `taiwanviz.models.aggregate.iter_point_chunks`.
+        level : {"county", "town", "village"}
+            Administrative level to aggregate to and render.
+        palette_name : str or ColorPalette
+            Palette of the map.
+        stat : {"count", "sum", "mean"}, default "count"
+            Statistic mapped per region; "sum" and "mean" need a `value`.
+        **aggregate_kwargs
+            Passed to `taiwanviz.models.aggregate.aggregate_points`
+            (column names, chunk size, processes).
+
+        Returns
+        -------
+        ChoroplethMap
+            Map whose data is keyed by region code.
+        """
+        agg = aggregate_points(source, **aggregate_kwargs)
+        return cls(
+            level=level, data=agg.to_data(level, stat), palette_name=palette_name
+        )
+
+    @classmethod
+    def from_rollup(
+        cls,
+        data: Dict,
+        data_level: Literal["town", "village"],
+        level: Literal["county", "town", "village"],
+        palette_name: Union[str, ColorPalette],
+        how: RollupMethod = "sum",
+        weights: Optional[Dict] = None,
+    ) -> "ChoroplethMap":
+        """
+        Build a map of `level` from data keyed by a finer `data_level`.
+
+        Parameters
+        ----------
+        data : dict
+            Region name or code of `data_level` to value.
+        data_level : {"town", "village"}
+            Level `data` is keyed by.
+        level : {"county", "town", "village"}
+            Level to aggregate to and render; the same or coarser.
+        palette_name : str or ColorPalette
+            Palette of the map.
+        how : {"sum", "mean", "weighted_mean", "count"}, default "sum"
+            Aggregation; see `taiwanviz.models.rollup.rollup`.
+        weights : dict, optional
+            Weight per `data_level` region for "weighted_mean".
+
+        Returns
+        -------
+        ChoroplethMap
+            Map whose data is keyed by region code. Keys of `data` that match
+            no region or several are left out; see `rollup` to list them.
+        """
+        rolled = rollup(data, data_level, level, how=how, weights=weights)
+        return cls(level=level, data=rolled, palette_name=palette_name)
+
+    @property
+    def countys(self) -> BaseGeoLayer:
+        """Shared county layer."""
+        return LAYER_REGISTRY.get("county")
+
+    @property
+    def towns(self) -> BaseGeoLayer:
+        """Shared town layer."""
+        return LAYER_REGISTRY.get("town")
+
+    @property
+    def villages(self) -> BaseGeoLayer:
+        """Shared village layer."""
+        return LAYER_REGISTRY.get("village")
+
+    def get_layer(self) -> BaseGeoLayer:
         """Return the GeoLayer object corresponding to the specified level."""
-        if self.level == "county":
-            return self.countys
-        elif self.level == "town":
-            return self.towns
-        elif self.level == "village":
-            return self.villages
+        return LAYER_REGISTRY.get(self.level)
+
+    def _layer_colors(
+        self,
+        layer: BaseGeoLayer,
+        config: ChoroplethRenderConfig,
+        clim: Optional[Tuple[float, float]] = None,
+        mapped: Optional[MappedData] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Join data onto `layer` (unless already joined as `mapped`) and
+        color it.
+
+        Returns the value array, the RGBA array (both aligned to the layer
+        rows) and the mask of rows kept after offshore exclusion. The color
+        range is `clim` if given, else taken from the kept rows only.
+        """
+        if mapped is None:
+            mapped = layer.map_data(self.data)
+        values = mapped.values
+        keep = visible_rows(layer, config.exclude_offshore)
+
+        if clim is not None:
+            vmin, vmax = clim
         else:
-            raise ValueError(f"Unsupported level: {self.level}")
+            shown = values[keep]
+            vmin = vmax = None
+            if not np.isnan(shown).all():
+                vmin, vmax = np.nanmin(shown), np.nanmax(shown)
+        colors = compute_colors(
+            values, self.palette_colors, self.default_fill, vmin=vmin, vmax=vmax
+        )
+        return values, colors, keep
+
+    def _colorize(
+        self,
+        config: ChoroplethRenderConfig,
+        clim: Optional[Tuple[float, float]] = None,
+    ) -> Tuple[Dict[str, np.ndarray], Optional[Tuple[float, float]]]:
+        """
+        Colors for every layer the map draws, keyed by level, and the value
+        range used (None when the main layer has no data). A fixed `clim`,
+        e.g. shared by the frames of an animation, overrides the data range.
+        """
+        values, colors, keep = self._layer_colors(self.get_layer(), config, clim)
+        out = {self.level: colors}
+        if config.show_inset:
+            sub_level = inset_level(self.level)
+            if sub_level not in out:
+                _, out[sub_level], _ = self._layer_colors(
+                    LAYER_REGISTRY.get(sub_level), config, clim
+                )
+
+        if clim is not None:
+            return out, clim
+        shown = values[keep]
+        if np.isnan(shown).all():
+            return out, None
+        return out, (np.nanmin(shown), np.nanmax(shown))
+
+    def color_table(
+        self,
+        config: ChoroplethRenderConfig = ChoroplethRenderConfig(),
+        mapped: Optional[MappedData] = None,
+    ) -> pd.DataFrame:
+        """
+        Values and fill colors of the main layer, per region code.
+
+        Uses the same join and color mapping as `render`, so clients holding
+        the layer geometry (see `BaseGeoLayer.export_geometry`) can recolor
+        it without a new image. Pass `mapped`, the map's data already joined
+        with ``get_layer().map_data``, to reuse that join, e.g. to also
+        report its unmatched keys.
+
+        Returns
+        -------
+        pd.DataFrame
+            Indexed by region code, with columns ``name``, ``value`` (NaN
+            without data), ``color`` (hex) and ``shown`` (False for rows the
+            config leaves out, e.g. offshore islands).
+        """
+        layer = self.get_layer()
+        values, colors, keep = self._layer_colors(layer, config, mapped=mapped)
+        rgb = np.round(colors[:, :3] * 255).astype(int)
+        return pd.DataFrame(
+            {
+                "name": layer.gdf[layer.key_column].to_numpy(),
+                "value": values,
+                "color": [f"#{r:02x}{g:02x}{b:02x}" for r, g, b in rgb],
+                "shown": keep,
+            },
+            index=pd.Index(layer.gdf[layer.code_column].to_numpy(), name="code"),
+        )
+
+    def tile_colors(
+        self, config: ChoroplethRenderConfig = ChoroplethRenderConfig()
+    ) -> np.ndarray:
+        """
+        RGBA fills of the main layer for map tiles. Rows the config leaves
+        out (e.g. offshore islands) are transparent.
+        """
+        _, colors, keep = self._layer_colors(self.get_layer(), config)
+        colors = colors.copy()
+        colors[~keep] = 0.0
+        return colors
+
+    def render_tile(
+        self,
+        z: int,
+        x: int,
+        y: int,
+        config: ChoroplethRenderConfig = ChoroplethRenderConfig(),
+        tile_size: int = TILE_SIZE,
+    ) -> bytes:
+        """
+        Render one Web Mercator XYZ tile of the main layer as a PNG.
+
+        Only regions intersecting the tile are drawn; see
+        `taiwanviz.models.tiles.render_tile`. Callers serving many tiles of
+        one dataset should compute `tile_colors` once and call that function
+        directly.
+        """
+        return render_tile(
+            self.get_layer(),
+            z,
+            x,
+            y,
+            self.tile_colors(config),
+            edgecolor=self.default_edge,
+            tile_size=tile_size,
+        )
+
+    def render(
+        self, config: ChoroplethRenderConfig = ChoroplethRenderConfig()
+    ) -> Figure:
+        """
+        Render the choropleth map with mainland + insets.
 
-    def render(self, config: ChoroplethRenderConfig = ChoroplethRenderConfig()):
-        """Render the choropleth map with mainland + insets."""
-        gdf = self.get_layer().map_data(self.data).copy()
+        Builds a new Figure on an Agg canvas without touching pyplot state, so
+        it is safe to call from several threads at once. Notebooks display the
+        returned figure; elsewhere save it with ``fig.savefig``.
 
-        if config.exclude_offshore:
-            gdf = exclude_islands(gdf)
+        Returns
+        -------
+        matplotlib.figure.Figure
+            The rendered figure.
+        """
+        colors, clim = self._colorize(config)
+        if config.backend == "paths":
+            template = FigureTemplate(
+                self.level, config, config.show_legend and clim is not None
+            )
+            return template.update(
+                colors,
+                edgecolor=self.default_edge,
+                title=config.title,
+                cmap=palette_cmap(self.palette_colors),
+                clim=clim,
+            )
+        return self._render_geopandas(config, colors, clim)
 
-        # Compute color mapping
-        values = gdf["value"]
-        colors = compute_colors(values, self.palette_colors, self.default_fill)
+    def _render_geopandas(
+        self,
+        config: ChoroplethRenderConfig,
+        colors: Dict[str, np.ndarray],
+        clim: Optional[Tuple[float, float]],
+    ) -> Figure:
+        """Draw with GeoDataFrame.plot on a fresh pyplot-free figure."""
+        layer = self.get_layer()
 
         # Mainland
-        mainland = get_mainland(gdf)
-        fig, ax = plt.subplots(figsize=config.figsize, dpi=config.dpi)
-        plot_mainland(ax, mainland, colors, edgecolor=self.default_edge)
+        mainland = visible_rows(layer, config.exclude_offshore)
+        mainland &= layer.region_masks["mainland"]
+        tier = choose_lod(
+            config.lod,
+            axes_pixels(config.figsize, config.dpi),
+            config.mainland_xlim,
+            config.mainland_ylim,
+        )
+        fig = Figure(figsize=config.figsize, dpi=config.dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        plot_mainland(
+            ax,
+            layer.geometry_at(tier)[mainland],
+            colors[self.level][mainland],
+            edgecolor=self.default_edge,
+        )
         ax.set_xlim(config.mainland_xlim)
         ax.set_ylim(config.mainland_ylim)
 
         # title
-        if config.title:
-            ax.set_title(config.title, fontsize=14)
-        else:
-            ax.set_title("Taiwan Map with Insets", fontsize=14)
+        ax.set_title(config.title or DEFAULT_TITLE, fontsize=14)
 
         ax.axis("off")
 
         # Insets
         if config.show_inset:
-            if self.level == "county":
-                town_gdf = self.towns.map_data(self.data).copy()
-                if config.exclude_offshore:
-                    town_gdf = exclude_islands(town_gdf)
-
-                kinmen_focus = get_kinmen(town_gdf)
-                matsu_focus = get_matsu(town_gdf)
-
-                town_values = town_gdf["value"]
-                town_colors = compute_colors(
-                    town_values, self.palette_colors, self.default_fill
-                )
-
+            sub_level = inset_level(self.level)
+            sub_layer = LAYER_REGISTRY.get(sub_level)
+            keep = visible_rows(sub_layer, config.exclude_offshore)
+            inset_pixels = axes_pixels(config.figsize, config.dpi, INSET_FRACTION)
+            for name, mask, loc in INSETS:
+                focus = keep & sub_layer.region_masks[mask]
+                minx, miny, maxx, maxy = sub_layer.gdf.geometry[focus].total_bounds
+                tier = choose_lod(config.lod, inset_pixels, (minx, maxx), (miny, maxy))
                 plot_inset(
                     ax,
-                    matsu_focus,
-                    town_colors,
-                    "Matsu",
-                    "upper left",
-                    edgecolor=self.default_edge,
-                )
-                plot_inset(
-                    ax,
-                    kinmen_focus,
-                    town_colors,
-                    "Kinmen",
-                    "lower left",
-                    edgecolor=self.default_edge,
-                )
-
-            else:
-                kinmen_focus = get_kinmen(gdf)
-                matsu_focus = get_matsu(gdf)
-
-                plot_inset(
-                    ax,
-                    matsu_focus,
-                    colors,
-                    "Matsu",
-                    "upper left",
-                    edgecolor=self.default_edge,
-                )
-                plot_inset(
-                    ax,
-                    kinmen_focus,
-                    colors,
-                    "Kinmen",
-                    "lower left",
+                    sub_layer.geometry_at(tier)[focus],
+                    colors[sub_level][focus],
+                    name,
+                    loc,
                     edgecolor=self.default_edge,
+                    size=f"{INSET_FRACTION:.0%}",
                 )
 
         # colorbar
-        if config.show_legend and not values.dropna().empty:
-            norm = mcolors.Normalize(vmin=values.min(), vmax=values.max())
-            cmap = mcolors.LinearSegmentedColormap.from_list(
-                "custom", self.palette_colors, N=256
-            )
-            sm = cm.ScalarMappable(cmap=cmap, norm=norm)
+        if config.show_legend and clim is not None:
+            norm = mcolors.Normalize(vmin=clim[0], vmax=clim[1])
+            sm = cm.ScalarMappable(cmap=palette_cmap(self.palette_colors), norm=norm)
             sm.set_array([])
 
             cbar = fig.colorbar(sm, ax=ax, orientation="vertical", shrink=0.6, pad=0.02)
@@ -171,4 +399,97 @@ class ChoroplethMap:
                 cbar.ax.yaxis.set_ticks_position("left")
                 cbar.ax.yaxis.set_label_position("left")
 
-        plt.show()
+        return fig
+
+    @contextmanager
+    def _drawn_figure(self, config: ChoroplethRenderConfig) -> Iterator[Figure]:
+        """
+        The figure of this map, ready to encode, for the duration of the
+        block: a recolored pooled FigureTemplate with the "paths" backend,
+        otherwise a fresh figure released afterwards.
+        """
+        if config.backend != "paths":
+            fig = self.render(config)
+            try:
+                yield fig
+            finally:
+                fig.clear()
+            return
+
+        colors, clim = self._colorize(config)
+        show_legend = config.show_legend and clim is not None
+        with TEMPLATE_POOL.rent(self.level, config, show_legend) as template:
+            yield template.update(
+                colors,
+                edgecolor=self.default_edge,
+                title=config.title,
+                cmap=palette_cmap(self.palette_colors),
+                clim=clim,
+            )
+
+    def to_bytes(
+        self,
+        config: ChoroplethRenderConfig = ChoroplethRenderConfig(),
+        format: str = "png",
+        **savefig_kwargs,
+    ) -> bytes:
+        """
+        Render the map and return the encoded image.
+
+        With the "paths" backend the figure comes from a pooled FigureTemplate
+        laid out once per level and config, and each call only recolors it.
+        Otherwise a fresh figure is drawn and released after encoding. Safe to
+        call from several threads at once.
+
+        Parameters
+        ----------
+        config : ChoroplethRenderConfig
+            Rendering options.
+        format : str, default "png"
+            Any format accepted by ``Figure.savefig``.
+        **savefig_kwargs
+            Extra keyword arguments for ``Figure.savefig``.
+
+        Returns
+        -------
+        bytes
+            Encoded image.
+        """
+        savefig_kwargs.setdefault("dpi", config.dpi)
+        buf = BytesIO()
+        with self._drawn_figure(config) as fig:
+            fig.savefig(buf, format=format, **savefig_kwargs)
+        return buf.getvalue()
+
+    def encode(
+        self,
+        config: ChoroplethRenderConfig = ChoroplethRenderConfig(),
+        options: EncodeOptions = EncodeOptions(),
+    ) -> bytes:
+        """
+        Render the map, cropped to its content, in a compact output format.
+
+        Unlike `to_bytes`, raster output is drawn once and encoded by Pillow
+        straight from the canvas buffer (see
+        `taiwanviz.utils.encoding.encode_figure`), with palette PNG, WebP and
+        JPEG available. `options.max_pixels` lowers the DPI before
+        rendering, so the geometry detail is chosen for the final size.
+
+        Parameters
+        ----------
+        config : ChoroplethRenderConfig
+            Rendering options.
+        options : EncodeOptions
+            Output format and encoder settings.
+
+        Returns
+        -------
+        bytes
+            Encoded image.
+        """
+        if options.format not in VECTOR_FORMATS:
+            dpi = capped_dpi(config.figsize, config.dpi, options.max_pixels)
+            if dpi != config.dpi:
+                config = replace(config, dpi=dpi)
+        with self._drawn_figure(config) as fig:
+            return encode_figure(fig, options)
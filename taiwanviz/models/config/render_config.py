@@ -30,6 +30,14 @@ class ChoroplethRenderConfig:
     legend_loc : str, default "right"
         Position of the legend (e.g., "right", "left", "upper right",
         "lower left"). Passed to Matplotlib legend positioning logic.
+    lod : int or None, default None
+        Level-of-detail tier of the geometry (0 = full resolution, higher =
+        coarser). If None, the coarsest tier whose simplification error stays
+        below one output pixel is chosen from figsize, dpi and the axis limits.
+    backend : {"geopandas", "paths"}, default "geopandas"
+        Drawing engine. "geopandas" uses GeoDataFrame.plot; "paths" draws
+        matplotlib paths prebuilt once per layer as a single PathCollection,
+        so each render only sets face colors.
     """
 
     aspect: Literal["county", "town", "village"] = "county"
@@ -43,3 +51,5 @@ class ChoroplethRenderConfig:
     title: Optional[str] = None
     show_legend: bool = False
     legend_loc: str = "right"
+    lod: Optional[int] = None
+    backend: Literal["geopandas", "paths"] = "geopandas"
@@ -0,0 +1,183 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from taiwanviz.models.base.registry import LAYER_REGISTRY
+
+# Official region codes nest by prefix: VILLCODE starts with its TOWNCODE,
+# which starts with its COUNTYCODE
+CODE_LENGTHS: Dict[str, int] = {"county": 5, "town": 8, "village": 11}
+
+# Points per STRtree query; bounds the temporary shapely arrays
+DEFAULT_CHUNK_SIZE = 500_000
+
+
+def parent_codes(codes: np.ndarray, level: str) -> np.ndarray:
+    """Codes of the enclosing `level` region, cut from finer region codes."""
+    return np.asarray(codes, dtype=str).astype(f"<U{CODE_LENGTHS[level]}")
+
+
+@dataclass(frozen=True)
+class RegionIndex:
+    """
+    Region codes and names per level, with the enclosing town and county of
+    every village row.
+
+    Attributes
+    ----------
+    codes : dict[str, np.ndarray]
+        Region codes per level; villages in village layer row order, towns
+        and counties sorted.
+    names : dict[str, np.ndarray]
+        Region names aligned to `codes` (None where a parent layer lacks the
+        code).
+    parents : dict[str, np.ndarray]
+        For "town" and "county": position in `codes[level]` of each village
+        row's enclosing region.
+    """
+
+    codes: Dict[str, np.ndarray]
+    names: Dict[str, np.ndarray]
+    parents: Dict[str, np.ndarray]
+
+    @classmethod
+    def build(cls) -> "RegionIndex":
+        """Build the index from the registry's village, town and county layers."""
+        village = LAYER_REGISTRY.get("village")
+        village_codes = village.gdf[village.code_column].to_numpy(dtype=str)
+        codes = {"village": village_codes}
+        names = {"village": village.gdf[village.key_column].to_numpy()}
+        parents = {}
+        for level in ("town", "county"):
+            unique, inverse = np.unique(
+                parent_codes(village_codes, level), return_inverse=True
+            )
+            layer = LAYER_REGISTRY.get(level)
+            lookup = dict(
+                zip(
+                    layer.gdf[layer.code_column].astype(str),
+                    layer.gdf[layer.key_column],
+                )
+            )
+            codes[level] = unique
+            names[level] = np.array([lookup.get(c) for c in unique], dtype=object)
+            parents[level] = inverse.astype(np.int32)
+        return cls(codes, names, parents)
+
+
+@lru_cache(maxsize=2)
+def _region_index(versions: Tuple[str, str, str]) -> RegionIndex:
+    return RegionIndex.build()
+
+
+def get_region_index() -> RegionIndex:
+    """The `RegionIndex` of the registry's current layers, built once."""
+    versions = tuple(LAYER_REGISTRY.get(lv).version for lv in CODE_LENGTHS)
+    return _region_index(versions)
+
+
+def iter_locate(
+    lon: np.ndarray, lat: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Locate points chunk by chunk.
+
+    Yields
+    ------
+    (int, np.ndarray)
+        Offset of the chunk, and the village layer row of each of its points
+        (-1 for points outside every village).
+    """
+    lon = np.asarray(lon, dtype=float)
+    lat = np.asarray(lat, dtype=float)
+    if lon.shape != lat.shape or lon.ndim != 1:
+        raise ValueError("lon and lat must be 1-D arrays of the same length")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+    tree = LAYER_REGISTRY.get("village").spatial_index
+    for start in range(0, len(lon), chunk_size):
+        stop = start + chunk_size
+        points = shapely.points(lon[start:stop], lat[start:stop])
+        rows = np.full(len(points), -1, dtype=np.int32)
+        hit, geom = tree.query(points, predicate="within")
+        # Reversed assignment keeps the first match of overlapping polygons
+        rows[hit[::-1]] = geom[::-1]
+
+        # Points exactly on a border are within no polygon; take the first
+        # polygon they touch
+        missed = np.flatnonzero(rows < 0)
+        if len(missed):
+            hit, geom = tree.query(points[missed], predicate="intersects")
+            rows[missed[hit[::-1]]] = geom[::-1]
+        yield start, rows
+
+
+def locate_points(
+    lon: np.ndarray, lat: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> np.ndarray:
+    """
+    Village layer row containing each lon/lat point, -1 when outside.
+
+    Points are queried against the village layer's STRtree `chunk_size` at a
+    time, so working memory does not grow with the input beyond the int32
+    result.
+    """
+    rows = np.empty(len(lon), dtype=np.int32)
+    for start, chunk in iter_locate(lon, lat, chunk_size):
+        rows[start : start + len(chunk)] = chunk
+    return rows
+
+
+def lookup_regions(
+    lon: np.ndarray, lat: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> pd.DataFrame:
+    """
+    Assign lon/lat points (EPSG:4326) to their county, town and village.
+
+    The village is found with a bulk ``STRtree.query(predicate="within")``
+    over the village layer; the town and county follow from the village
+    code, so only one layer is searched.
+
+    Parameters
+    ----------
+    lon, lat : np.ndarray
+        Point coordinates.
+    chunk_size : int, default 500000
+        Points per spatial query.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per point with COUNTYCODE, COUNTYNAME, TOWNCODE, TOWNNAME,
+        VILLCODE and VILLNAME as categoricals; NaN for points outside
+        Taiwan.
+    """
+    rows = locate_points(lon, lat, chunk_size)
+    index = get_region_index()
+    matched = rows >= 0
+
+    columns = {}
+    for level, code_col, name_col in (
+        ("county", "COUNTYCODE", "COUNTYNAME"),
+        ("town", "TOWNCODE", "TOWNNAME"),
+        ("village", "VILLCODE", "VILLNAME"),
+    ):
+        if level == "village":
+            positions = rows
+        else:
+            positions = np.where(matched, index.parents[level][rows], -1)
+        columns[code_col] = _categorical(positions, index.codes[level])
+        columns[name_col] = _categorical(positions, index.names[level])
+    return pd.DataFrame(columns)
+
+
+def _categorical(positions: np.ndarray, labels: np.ndarray) -> pd.Categorical:
+    """Categorical of `labels[positions]`, NaN where `positions` is -1."""
+    label_codes, categories = pd.factorize(pd.Series(labels))
+    codes = np.where(positions >= 0, label_codes[positions], -1)
+    return pd.Categorical.from_codes(codes, categories=categories)
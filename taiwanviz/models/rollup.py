@@ -0,0 +1,122 @@
+from functools import lru_cache
+from typing import Dict, Literal, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from taiwanviz.models.base.base import MappedData
+from taiwanviz.models.base.registry import LAYER_REGISTRY
+from taiwanviz.models.lookup import parent_codes
+
+RollupMethod = Literal["sum", "mean", "weighted_mean", "count"]
+
+# Coarse to fine
+LEVEL_ORDER = ("county", "town", "village")
+
+
+@lru_cache(maxsize=8)
+def _parent_index(
+    level: str, parent_level: str, version: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    layer = LAYER_REGISTRY.get(level)
+    codes = parent_codes(layer.gdf[layer.code_column].to_numpy(dtype=str), parent_level)
+    unique, inverse = np.unique(codes, return_inverse=True)
+    return unique, inverse.astype(np.int32)
+
+
+def parent_index(level: str, parent_level: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Enclosing `parent_level` region of every `level` layer row.
+
+    Built once per layer version from the region codes, which nest by
+    prefix (see `taiwanviz.models.lookup.CODE_LENGTHS`).
+
+    Returns
+    -------
+    (np.ndarray, np.ndarray)
+        Sorted parent codes, and the position in them of each layer row.
+    """
+    if LEVEL_ORDER.index(parent_level) > LEVEL_ORDER.index(level):
+        raise ValueError(f"{parent_level} is not coarser than {level}")
+    version = LAYER_REGISTRY.get(level).version
+    return _parent_index(level, parent_level, version)
+
+
+def rollup(
+    data: Dict,
+    level: str,
+    parent_level: str,
+    how: RollupMethod = "sum",
+    weights: Optional[Dict] = None,
+    return_dropped: bool = False,
+) -> Union[Dict[str, float], Tuple[Dict[str, float], MappedData]]:
+    """
+    Aggregate data of a fine level to a coarser one.
+
+    Keys are joined onto the `level` layer exactly as for rendering (names
+    or codes), then reduced per parent with ``np.bincount`` over the
+    precomputed `parent_index`. The cost depends on the number of regions,
+    never on geometry. Keys that match no region, or several (e.g. a bare
+    town name like 東區), are left out of the aggregate, as they are left
+    off a rendered map; pass `return_dropped` to get them.
+
+    Parameters
+    ----------
+    data : dict
+        Region name or code of `level` to value.
+    level : {"town", "village"}
+        Level `data` is keyed by.
+    parent_level : {"county", "town"}
+        Level to aggregate to.
+    how : {"sum", "mean", "weighted_mean", "count"}, default "sum"
+        "count" counts regions with a value; "weighted_mean" weighs each
+        value by `weights`.
+    weights : dict, optional
+        Region name or code of `level` to weight, e.g. population. Required
+        for "weighted_mean"; regions without a weight are left out.
+    return_dropped : bool, default False
+        Also return the join of `data` onto the `level` layer.
+
+    Returns
+    -------
+    dict
+        Parent region code to aggregate, for parents with at least one
+        child value (and, for "weighted_mean", a nonzero weight sum).
+        Ready to use as `ChoroplethMap.data`.
+    MappedData
+        Only with `return_dropped`; its ``unmatched`` and ``ambiguous``
+        list the keys of `data` that were left out.
+    """
+    layer = LAYER_REGISTRY.get(level)
+    parents, inverse = parent_index(level, parent_level)
+    mapped = layer.map_data(data)
+    values = mapped.values
+    valid = ~np.isnan(values)
+
+    if how == "weighted_mean":
+        if weights is None:
+            raise ValueError("weighted_mean needs weights")
+        w = layer.map_data(weights).values
+        valid &= ~np.isnan(w)
+    elif how not in ("sum", "mean", "count"):
+        raise ValueError(f"Unsupported roll-up: {how}")
+
+    idx = inverse[valid]
+    n = len(parents)
+    count = np.bincount(idx, minlength=n)
+    if how == "count":
+        result = count.astype(float)
+    elif how == "weighted_mean":
+        num = np.bincount(idx, weights=values[valid] * w[valid], minlength=n)
+        den = np.bincount(idx, weights=w[valid], minlength=n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = num / den
+    else:
+        result = np.bincount(idx, weights=values[valid], minlength=n)
+        if how == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                result = result / count
+
+    has = (count > 0) & ~np.isnan(result)
+    rolled = pd.Series(result[has], index=parents[has]).to_dict()
+    return (rolled, mapped) if return_dropped else rolled
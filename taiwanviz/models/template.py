@@ -0,0 +1,275 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass, replace
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import matplotlib.cm as cm
+import matplotlib.colors as mcolors
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import Collection
+from matplotlib.figure import Figure
+
+from taiwanviz.models.base.base import BaseGeoLayer
+from taiwanviz.models.base.registry import LAYER_REGISTRY
+from taiwanviz.models.config import ChoroplethRenderConfig
+from taiwanviz.utils.lod import axes_pixels, choose_lod
+from taiwanviz.utils.paths import plot_paths
+from taiwanviz.utils.plotting import plot_inset
+
+DEFAULT_TITLE = "Taiwan Map with Insets"
+
+# Inset axes size relative to the main axes
+INSET_FRACTION = 0.3
+
+# (title, region mask name, inset_axes location)
+INSETS = (("Matsu", "matsu", "upper left"), ("Kinmen", "kinmen", "lower left"))
+
+
+def inset_level(level: str) -> str:
+    """
+    Level drawn in the Kinmen/Matsu insets. County polygons cover whole
+    archipelagos, so county maps zoom in with the town layer instead.
+    """
+    return "town" if level == "county" else level
+
+
+def visible_rows(layer: BaseGeoLayer, exclude_offshore: bool) -> np.ndarray:
+    """Boolean mask of the rows drawn at all (offshore islands optionally out)."""
+    if exclude_offshore:
+        return ~layer.region_masks["offshore"]
+    return np.ones(len(layer.gdf), dtype=bool)
+
+
+@dataclass
+class _Part:
+    """One PathCollection in a template and the layer rows it draws."""
+
+    level: str
+    rows: np.ndarray
+    collection: Collection
+
+
+class FigureTemplate:
+    """
+    A choropleth figure laid out once for a (level, render config) pair.
+
+    Axes limits, insets, the title artist and the colorbar are built at
+    construction; the geometry is drawn as prebuilt PathCollections with
+    placeholder colors. `update` then only swaps face colors, title text and
+    the colorbar norm, so the same figure can be rendered many times.
+
+    The figure is pyplot-free (``Figure`` + ``FigureCanvasAgg``) and a
+    template must only be used by one thread at a time.
+
+    Parameters
+    ----------
+    level : {"county", "town", "village"}
+        Administrative level of the main map.
+    config : ChoroplethRenderConfig
+        Layout options; `title` only sets the initial text.
+    show_legend : bool
+        Whether to lay out a colorbar.
+    """
+
+    def __init__(self, level: str, config: ChoroplethRenderConfig, show_legend: bool):
+        self.level = level
+        self.config = config
+        self.show_legend = show_legend
+        self.parts: List[_Part] = []
+
+        self.figure = Figure(figsize=config.figsize, dpi=config.dpi)
+        FigureCanvasAgg(self.figure)
+        ax = self.figure.add_subplot()
+        self.ax = ax
+
+        # Mainland
+        layer = LAYER_REGISTRY.get(level)
+        rows = visible_rows(layer, config.exclude_offshore)
+        rows &= layer.region_masks["mainland"]
+        tier = choose_lod(
+            config.lod,
+            axes_pixels(config.figsize, config.dpi),
+            config.mainland_xlim,
+            config.mainland_ylim,
+        )
+        self._add_part(ax, level, layer.paths_at(tier), rows)
+        ax.set_xlim(config.mainland_xlim)
+        ax.set_ylim(config.mainland_ylim)
+
+        self.title = ax.set_title(config.title or DEFAULT_TITLE, fontsize=14)
+        ax.axis("off")
+
+        # Insets
+        if config.show_inset:
+            sub_level = inset_level(level)
+            sub_layer = LAYER_REGISTRY.get(sub_level)
+            keep = visible_rows(sub_layer, config.exclude_offshore)
+            inset_pixels = axes_pixels(config.figsize, config.dpi, INSET_FRACTION)
+            for name, mask, loc in INSETS:
+                focus = keep & sub_layer.region_masks[mask]
+                bounds = sub_layer.gdf.geometry[focus].total_bounds
+                minx, miny, maxx, maxy = bounds
+                tier = choose_lod(config.lod, inset_pixels, (minx, maxx), (miny, maxy))
+                ax_inset = plot_inset(
+                    ax,
+                    sub_layer.paths_at(tier)[focus],
+                    np.zeros((int(focus.sum()), 4)),
+                    name,
+                    loc,
+                    size=f"{INSET_FRACTION:.0%}",
+                )
+                if ax_inset.collections:
+                    self.parts.append(_Part(sub_level, focus, ax_inset.collections[-1]))
+
+        # colorbar
+        self.mappable: Optional[cm.ScalarMappable] = None
+        self.colorbar = None
+        if show_legend:
+            self.mappable = cm.ScalarMappable(norm=mcolors.Normalize(0, 1))
+            self.mappable.set_array([])
+            cbar = self.figure.colorbar(
+                self.mappable, ax=ax, orientation="vertical", shrink=0.6, pad=0.02
+            )
+            cbar.ax.set_ylabel("Value", fontsize=9)
+            self.colorbar = cbar
+            self._place_colorbar_ticks()
+
+    def _place_colorbar_ticks(self) -> None:
+        # Colorbar redraws reset the tick side, so this runs after each update
+        if self.config.legend_loc == "left":
+            self.colorbar.ax.yaxis.set_ticks_position("left")
+            self.colorbar.ax.yaxis.set_label_position("left")
+
+    @property
+    def levels(self) -> Tuple[str, ...]:
+        """Layer levels whose colors `update` needs."""
+        return tuple(dict.fromkeys(part.level for part in self.parts))
+
+    def _add_part(self, ax, level: str, paths, rows: np.ndarray) -> None:
+        placeholder = np.zeros((int(rows.sum()), 4))
+        collection = plot_paths(ax, paths[rows], placeholder)
+        if collection is not None:
+            self.parts.append(_Part(level, rows, collection))
+
+    def update(
+        self,
+        colors: Dict[str, np.ndarray],
+        edgecolor: str,
+        title: Optional[str] = None,
+        cmap: Optional[mcolors.Colormap] = None,
+        clim: Optional[Tuple[float, float]] = None,
+    ) -> Figure:
+        """
+        Recolor the template for a new dataset.
+
+        Parameters
+        ----------
+        colors : dict[str, np.ndarray]
+            ``(n, 4)`` RGBA arrays aligned to each layer's rows, keyed by level
+            (see `levels`).
+        edgecolor : str
+            Border color of all regions.
+        title : str, optional
+            Title text; defaults to the standard map title.
+        cmap : Colormap, optional
+            Colorbar colormap (ignored without a legend).
+        clim : (float, float), optional
+            Colorbar value range (ignored without a legend).
+
+        Returns
+        -------
+        Figure
+            The template's figure, ready to be saved.
+        """
+        for part in self.parts:
+            part.collection.set_facecolor(colors[part.level][part.rows])
+            part.collection.set_edgecolor(edgecolor)
+        self.title.set_text(title or DEFAULT_TITLE)
+        if self.mappable is not None:
+            if cmap is not None:
+                self.mappable.set_cmap(cmap)
+            if clim is not None:
+                self.mappable.set_clim(*clim)
+            self._place_colorbar_ticks()
+        return self.figure
+
+
+def template_key(
+    level: str, config: ChoroplethRenderConfig, show_legend: bool
+) -> Tuple:
+    """
+    Hashable layout key: everything in the config except the title, and the
+    geometry versions of the layers drawn, so templates built on a layer
+    that has since been replaced in `LAYER_REGISTRY` are not reused.
+    """
+    versions = (LAYER_REGISTRY.get(level).version,)
+    if config.show_inset:
+        versions += (LAYER_REGISTRY.get(inset_level(level)).version,)
+    # Sequence fields may arrive as lists, which do not hash
+    layout = replace(
+        config,
+        title=None,
+        figsize=tuple(config.figsize),
+        mainland_xlim=tuple(config.mainland_xlim),
+        mainland_ylim=tuple(config.mainland_ylim),
+    )
+    return (level, show_legend, versions) + astuple(layout)
+
+
+class FigureTemplatePool:
+    """
+    Pool of idle FigureTemplates keyed by layout.
+
+    `rent` hands out a template for exclusive use and returns it to the pool
+    afterwards, so figure construction and inset layout happen once per
+    layout rather than once per render. A template whose use raised is
+    discarded instead of returned.
+
+    Parameters
+    ----------
+    max_idle : int, default 4
+        Idle templates kept per layout.
+    max_layouts : int, default 16
+        Distinct layouts kept; the least recently used is dropped beyond it.
+    """
+
+    def __init__(self, max_idle: int = 4, max_layouts: int = 16):
+        self.max_idle = max_idle
+        self.max_layouts = max_layouts
+        self._idle: "OrderedDict[Tuple, List[FigureTemplate]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def rent(
+        self, level: str, config: ChoroplethRenderConfig, show_legend: bool
+    ) -> Iterator[FigureTemplate]:
+        """Borrow a template for `level`/`config`, building one if none is idle."""
+        key = template_key(level, config, show_legend)
+        template = None
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                template = idle.pop()
+
+        if template is None:
+            template = FigureTemplate(level, config, show_legend)
+
+        yield template
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            self._idle.move_to_end(key)
+            if len(idle) < self.max_idle:
+                idle.append(template)
+            while len(self._idle) > self.max_layouts:
+                self._idle.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all idle templates."""
+        with self._lock:
+            self._idle.clear()
+
+
+TEMPLATE_POOL = FigureTemplatePool()
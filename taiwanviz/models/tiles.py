@@ -0,0 +1,131 @@
+import threading
+from io import BytesIO
+from typing import Tuple
+
+import numpy as np
+import shapely
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PathCollection
+from matplotlib.figure import Figure
+from pyproj import Transformer
+
+from taiwanviz.models.base.base import BaseGeoLayer
+from taiwanviz.utils.lod import degrees_per_pixel, select_lod
+
+TILE_SIZE = 256
+
+# Half the width of the Web Mercator world in metres
+MERCATOR_HALF = 20037508.342789244
+
+MAX_ZOOM = 22
+
+_TO_LONLAT = Transformer.from_crs(3857, 4326, always_xy=True)
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """
+    EPSG:3857 bounds (minx, miny, maxx, maxy) of XYZ tile `z/x/y`.
+
+    Raises
+    ------
+    ValueError
+        If the tile does not exist at zoom `z`.
+    """
+    n = 1 << z
+    if not (0 <= z <= MAX_ZOOM and 0 <= x < n and 0 <= y < n):
+        raise ValueError(f"No tile {z}/{x}/{y}")
+    size = 2 * MERCATOR_HALF / n
+    minx = -MERCATOR_HALF + x * size
+    maxy = MERCATOR_HALF - y * size
+    return minx, maxy - size, minx + size, maxy
+
+
+def tile_lod(bounds: Tuple[float, float, float, float], tile_size: int) -> int:
+    """Coarsest LOD tier finer than one tile pixel."""
+    lon0, lat0 = _TO_LONLAT.transform(bounds[0], bounds[1])
+    lon1, lat1 = _TO_LONLAT.transform(bounds[2], bounds[3])
+    return select_lod(
+        degrees_per_pixel((tile_size, tile_size), (lon0, lon1), (lat0, lat1))
+    )
+
+
+class _TileCanvas(threading.local):
+    """Per-thread figure whose single axes covers the whole tile."""
+
+    def __init__(self):
+        self.size = None
+
+    def get(self, tile_size: int):
+        if self.size != tile_size:
+            dpi = 100
+            fig = Figure(figsize=(tile_size / dpi, tile_size / dpi), dpi=dpi)
+            fig.patch.set_alpha(0)
+            FigureCanvasAgg(fig)
+            ax = fig.add_axes([0, 0, 1, 1])
+            ax.set_axis_off()
+            self.size, self.fig, self.ax = tile_size, fig, ax
+        return self.fig, self.ax
+
+
+_CANVAS = _TileCanvas()
+
+
+def render_tile(
+    layer: BaseGeoLayer,
+    z: int,
+    x: int,
+    y: int,
+    colors: np.ndarray,
+    edgecolor: str = "#fbfbfb",
+    tile_size: int = TILE_SIZE,
+) -> bytes:
+    """
+    Render XYZ tile `z/x/y` of a colored layer as a transparent PNG.
+
+    Only the regions whose bounding boxes intersect the tile (found with the
+    layer's STRtree) are drawn, at the LOD tier matching the tile
+    resolution, so no tile ever needs the full map.
+
+    Parameters
+    ----------
+    layer : BaseGeoLayer
+        Layer to draw.
+    z, x, y : int
+        Tile address (zoom, column, row from the top).
+    colors : np.ndarray
+        ``(n, 4)`` RGBA fills aligned to the layer rows. Fully transparent
+        rows are skipped, borders included.
+    edgecolor : str, default "#fbfbfb"
+        Border color.
+    tile_size : int, default 256
+        Tile width and height in pixels.
+
+    Returns
+    -------
+    bytes
+        PNG image.
+    """
+    bounds = tile_bounds(z, x, y)
+    paths, tree = layer.mercator_at(tile_lod(bounds, tile_size))
+    hits = np.sort(tree.query(shapely.box(*bounds)))
+    hits = hits[colors[hits, 3] > 0]
+
+    fig, ax = _CANVAS.get(tile_size)
+    for collection in list(ax.collections):
+        collection.remove()
+    if len(hits):
+        ax.add_collection(
+            PathCollection(
+                list(paths.paths[hits]),
+                facecolors=colors[hits],
+                edgecolors=edgecolor,
+                linewidths=0.4,
+            ),
+            autolim=False,
+        )
+    ax.set_xlim(bounds[0], bounds[2])
+    ax.set_ylim(bounds[1], bounds[3])
+
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=fig.dpi, transparent=True)
+    return buf.getvalue()
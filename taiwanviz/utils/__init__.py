@@ -5,26 +5,60 @@ This package provides helpers for:
 - filters: GeoDataFrame filtering (mainland, islands, Kinmen, Matsu, Penghu, etc.)
 - colors:  color mapping utilities
 - plotting: standardized drawing functions for main map and insets
+- fonts:   on-demand registration of the packaged fonts
+
+Names are imported on first access (PEP 562), so using one helper does not
+load the dependencies of the others.
 """
 
-from .colors import compute_colors
-from .filters import exclude_islands, get_kinmen, get_mainland, get_matsu
-from .fonts import register_all_fonts, set_default_zh_font
-from .plotting import plot_inset, plot_mainland
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = [
+# Public name -> submodule defining it
+_LAZY = {
     # filters
-    "exclude_islands",
-    "get_mainland",
-    "get_kinmen",
-    "get_matsu",
-    "get_penghu",
+    "exclude_islands": ".filters",
+    "get_mainland": ".filters",
+    "get_kinmen": ".filters",
+    "get_matsu": ".filters",
+    "get_penghu": ".filters",
+    "compute_region_masks": ".filters",
     # colors
-    "compute_colors",
+    "compute_colors": ".colors",
     # plotting
-    "plot_mainland",
-    "plot_inset",
+    "plot_mainland": ".plotting",
+    "plot_inset": ".plotting",
     # fonts
-    "register_all_fonts",
-    "set_default_zh_font",
-]
+    "register_all_fonts": ".fonts",
+    "register_font": ".fonts",
+    "set_default_zh_font": ".fonts",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY})
+
+
+if TYPE_CHECKING:
+    from .colors import compute_colors
+    from .filters import (
+        compute_region_masks,
+        exclude_islands,
+        get_kinmen,
+        get_mainland,
+        get_matsu,
+        get_penghu,
+    )
+    from .fonts import register_all_fonts, register_font, set_default_zh_font
+    from .plotting import plot_inset, plot_mainland
@@ -1,31 +1,83 @@
+from functools import lru_cache
+from typing import Optional, Sequence
+
 import matplotlib.colors as mcolors
 import numpy as np
-import pandas as pd
+
+LUT_SIZE = 256
+
+
+@lru_cache(maxsize=64)
+def _palette_cmap(palette: tuple) -> mcolors.Colormap:
+    return mcolors.LinearSegmentedColormap.from_list("custom", palette, N=LUT_SIZE)
+
+
+def palette_cmap(palette_list: Sequence[str]) -> mcolors.Colormap:
+    """Return the cached 256-color colormap for a palette (used by colorbars)."""
+    return _palette_cmap(tuple(palette_list))
+
+
+@lru_cache(maxsize=64)
+def _palette_lut(palette: tuple) -> np.ndarray:
+    lut = _palette_cmap(palette)(np.arange(LUT_SIZE))
+    lut.flags.writeable = False
+    return lut
+
+
+def palette_lut(palette_list: Sequence[str]) -> np.ndarray:
+    """
+    Return the cached (256, 4) RGBA lookup table for a palette.
+
+    Equivalent to sampling ``LinearSegmentedColormap.from_list(..., N=256)``
+    at every index; the table is built once per distinct palette.
+    """
+    return _palette_lut(tuple(palette_list))
 
 
 def compute_colors(
-    values: pd.Series, palette_list: list, default_fill: str = "lightgray"
-) -> pd.Series:
+    values: Sequence[float],
+    palette_list: list,
+    default_fill: str = "lightgray",
+    vmin: Optional[float] = None,
+    vmax: Optional[float] = None,
+) -> np.ndarray:
     """
     Map numeric values to colors using a continuous colormap.
 
+    Values are normalized in one pass and looked up in a cached 256-entry
+    palette table, so the cost is a handful of array operations regardless of
+    the number of regions.
+
     Parameters
     ----------
-    values : pd.Series
-        Series of numeric values to be mapped.
+    values : array-like
+        Numeric values to be mapped (Series or array).
     palette_list : list
         List of colors used to build the colormap.
     default_fill : str, default "lightgray"
         Color assigned to missing (NaN) values.
+    vmin, vmax : float, optional
+        Normalization bounds. Default to the min/max of `values`.
 
     Returns
     -------
-    pd.Series
-        Series of color values corresponding to the input.
+    np.ndarray
+        ``(n, 4)`` float RGBA array aligned to `values`.
     """
-    if values.dropna().empty:
-        return pd.Series([default_fill] * len(values), index=values.index)
+    arr = np.asarray(values, dtype=float)
+    out = np.empty((len(arr), 4))
+    missing = np.isnan(arr)
+    out[missing] = mcolors.to_rgba(default_fill)
+    if missing.all():
+        return out
 
-    norm = mcolors.Normalize(vmin=np.nanmin(values), vmax=np.nanmax(values))
-    cmap = mcolors.LinearSegmentedColormap.from_list("custom", palette_list, N=256)
-    return values.map(lambda v: cmap(norm(v)) if pd.notna(v) else default_fill)
+    lo = np.nanmin(arr) if vmin is None else vmin
+    hi = np.nanmax(arr) if vmax is None else vmax
+    present = arr[~missing]
+    if hi > lo:
+        scaled = (present - lo) * (LUT_SIZE / (hi - lo))
+        idx = np.clip(scaled, 0, LUT_SIZE - 1).astype(np.intp)
+    else:
+        idx = np.zeros(len(present), dtype=np.intp)
+    out[~missing] = palette_lut(palette_list)[idx]
+    return out
@@ -0,0 +1,167 @@
+import math
+from dataclasses import dataclass
+from io import BytesIO
+from typing import TYPE_CHECKING, Literal, Optional, Sequence
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from PIL.Image import Image
+
+# Formats and media types only; Matplotlib and Pillow load when encoding
+OutputFormat = Literal["png", "png8", "webp", "jpeg", "svg", "pdf"]
+
+MEDIA_TYPES = {
+    "png": "image/png",
+    "png8": "image/png",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+}
+
+EXTENSIONS = {
+    "png": "png",
+    "png8": "png",
+    "webp": "webp",
+    "jpeg": "jpg",
+    "svg": "svg",
+    "pdf": "pdf",
+}
+
+VECTOR_FORMATS = ("svg", "pdf")
+
+AnimationFormat = Literal["gif", "apng", "mp4"]
+
+ANIMATION_MEDIA_TYPES = {"gif": "image/gif", "apng": "image/apng", "mp4": "video/mp4"}
+
+# Padding savefig(bbox_inches="tight") adds by default
+TIGHT_PAD_INCHES = 0.1
+
+
+@dataclass(frozen=True)
+class EncodeOptions:
+    """
+    How a rendered figure is encoded.
+
+    Attributes
+    ----------
+    format : {"png", "png8", "webp", "jpeg", "svg", "pdf"}, default "png"
+        Output format. "png8" quantizes to a palette of at most `colors`
+        entries, which suits choropleths with few distinct fills.
+    quality : int, default 90
+        WebP/JPEG quality (1-100).
+    lossless : bool, default False
+        Lossless WebP.
+    compress_level : int, default 6
+        zlib level of PNG output (0-9); lower is faster and larger.
+    colors : int, default 256
+        Palette size of "png8" (2-256).
+    max_pixels : int, optional
+        Upper bound on the raster size (width x height) before cropping;
+        the DPI is lowered to fit. Ignored for vector formats.
+    """
+
+    format: OutputFormat = "png"
+    quality: int = 90
+    lossless: bool = False
+    compress_level: int = 6
+    colors: int = 256
+    max_pixels: Optional[int] = None
+
+
+def capped_dpi(
+    figsize: Sequence[float], dpi: float, max_pixels: Optional[int]
+) -> float:
+    """
+    Largest DPI up to `dpi` at which a `figsize` figure fits `max_pixels`,
+    but at least 1 (a figure too large even at 1 DPI exceeds the cap).
+    """
+    if not max_pixels:
+        return dpi
+    limit = math.sqrt(max_pixels / (figsize[0] * figsize[1]))
+    return min(dpi, max(1, math.floor(limit)))
+
+
+def _save_raster(image: "Image", options: EncodeOptions) -> bytes:
+    from PIL import Image
+
+    buf = BytesIO()
+    fmt = options.format
+    if fmt == "png":
+        image.save(buf, format="PNG", compress_level=options.compress_level)
+    elif fmt == "png8":
+        indexed = image.quantize(
+            colors=options.colors,
+            method=Image.Quantize.FASTOCTREE,
+            dither=Image.Dither.NONE,
+        )
+        indexed.save(buf, format="PNG", compress_level=options.compress_level)
+    elif fmt == "webp":
+        image.save(
+            buf, format="WEBP", quality=options.quality, lossless=options.lossless
+        )
+    elif fmt == "jpeg":
+        image.convert("RGB").save(buf, format="JPEG", quality=options.quality)
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
+    return buf.getvalue()
+
+
+def encode_figure(
+    fig: "Figure", options: EncodeOptions = EncodeOptions(), tight: bool = True
+) -> bytes:
+    """
+    Encode a figure at its own DPI.
+
+    Raster formats are drawn once on the Agg canvas and handed to Pillow as
+    a view of the canvas buffer; the tight bounding box (padded like
+    ``savefig(bbox_inches="tight")``) is cut from that buffer instead of
+    drawing the figure a second time. Content outside the figure is
+    clipped. Vector formats go through ``Figure.savefig``.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        Figure to encode.
+    options : EncodeOptions
+        Format and encoder settings.
+    tight : bool, default True
+        Crop to the drawn artists.
+
+    Returns
+    -------
+    bytes
+        Encoded image.
+    """
+    if options.format in VECTOR_FORMATS:
+        buf = BytesIO()
+        fig.savefig(
+            buf,
+            format=options.format,
+            bbox_inches="tight" if tight else None,
+            pad_inches=TIGHT_PAD_INCHES,
+        )
+        return buf.getvalue()
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from PIL import Image
+
+    canvas = fig.canvas
+    if not isinstance(canvas, FigureCanvasAgg):
+        canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    pixels = canvas.buffer_rgba()
+    height, width = pixels.shape[:2]
+    image = Image.frombuffer("RGBA", (width, height), pixels, "raw", "RGBA", 0, 1)
+
+    if tight:
+        dpi = fig.dpi
+        bbox = fig.get_tightbbox(canvas.get_renderer()).padded(TIGHT_PAD_INCHES)
+        box = (
+            max(0, math.floor(bbox.x0 * dpi)),
+            max(0, math.floor(height - bbox.y1 * dpi)),
+            min(width, math.ceil(bbox.x1 * dpi)),
+            min(height, math.ceil(height - bbox.y0 * dpi)),
+        )
+        image = image.crop(box)
+    return _save_raster(image, options)
@@ -1,9 +1,21 @@
+from typing import Dict
+
 import geopandas as gpd
+import numpy as np
 
+KINMEN_TOWNS = ["金城鎮", "金沙鎮", "烈嶼鄉", "金寧鄉", "金湖鎮"]
+MATSU_TOWNS = ["北竿鄉", "南竿鄉"]
 
-def exclude_islands(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+
+def _column_isin(gdf: gpd.GeoDataFrame, column: str, names) -> np.ndarray:
+    if column not in gdf.columns:
+        return np.zeros(len(gdf), dtype=bool)
+    return gdf[column].isin(names).to_numpy()
+
+
+def offshore_mask(gdf: gpd.GeoDataFrame) -> np.ndarray:
     """
-    Exclude Dongsha (Pratas) and Taiping islands
+    Boolean mask of Dongsha (Pratas) and Taiping island rows,
     based on centroid coordinates.
     """
     if gdf.crs.is_geographic:
@@ -12,28 +24,72 @@ def exclude_islands(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     else:
         centroids = gdf.centroid
 
-    mask = ~(
-        (
-            (20.3 <= centroids.y)
-            & (centroids.y <= 20.6)
-            & (116.3 <= centroids.x)
-            & (centroids.x <= 116.7)
-        )  # Dongsha
-        | (
-            (9.5 <= centroids.y)
-            & (centroids.y <= 11.0)
-            & (113.5 <= centroids.x)
-            & (centroids.x <= 115.0)
-        )  # Taiping
+    x = centroids.x.to_numpy()
+    y = centroids.y.to_numpy()
+    dongsha = (20.3 <= y) & (y <= 20.6) & (116.3 <= x) & (x <= 116.7)
+    taiping = (9.5 <= y) & (y <= 11.0) & (113.5 <= x) & (x <= 115.0)
+    return dongsha | taiping
+
+
+def mainland_mask(gdf: gpd.GeoDataFrame) -> np.ndarray:
+    """Boolean mask of rows outside Kinmen and Matsu counties."""
+    return ~_column_isin(gdf, "COUNTYNAME", ["金門縣", "連江縣"])
+
+
+def kinmen_mask(gdf: gpd.GeoDataFrame) -> np.ndarray:
+    """Boolean mask of the five main Kinmen (金門縣) towns."""
+    return _column_isin(gdf, "COUNTYNAME", ["金門縣"]) & _column_isin(
+        gdf, "TOWNNAME", KINMEN_TOWNS
+    )
+
+
+def matsu_mask(gdf: gpd.GeoDataFrame) -> np.ndarray:
+    """Boolean mask of Beigan and Nangan in Matsu (連江縣)."""
+    return _column_isin(gdf, "COUNTYNAME", ["連江縣"]) & _column_isin(
+        gdf, "TOWNNAME", MATSU_TOWNS
     )
-    return gdf[mask]
+
+
+def penghu_mask(gdf: gpd.GeoDataFrame) -> np.ndarray:
+    """Boolean mask of Penghu County (澎湖縣)."""
+    return _column_isin(gdf, "COUNTYNAME", ["澎湖縣"])
+
+
+def compute_region_masks(gdf: gpd.GeoDataFrame) -> Dict[str, np.ndarray]:
+    """
+    Compute every region mask for a layer in one pass.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        Read-only boolean arrays aligned to `gdf` rows, keyed by
+        "offshore", "mainland", "kinmen", "matsu" and "penghu".
+    """
+    masks = {
+        "offshore": offshore_mask(gdf),
+        "mainland": mainland_mask(gdf),
+        "kinmen": kinmen_mask(gdf),
+        "matsu": matsu_mask(gdf),
+        "penghu": penghu_mask(gdf),
+    }
+    for mask in masks.values():
+        mask.flags.writeable = False
+    return masks
+
+
+def exclude_islands(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """
+    Exclude Dongsha (Pratas) and Taiping islands
+    based on centroid coordinates.
+    """
+    return gdf[~offshore_mask(gdf)]
 
 
 def get_mainland(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """
     Return mainland Taiwan by excluding Kinmen and Matsu counties.
     """
-    return gdf[~gdf["COUNTYNAME"].isin(["金門縣", "連江縣"])]
+    return gdf[mainland_mask(gdf)]
 
 
 def get_kinmen(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
@@ -41,10 +97,7 @@ def get_kinmen(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     Return GeoDataFrame for Kinmen (金門縣),
     limited to the five main towns.
     """
-    return gdf[
-        (gdf["COUNTYNAME"] == "金門縣")
-        & (gdf["TOWNNAME"].isin(["金城鎮", "金沙鎮", "烈嶼鄉", "金寧鄉", "金湖鎮"]))
-    ]
+    return gdf[kinmen_mask(gdf)]
 
 
 def get_matsu(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
@@ -52,6 +105,11 @@ def get_matsu(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     Return GeoDataFrame for Matsu (連江縣),
     limited to Beigan and Nangan.
     """
-    return gdf[
-        (gdf["COUNTYNAME"] == "連江縣") & (gdf["TOWNNAME"].isin(["北竿鄉", "南竿鄉"]))
-    ]
+    return gdf[matsu_mask(gdf)]
+
+
+def get_penghu(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """
+    Return GeoDataFrame for Penghu (澎湖縣).
+    """
+    return gdf[penghu_mask(gdf)]
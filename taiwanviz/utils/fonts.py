@@ -1,11 +1,12 @@
 import logging
+from functools import lru_cache
 from importlib.resources import files
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
-import matplotlib.font_manager as fm
-import matplotlib.pyplot as plt
+if TYPE_CHECKING:
+    from matplotlib.font_manager import FontProperties
 
-logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 DEFAULT_ZH_FONT = "NotoSansTC-Regular.ttf"
 
@@ -19,57 +20,104 @@ def _iter_ttf_files(base):
             yield entry
 
 
-def register_all_fonts():
+def _family_of(filename: str) -> str:
+    """Family part of a packaged font file name, e.g. NotoSansTC."""
+    return filename.rsplit(".", 1)[0].split("-", 1)[0]
+
+
+@lru_cache(maxsize=1)
+def font_index() -> Dict[str, str]:
     """
-    Register all packaged fonts under taiwanviz/fonts.
+    Paths of the packaged TTF files under taiwanviz/fonts by file name,
+    scanned once per process.
     """
     font_dir = files("taiwanviz.fonts")
-    count = 0
-    for path in _iter_ttf_files(font_dir):
+    index = {p.name: str(p) for p in _iter_ttf_files(font_dir)}
+    logger.debug(f"Indexed {len(index)} fonts in {font_dir}")
+    return index
+
+
+@lru_cache(maxsize=None)
+def _register_family(family: str) -> Tuple[str, ...]:
+    """Register every weight of a packaged family with Matplotlib, once."""
+    import matplotlib.font_manager as fm
+
+    registered = []
+    for name, path in font_index().items():
+        if _family_of(name) != family:
+            continue
         try:
-            fm.fontManager.addfont(str(path))
-            logging.debug(f"Registered font: {path.name}")
-            count += 1
+            fm.fontManager.addfont(path)
+            registered.append(name)
         except Exception as e:
-            logging.error(f"Failed to register {path}: {e}")
-    logging.info(f"Registered {count} fonts from {font_dir}")
+            logger.error(f"Failed to register {path}: {e}")
+    logger.debug(f"Registered {len(registered)} fonts of {family}")
+    return tuple(registered)
+
+
+def _font_properties(path: str) -> "FontProperties":
+    import matplotlib.font_manager as fm
+
+    return fm.FontProperties(fname=path)
+
+
+@lru_cache(maxsize=None)
+def register_font(filename: str) -> "FontProperties":
+    """
+    Register the family of a packaged font and return its FontProperties.
+
+    All weights of the family are registered so bold text finds its face.
+    Both the registration and the returned properties are cached, so
+    repeated calls cost a dictionary lookup.
+
+    Raises
+    ------
+    FileNotFoundError
+        If `filename` is not a packaged font.
+    """
+    path = font_index().get(filename)
+    if path is None:
+        raise FileNotFoundError(f"Font file {filename} not found in taiwanviz.fonts")
+    _register_family(_family_of(filename))
+    return _font_properties(path)
+
+
+def register_all_fonts():
+    """
+    Register all packaged fonts under taiwanviz/fonts (once per process).
+    """
+    families = {_family_of(name) for name in font_index()}
+    count = sum(len(_register_family(family)) for family in sorted(families))
+    logger.debug(f"Registered {count} packaged fonts")
 
 
 def set_default_zh_font():
     """
     Set Matplotlib default font to Noto Sans TC (for Chinese text).
     """
-    font_dir = files("taiwanviz.fonts").joinpath("noto-sans")
-    path = font_dir.joinpath(DEFAULT_ZH_FONT)
-    if not path.exists():
-        raise FileNotFoundError(f"Default Chinese font not found: {path}")
-    font_prop = fm.FontProperties(fname=str(path))
-    plt.rcParams["font.family"] = font_prop.get_name()
-    logging.info(f"Default Chinese font set to {font_prop.get_name()}")
-    return font_prop
+    return set_default_font(DEFAULT_ZH_FONT)
 
 
 def set_default_font(filename: str):
     """
     Set Matplotlib default font to a specific TTF file inside fonts directory.
+
+    Only that font's family is registered. Calls that would not change the
+    default are no-ops.
     """
-    font_dir = files("taiwanviz.fonts")
-    candidates = [p for p in _iter_ttf_files(font_dir) if p.name == filename]
-    if not candidates:
-        raise FileNotFoundError(f"Font file {filename} not found in {font_dir}")
-    path = candidates[0]
-
-    font_prop = fm.FontProperties(fname=str(path))
-    plt.rcParams["font.family"] = font_prop.get_name()
-    logging.info(f"Default font set to {font_prop.get_name()} ({filename})")
+    import matplotlib
+
+    font_prop = register_font(filename)
+    name = font_prop.get_name()
+    if matplotlib.rcParams["font.family"] != [name]:
+        matplotlib.rcParams["font.family"] = name
+        logger.info(f"Default font set to {name} ({filename})")
     return font_prop
 
 
 def list_available_fonts() -> List[str]:
     """
-    List all available TTF fonts under taiwanviz/fonts.
+    List all available TTF fonts under taiwanviz/fonts, without loading
+    Matplotlib.
     """
-    font_dir = files("taiwanviz.fonts")
-    fonts = [p.name for p in _iter_ttf_files(font_dir)]
-    logging.info(f"Found {len(fonts)} fonts: {fonts}")
-    return fonts
+    return list(font_index())
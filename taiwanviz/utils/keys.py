@@ -0,0 +1,123 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Whitespace and the separators people put between 縣市, 鄉鎮市區 and 村里
+_SEPARATORS = re.compile(r"[\s/\\|,，、・·]+")
+
+# Index value of keys naming more than one region
+AMBIGUOUS = -1
+
+
+def normalize_key(key) -> str:
+    """
+    Canonical form of a region key: NFKC (full-width to half-width), no
+    whitespace or path separators, and 台 spelled 臺 as in official names.
+    """
+    text = unicodedata.normalize("NFKC", str(key))
+    return _SEPARATORS.sub("", text).replace("台", "臺")
+
+
+@dataclass(frozen=True)
+class KeyMatch:
+    """
+    Outcome of resolving data keys against a layer.
+
+    Attributes
+    ----------
+    key_positions : np.ndarray
+        For every matched layer row, the position of its key in the input.
+    rows : np.ndarray
+        Matched layer row positions, aligned to `key_positions`.
+    unmatched : tuple of str
+        Keys naming no region.
+    ambiguous : tuple of str
+        Keys naming several regions (e.g. a bare 東區); these are not
+        applied.
+    """
+
+    key_positions: np.ndarray
+    rows: np.ndarray
+    unmatched: Tuple[str, ...] = ()
+    ambiguous: Tuple[str, ...] = ()
+
+
+class KeyIndex:
+    """
+    Lookup of the keys that identify a layer's regions.
+
+    A region is reachable by its code, and by every trailing part of its
+    name path, e.g. ``中正里``, ``中正區/中正里`` and ``臺北市/中正區/中正里``.
+    Names are also indexed in `normalize_key` form, so 台/臺 variants,
+    spacing and separators (or none: ``臺北市中正區``) resolve alike. Keys
+    shared by regions with different codes are marked ambiguous.
+
+    Parameters
+    ----------
+    codes : Sequence[str]
+        Region code per layer row; rows sharing a code form one region.
+    paths : Sequence[Sequence[str]]
+        Name path per layer row, coarsest first, e.g. (county, town).
+    """
+
+    def __init__(self, codes: Sequence[str], paths: Sequence[Sequence[str]]):
+        unique, inverse = np.unique(np.asarray(codes, dtype=str), return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        self._offsets = np.searchsorted(inverse[order], np.arange(len(unique) + 1))
+        self._rows = order
+        self._lookup: Dict[str, int] = {}
+
+        for region, code in enumerate(unique):
+            self._add(code, region)
+        for region, path in zip(inverse, paths):
+            for key in self._path_keys(path):
+                self._add(key, int(region))
+
+    @staticmethod
+    def _path_keys(path: Sequence[Optional[str]]) -> Iterable[str]:
+        parts = [p for p in path if isinstance(p, str) and p]
+        if len(parts) != len(path):
+            return  # incomplete paths would alias coarser regions
+        for i in range(len(parts)):
+            suffix = parts[i:]
+            yield "/".join(suffix)
+            yield normalize_key("".join(suffix))
+
+    def _add(self, key: str, region: int) -> None:
+        current = self._lookup.get(key)
+        if current is None:
+            self._lookup[key] = region
+        elif current != region:
+            self._lookup[key] = AMBIGUOUS
+
+    def resolve(self, keys: Iterable) -> KeyMatch:
+        """
+        Resolve `keys` to layer rows with one dict lookup per key (two for
+        keys that need normalizing).
+        """
+        lookup = self._lookup
+        regions: List[int] = []
+        unmatched, ambiguous = [], []
+        for key in keys:
+            region = lookup.get(key)
+            if region is None:
+                region = lookup.get(normalize_key(key))
+            if region is None:
+                unmatched.append(key)
+                region = AMBIGUOUS
+            elif region == AMBIGUOUS:
+                ambiguous.append(key)
+            regions.append(region)
+
+        regions = np.asarray(regions, dtype=np.int64)
+        found = np.flatnonzero(regions != AMBIGUOUS)
+        starts = self._offsets[regions[found]]
+        counts = self._offsets[regions[found] + 1] - starts
+        key_positions = np.repeat(found, counts)
+        # Row slots of each region, laid out back to back
+        slots = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = self._rows[np.repeat(starts, counts) + slots]
+        return KeyMatch(key_positions, rows, tuple(unmatched), tuple(ambiguous))
@@ -0,0 +1,95 @@
+import logging
+import math
+from typing import Optional, Sequence, Tuple
+
+import geopandas as gpd
+import matplotlib as mpl
+import shapely
+
+logger = logging.getLogger(__name__)
+
+# Simplification tolerance (degrees) per level-of-detail tier; tier 0 is the
+# original survey geometry. 1e-4 degrees is roughly 10 m in Taiwan.
+LOD_TOLERANCES: Tuple[float, ...] = (0.0, 0.0001, 0.0004, 0.0015, 0.006)
+
+
+def simplify_coverage(geoms: gpd.GeoSeries, tolerance: float) -> gpd.GeoSeries:
+    """
+    Simplify a polygon coverage while keeping shared borders identical.
+
+    Uses shapely's coverage simplification so neighbouring regions do not
+    open gaps or overlaps. Falls back to per-geometry topology-preserving
+    simplification when the input is not a valid coverage.
+
+    Parameters
+    ----------
+    geoms : GeoSeries
+        Polygonal geometries forming a coverage.
+    tolerance : float
+        Simplification tolerance in CRS units.
+
+    Returns
+    -------
+    GeoSeries
+        Simplified geometries, aligned to `geoms`.
+    """
+    if tolerance <= 0:
+        return geoms
+    try:
+        simplified = shapely.coverage_simplify(geoms.values, tolerance)
+    except Exception as e:
+        logger.warning(f"Coverage simplification failed, simplifying per shape: {e}")
+        return geoms.simplify(tolerance, preserve_topology=True)
+    return gpd.GeoSeries(simplified, index=geoms.index, crs=geoms.crs)
+
+
+def axes_pixels(
+    figsize: Sequence[float], dpi: float, fraction: float = 1.0
+) -> Tuple[float, float]:
+    """
+    Pixel size of a default subplot in a figure, optionally scaled by
+    `fraction` (e.g. 0.3 for a 30% inset).
+    """
+    rc = mpl.rcParams
+    width = figsize[0] * dpi * (rc["figure.subplot.right"] - rc["figure.subplot.left"])
+    height = figsize[1] * dpi * (rc["figure.subplot.top"] - rc["figure.subplot.bottom"])
+    return width * fraction, height * fraction
+
+
+def degrees_per_pixel(
+    pixels: Tuple[float, float],
+    xlim: Sequence[float],
+    ylim: Sequence[float],
+) -> float:
+    """
+    Smallest geographic distance (degrees) covered by one output pixel.
+
+    Accounts for the 1/cos(latitude) aspect geopandas applies to geographic
+    axes, and for the axes being fitted to whichever dimension is limiting.
+    """
+    xspan = max(xlim[1] - xlim[0], 1e-9)
+    yspan = max(ylim[1] - ylim[0], 1e-9)
+    aspect = 1 / math.cos(math.radians((ylim[0] + ylim[1]) / 2))
+    px_per_degree = min(pixels[0] / xspan, pixels[1] / (yspan * aspect))
+    return 1.0 / (px_per_degree * aspect)
+
+
+def select_lod(degrees: float, tolerances: Sequence[float] = LOD_TOLERANCES) -> int:
+    """Return the coarsest tier whose tolerance stays below `degrees`."""
+    tier = 0
+    for i, tolerance in enumerate(tolerances):
+        if tolerance <= degrees:
+            tier = i
+    return tier
+
+
+def choose_lod(
+    lod: Optional[int],
+    pixels: Tuple[float, float],
+    xlim: Sequence[float],
+    ylim: Sequence[float],
+) -> int:
+    """Return the manual override `lod`, or the coarsest tier finer than a pixel."""
+    if lod is not None:
+        return lod
+    return select_lod(degrees_per_pixel(pixels, xlim, ylim))
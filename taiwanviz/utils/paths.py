@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from matplotlib.collections import PathCollection
+from matplotlib.path import Path
+
+_EMPTY_PATH = Path(np.empty((0, 2)))
+
+
+def geometry_to_path(geom) -> Path:
+    """
+    Convert a (Multi)Polygon into one compound matplotlib Path.
+
+    Mirrors how geopandas builds polygon patches: every exterior and interior
+    ring becomes a closed sub-path. Rings should already be normalized so
+    holes wind opposite to their shell.
+    """
+    if geom is None or geom.is_empty:
+        return _EMPTY_PATH
+    parts = [geom] if geom.geom_type == "Polygon" else getattr(geom, "geoms", [])
+    rings = []
+    for part in parts:
+        if part.geom_type != "Polygon":
+            continue
+        rings.append(Path(np.asarray(part.exterior.coords)[:, :2], closed=True))
+        rings.extend(
+            Path(np.asarray(ring.coords)[:, :2], closed=True) for ring in part.interiors
+        )
+    if not rings:
+        return _EMPTY_PATH
+    return Path.make_compound_path(*rings)
+
+
+@dataclass(frozen=True)
+class PathGeometry:
+    """
+    Prebuilt matplotlib paths for a set of geometries.
+
+    Attributes
+    ----------
+    paths : np.ndarray
+        Object array of `matplotlib.path.Path`, one per geometry.
+    bounds : np.ndarray
+        ``(n, 4)`` array of (minx, miny, maxx, maxy) per geometry.
+    geographic : bool
+        Whether coordinates are longitude/latitude.
+    """
+
+    paths: np.ndarray
+    bounds: np.ndarray
+    geographic: bool = True
+
+    @classmethod
+    def from_geoseries(cls, geoms: gpd.GeoSeries) -> "PathGeometry":
+        """Build paths from a GeoSeries, normalizing ring orientation first."""
+        normalized = shapely.normalize(geoms.values)
+        paths = np.empty(len(normalized), dtype=object)
+        for i, geom in enumerate(normalized):
+            paths[i] = geometry_to_path(geom)
+        bounds = shapely.bounds(geoms.values)
+        geographic = bool(geoms.crs is not None and geoms.crs.is_geographic)
+        return cls(paths, bounds, geographic)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __getitem__(self, selector) -> "PathGeometry":
+        return PathGeometry(
+            self.paths[selector], self.bounds[selector], self.geographic
+        )
+
+    @property
+    def total_bounds(self) -> np.ndarray:
+        """Bounds enclosing all geometries (NaN when empty)."""
+        if not len(self.bounds):
+            return np.full(4, np.nan)
+        b = self.bounds
+        return np.array(
+            [
+                np.nanmin(b[:, 0]),
+                np.nanmin(b[:, 1]),
+                np.nanmax(b[:, 2]),
+                np.nanmax(b[:, 3]),
+            ]
+        )
+
+
+def plot_paths(ax, geoms: PathGeometry, colors, edgecolor: str = "#fbfbfb"):
+    """
+    Draw prebuilt paths on `ax` as a single PathCollection.
+
+    Matches `GeoDataFrame.plot` styling: the same aspect rule for geographic
+    coordinates, default patch line width and autoscaled limits.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Target axes to draw on.
+    geoms : PathGeometry
+        Paths to draw.
+    colors : np.ndarray
+        ``(n, 4)`` RGBA face colors aligned to `geoms`.
+    edgecolor : str, default "#fbfbfb"
+        Color of the geometry borders.
+
+    Returns
+    -------
+    PathCollection or None
+        The collection added to `ax`, or None when `geoms` is empty.
+    """
+    if not len(geoms):
+        return None
+
+    minx, miny, maxx, maxy = geoms.total_bounds
+    if geoms.geographic:
+        ax.set_aspect(1 / np.cos(np.mean([miny, maxy]) * np.pi / 180))
+    else:
+        ax.set_aspect("equal")
+
+    collection = PathCollection(
+        list(geoms.paths), facecolors=colors, edgecolors=edgecolor
+    )
+    ax.add_collection(collection, autolim=False)
+    ax.update_datalim([(minx, miny), (maxx, maxy)])
+    ax.autoscale_view()
+    return collection
@@ -1,10 +1,26 @@
+from typing import Union
+
 import geopandas as gpd
-import pandas as pd
+import numpy as np
 from mpl_toolkits.axes_grid1.inset_locator import inset_axes
 
+from .paths import PathGeometry, plot_paths
+
+GeometryLike = Union[gpd.GeoDataFrame, gpd.GeoSeries, PathGeometry]
+
+
+def _draw(ax, geoms: GeometryLike, colors: np.ndarray, edgecolor: str):
+    if isinstance(geoms, PathGeometry):
+        plot_paths(ax, geoms, colors, edgecolor=edgecolor)
+    else:
+        geoms.plot(ax=ax, color=colors, edgecolor=edgecolor)
+
 
 def plot_mainland(
-    ax, mainland: gpd.GeoDataFrame, colors: pd.Series, edgecolor: str = "#fbfbfb"
+    ax,
+    mainland: GeometryLike,
+    colors: np.ndarray,
+    edgecolor: str = "#fbfbfb",
 ):
     """
     Plot the main island of Taiwan.
@@ -13,20 +29,20 @@ def plot_mainland(
     ----------
     ax : matplotlib.axes.Axes
         Target axes to draw on.
-    mainland : GeoDataFrame
-        Mainland geometries.
-    colors : Series
-        Color values mapped to each geometry.
+    mainland : GeoDataFrame, GeoSeries or PathGeometry
+        Mainland geometries. PathGeometry is drawn with the fast path renderer.
+    colors : np.ndarray
+        ``(n, 4)`` RGBA colors aligned to the rows of the geometries.
     edgecolor : str, default "#fbfbfb"
         Color of the geometry borders.
     """
-    mainland.plot(ax=ax, color=colors.loc[mainland.index], edgecolor=edgecolor)
+    _draw(ax, mainland, colors, edgecolor)
 
 
 def plot_inset(
     ax,
-    gdf_focus: gpd.GeoDataFrame,
-    colors: pd.Series,
+    gdf_focus: GeometryLike,
+    colors: np.ndarray,
     title: str,
     loc: str,
     edgecolor: str = "#fbfbfb",
@@ -39,10 +55,10 @@ def plot_inset(
     ----------
     ax : matplotlib.axes.Axes
         Parent axes to attach the inset.
-    gdf_focus : GeoDataFrame
+    gdf_focus : GeoDataFrame, GeoSeries or PathGeometry
         Focused geometries to plot in the inset.
-    colors : Series
-        Color values mapped to each geometry.
+    colors : np.ndarray
+        ``(n, 4)`` RGBA colors aligned to the rows of the geometries.
     title : str
         Title of the inset (region name).
     loc : str
@@ -58,7 +74,7 @@ def plot_inset(
         The inset axes object.
     """
     ax_inset = inset_axes(ax, width=size, height=size, loc=loc, borderpad=1.2)
-    gdf_focus.plot(ax=ax_inset, color=colors.loc[gdf_focus.index], edgecolor=edgecolor)
+    _draw(ax_inset, gdf_focus, colors, edgecolor)
     ax_inset.set_title(title, fontsize=9)
     ax_inset.axis("off")
     return ax_inset
@@ -0,0 +1,259 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import shapely
+
+# Bump when the encoded output changes for the same geometry
+TOPOLOGY_VERSION = 2
+
+# A geometry as quantized rings: polygons -> rings -> (n, 2) int64 closed ring
+QuantizedGeometry = List[List[np.ndarray]]
+
+
+@dataclass(frozen=True)
+class Quantization:
+    """
+    Integer grid covering a bounding box, as in TopoJSON's ``transform``.
+
+    Attributes
+    ----------
+    scale : np.ndarray
+        Grid step in x and y.
+    translate : np.ndarray
+        Grid origin (minx, miny).
+    """
+
+    scale: np.ndarray
+    translate: np.ndarray
+
+    @classmethod
+    def for_bounds(cls, bounds: Sequence[float], n: int) -> "Quantization":
+        """Grid of `n` points across each side of `bounds`."""
+        minx, miny, maxx, maxy = bounds
+        span = np.array([maxx - minx, maxy - miny], dtype=float)
+        scale = np.where(span > 0, span / max(n - 1, 1), 1.0)
+        return cls(scale=scale, translate=np.array([minx, miny], dtype=float))
+
+    def to_grid(self, coords: np.ndarray) -> np.ndarray:
+        return np.round((coords - self.translate) / self.scale).astype(np.int64)
+
+    def from_grid(self, grid: np.ndarray) -> np.ndarray:
+        return grid * self.scale + self.translate
+
+
+def _quantize_ring(ring, q: Quantization) -> Optional[np.ndarray]:
+    grid = q.to_grid(shapely.get_coordinates(ring))
+    # Drop points that fell onto the same grid cell as their predecessor
+    moved = np.any(np.diff(grid, axis=0) != 0, axis=1)
+    grid = grid[np.concatenate([[True], moved])]
+    if len(grid) < 4:
+        return None  # collapsed below a triangle at this resolution
+    return grid
+
+
+def quantize_geometries(
+    geoms: np.ndarray, q: Quantization, exterior_cw: bool = False
+) -> List[QuantizedGeometry]:
+    """
+    Snap (Multi)Polygons onto the grid of `q`.
+
+    Exteriors are counterclockwise and holes clockwise (RFC 7946 GeoJSON),
+    or the reverse with `exterior_cw` (TopoJSON, as d3-geo expects). Rings
+    that collapse at the grid resolution are dropped, and so are polygons
+    whose exterior collapses; such geometries become empty lists.
+    """
+    oriented = shapely.orient_polygons(geoms, exterior_cw=exterior_cw)
+    out = []
+    for geom in oriented:
+        polygons = []
+        if geom is not None and not geom.is_empty:
+            parts = getattr(geom, "geoms", [geom])
+            for part in parts:
+                if part.geom_type != "Polygon":
+                    continue
+                exterior = _quantize_ring(part.exterior, q)
+                if exterior is None:
+                    continue
+                rings = [exterior]
+                for interior in part.interiors:
+                    hole = _quantize_ring(interior, q)
+                    if hole is not None:
+                        rings.append(hole)
+                polygons.append(rings)
+        out.append(polygons)
+    return out
+
+
+def _point_keys(grid: np.ndarray, n: int) -> np.ndarray:
+    return grid[:, 0] * (n + 1) + grid[:, 1]
+
+
+def _junction_flags(rings: List[np.ndarray], n: int) -> List[np.ndarray]:
+    """
+    Per ring, which points (excluding the closing one) are junctions: points
+    where rings meet or part, i.e. that occur with more than one distinct
+    pair of neighbours.
+    """
+    if not rings:
+        return []
+    keys, pair_lo, pair_hi = [], [], []
+    for ring in rings:
+        k = _point_keys(ring[:-1], n)
+        prev, nxt = np.roll(k, 1), np.roll(k, -1)
+        keys.append(k)
+        pair_lo.append(np.minimum(prev, nxt))
+        pair_hi.append(np.maximum(prev, nxt))
+    all_keys = np.concatenate(keys)
+    triples = np.unique(
+        np.column_stack([all_keys, np.concatenate(pair_lo), np.concatenate(pair_hi)]),
+        axis=0,
+    )
+    points, counts = np.unique(triples[:, 0], return_counts=True)
+    flags = np.isin(all_keys, points[counts > 1])
+    return np.split(flags, np.cumsum([len(k) for k in keys])[:-1])
+
+
+class _ArcIndex:
+    """Deduplicating store of arcs; reversed duplicates map to ``~index``."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.arcs: List[np.ndarray] = []
+        self._index: Dict[bytes, int] = {}
+
+    def add(self, arc: np.ndarray) -> int:
+        keys = _point_keys(arc, self.n)
+        forward = keys.tobytes()
+        if forward in self._index:
+            return self._index[forward]
+        backward = keys[::-1].tobytes()
+        if backward in self._index:
+            return ~self._index[backward]
+        self._index[forward] = len(self.arcs)
+        self.arcs.append(arc)
+        return len(self.arcs) - 1
+
+    def ring_arcs(self, ring: np.ndarray, is_junction: np.ndarray) -> List[int]:
+        """Split a closed ring at its junctions and return its arc references."""
+        open_ring = ring[:-1]
+        cuts = np.flatnonzero(is_junction)
+        if not len(cuts):
+            # Start junction-free rings at their smallest point, so the same
+            # ring traversed either way yields the same or the reversed arc
+            start = int(np.argmin(_point_keys(open_ring, self.n)))
+            rotated = np.roll(open_ring, -start, axis=0)
+            return [self.add(np.vstack([rotated, rotated[:1]]))]
+
+        rotated = np.roll(open_ring, -cuts[0], axis=0)
+        closed = np.vstack([rotated, rotated[:1]])
+        bounds = list(cuts - cuts[0]) + [len(open_ring)]
+        return [self.add(closed[a : b + 1]) for a, b in zip(bounds, bounds[1:])]
+
+
+def to_topojson(
+    geoms: np.ndarray,
+    ids: Sequence,
+    properties: Sequence[Dict],
+    quantization: int = 100_000,
+    name: str = "regions",
+) -> Dict:
+    """
+    Encode polygon geometries as a quantized TopoJSON topology.
+
+    Borders shared by neighbouring regions are stored once as arcs and
+    referenced from both sides, and arc coordinates are delta-encoded on an
+    integer grid of `quantization` points per side. Exterior rings are
+    clockwise in planar lon/lat, the winding d3-geo and topojson-client
+    expect for spherical polygons.
+
+    Parameters
+    ----------
+    geoms : np.ndarray
+        Shapely (Multi)Polygons in lon/lat.
+    ids : Sequence
+        Feature id per geometry.
+    properties : Sequence[dict]
+        Feature properties per geometry.
+    quantization : int, default 100000
+        Grid points across each side of the bounding box.
+    name : str, default "regions"
+        Name of the GeometryCollection object.
+
+    Returns
+    -------
+    dict
+        TopoJSON ``Topology``, ready for ``json.dumps``.
+    """
+    bounds = shapely.total_bounds(geoms)
+    q = Quantization.for_bounds(bounds, quantization)
+    quantized = quantize_geometries(geoms, q, exterior_cw=True)
+
+    rings = [ring for polygons in quantized for rings in polygons for ring in rings]
+    flags = iter(_junction_flags(rings, quantization))
+    index = _ArcIndex(quantization)
+
+    objects = []
+    for gid, props, polygons in zip(ids, properties, quantized):
+        arcs = [[index.ring_arcs(ring, next(flags)) for ring in p] for p in polygons]
+        if not arcs:
+            geometry = {"type": None}
+        elif len(arcs) == 1:
+            geometry = {"type": "Polygon", "arcs": arcs[0]}
+        else:
+            geometry = {"type": "MultiPolygon", "arcs": arcs}
+        geometry.update(id=gid, properties=props)
+        objects.append(geometry)
+
+    encoded = []
+    for arc in index.arcs:
+        delta = np.diff(arc, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+        encoded.append(delta.tolist())
+
+    return {
+        "type": "Topology",
+        "bbox": [float(v) for v in bounds],
+        "transform": {
+            "scale": q.scale.tolist(),
+            "translate": q.translate.tolist(),
+        },
+        "objects": {name: {"type": "GeometryCollection", "geometries": objects}},
+        "arcs": encoded,
+    }
+
+
+def to_geojson(
+    geoms: np.ndarray,
+    ids: Sequence,
+    properties: Sequence[Dict],
+    quantization: int = 100_000,
+) -> Dict:
+    """
+    Encode polygon geometries as a GeoJSON FeatureCollection snapped to the
+    same grid `to_topojson` uses, with coordinates rounded to the grid's
+    precision. Rings follow RFC 7946 winding (exteriors counterclockwise).
+    """
+    bounds = shapely.total_bounds(geoms)
+    q = Quantization.for_bounds(bounds, quantization)
+    digits = max(0, int(np.ceil(-np.log10(q.scale.min()))))
+
+    features = []
+    for gid, props, polygons in zip(ids, properties, quantize_geometries(geoms, q)):
+        coords = [
+            [np.round(q.from_grid(ring), digits).tolist() for ring in p]
+            for p in polygons
+        ]
+        if not coords:
+            geometry = None
+        elif len(coords) == 1:
+            geometry = {"type": "Polygon", "coordinates": coords[0]}
+        else:
+            geometry = {"type": "MultiPolygon", "coordinates": coords}
+        features.append(
+            {"type": "Feature", "id": gid, "properties": props, "geometry": geometry}
+        )
+    return {
+        "type": "FeatureCollection",
+        "bbox": [float(v) for v in bounds],
+        "features": features,
+    }